@@ -5,24 +5,51 @@ KHIDI AI 채용 비서 대시보드
 """
 
 import streamlit as st
+from streamlit.logger import set_log_level
 import sqlite3
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import pdfplumber
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from datetime import datetime, timedelta
 import os
+import sys
+import time
+import argparse
+import subprocess
 import tempfile
+import multiprocessing
+import atexit
+import gzip
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 import hashlib
+import importlib.util
+import math
+import numpy as np
+import pandas as pd
 import json
 import re
-from typing import Optional, List, Dict, Tuple
+import threading
+import queue
+from contextlib import contextmanager
+from urllib.parse import urlparse, urljoin, parse_qs, urlencode
+from typing import Optional, List, Dict, Tuple, Iterable, Iterator, Callable
+
+# Streamlit 런타임 없이 실행될 때(python app.py ingest, PDF 추출 프로세스)는
+# 캐시 데코레이터가 내는 런타임 부재 경고를 숨김
+if not st.runtime.exists():
+    set_log_level("error")
 
 # ============================================================
 # 설정 상수
 # ============================================================
-DB_PATH = "khidi_data.db"
-PDF_CACHE_DIR = "pdf_cache"
+DB_PATH = os.environ.get("KHIDI_DB_PATH", "khidi_data.db")
+PDF_CACHE_DIR = os.environ.get("KHIDI_PDF_CACHE_DIR", "pdf_cache")
 
 KHIDI_URLS = {
     "보건산업브리프": "https://www.khidi.or.kr/board?menuId=MENU00085",
@@ -30,309 +57,2512 @@ KHIDI_URLS = {
     "뉴스레터": "https://www.khidi.or.kr/board?menuId=MENU00094",
 }
 
-CATEGORIES = ["전체", "R&D 정책", "글로벌 진출", "규제/법령", "채용 분석"]
+CATEGORIES = ["전체", "R&D 정책", "글로벌 진출", "규제/법령", "기타", "채용 분석"]
+BRIEFING_PAGE_SIZE = 20
+
+# 카테고리 분류 키워드와 가중치 (바꾸면 저장된 브리핑이 자동으로 재분류됨)
+CATEGORY_KEYWORDS: Dict[str, Dict[str, float]] = {
+    "R&D 정책": {"r&d": 3, "연구개발": 3, "기술개발": 2, "연구비": 2, "과제": 0.5},
+    "글로벌 진출": {"글로벌": 1.5, "해외": 1.5, "수출": 2, "진출": 1, "fda": 3, "ema": 3, "국제": 1},
+    "규제/법령": {"규제": 2, "법령": 2, "인허가": 3, "승인": 1, "제도": 0.5, "법률": 1.5},
+    "채용 분석": {"채용": 3, "인재": 1.5, "일자리": 2, "취업": 2, "고용": 1.5},
+}
+UNCATEGORIZED = "기타"
+CATEGORY_TITLE_WEIGHT = 3.0       # 제목에 나온 키워드는 본문보다 크게 반영
+CATEGORY_MIN_SCORE = 1.0          # 이 점수 미만이면 미분류
+CATEGORY_MIN_CONFIDENCE = 0.2     # 보조 카테고리로 표시할 최소 비중
+
+# 채용 직무군 분류 키워드 (직무명·부서명 기준, 위에서부터 먼저 맞는 직무군)
+POSITION_FAMILIES: Dict[str, List[str]] = {
+    "디지털헬스": ["디지털", "AI", "데이터", "DTx"],
+    "글로벌진출": ["글로벌", "해외"],
+    "규제·보건안보": ["규제", "안보", "감염병"],
+    "정책연구": ["정책", "연구", "라이터"],
+    "바이오·의료기기": ["바이오", "의약품", "의료기기"],
+    "R&D 사업관리": ["R&D", "사업관리"],
+}
+OTHER_POSITION_FAMILY = "경영지원·기타"
+RECENT_YEARS_SHOWN = 4            # 채용 분석 탭 상단에 요약하는 최근 연도 수
+
+# 채용 이력 가져오기 파일의 컬럼 이름 (영문 또는 한글 헤더)
+RECRUITMENT_COLUMN_ALIASES = {
+    "year": ("year", "연도", "채용연도"),
+    "position": ("position", "직무", "직무명"),
+    "department": ("department", "부서", "소속"),
+    "requirements": ("requirements", "자격요건", "자격 요건"),
+    "skills": ("skills", "필요역량", "필요 역량"),
+    "hired_count": ("hired_count", "채용인원", "채용 인원"),
+}
+RECRUITMENT_REQUIRED_COLUMNS = ("year", "position", "hired_count")
+
+GEMINI_MODEL = "gemini-1.5-flash"
+
+# 긴 문서 분석 설정 (토큰 예산 초과 시 청크별 추출 후 종합)
+ANALYSIS_CHUNK_TOKENS = 12000       # 단일 호출·청크당 입력 토큰 예산
+ANALYSIS_MAP_CONCURRENCY = 4        # 청크 추출 동시 호출 수
+ANALYSIS_MAX_REDUCE_DEPTH = 3
+
+# Gemini 호출 한도 및 백그라운드 분석 작업 큐 설정
+GEMINI_REQUESTS_PER_MINUTE = int(os.environ.get("KHIDI_GEMINI_RPM", 15))
+GEMINI_INTERACTIVE_RESERVE = 3      # 분당 한도 중 화면 요청용으로 남겨 두는 호출 수
+ANALYSIS_JOB_WORKERS = 2
+ANALYSIS_JOB_MAX_ATTEMPTS = 5
+ANALYSIS_JOB_BACKOFF_BASE = 30      # 재시도 대기(초), 실패할 때마다 두 배
+ANALYSIS_JOB_BACKOFF_MAX = 15 * 60
+ANALYSIS_JOB_STALE_AFTER = 30 * 60  # 이 시간 넘게 진행 중인 작업은 중단된 것으로 보고 재수거
+ANALYSIS_PRIORITY_NEW = 10          # 최신 수집분
+ANALYSIS_PRIORITY_BACKFILL = 0      # 이력 수집분
+
+# 헤드리스 수집 설정 (python app.py ingest)
+INGEST_DEFAULT_INTERVAL = 60 * 60   # --interval 기본값(초)
+INGEST_PROGRESS_INTERVAL = 1.0      # 진행 상황 DB 기록 최소 간격(초)
+INGEST_STATUS_REFRESH = 3           # 사이드바 수집 상태 자동 갱신 주기(초)
+LOCAL_INGEST_EXTENSIONS = (".pdf", ".txt")   # python app.py ingest-local 대상 파일
+LOCAL_INGEST_SOURCE = "로컬 자료"
+LOCAL_INGEST_BATCH = 50             # 저장 단위 (중단 후 다시 실행하면 마지막 미저장분만 재처리)
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# 크롤링 파이프라인 설정 (단계별 워커 수, 호스트별 동시 연결 수)
+CRAWL_STAGE_WORKERS = {
+    "목록": 2,
+    "상세": 6,
+    "PDF 다운로드": 4,
+    "PDF 추출": 2,
+}
+MAX_CONNECTIONS_PER_HOST = 4
+HTTP_MAX_RETRIES = 2
+
+# PDF 다운로드·추출 설정
+PDF_MAX_BYTES = 100 * 1024 * 1024         # 다운로드 허용 최대 크기 (100MB)
+PDF_DOWNLOAD_CHUNK = 256 * 1024           # 스트리밍 다운로드 청크 크기
+PDF_PAGES_PER_TASK = 16                   # 프로세스 풀 작업 1건당 페이지 수
+PDF_EXTRACT_PROCESSES = max(1, (os.cpu_count() or 2) - 1)
+PDF_PAGE_SEPARATOR = "\n\f\n"              # 페이지 경계 표시 (폼피드)
+PDF_CACHE_MAX_BYTES = int(os.environ.get("KHIDI_PDF_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+PDF_EXTRACTOR_VERSION = f"pdfplumber-{pdfplumber.__version__}/1"   # 추출 방식이 바뀌면 캐시 무효화
+
+# 유사 중복 탐지 설정 (MinHash + LSH)
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16                     # 밴드당 4행, 유사도 0.8 문서는 거의 확실히 후보로 잡힘
+SHINGLE_SIZE = 5                   # 문자 n-gram 길이
+DUPLICATE_THRESHOLD = 0.8          # 추정 자카드 유사도가 이 이상이면 같은 자료로 연결
+DUPLICATE_MIN_CHARS = 200          # 이보다 짧은 본문은 중복 판정에서 제외
+MINHASH_CHUNK = 4096               # 한 번에 해시하는 shingle 수 (메모리 상한)
+
+# 관련 브리핑 색인 설정 (문자 n-gram TF-IDF, 해싱 트릭)
+SIMILARITY_NGRAMS = (2, 3)         # 한국어는 어절 안의 2~3글자 조합이 형태소를 잘 근사함
+SIMILARITY_FEATURE_BITS = 18       # 특성 공간 크기 2^18 (어휘 사전 없이 해시로 색인)
+SIMILARITY_MAX_CHARS = 4000        # 본문 앞부분만 색인
+SIMILARITY_MAX_TERMS = 256         # 문서당 보관하는 특성 수 (메모리 상한)
+SIMILARITY_TITLE_WEIGHT = 3.0      # 제목 n-gram 가중치
+SIMILARITY_TOP_K = 5
+SIMILARITY_MIN_SCORE = 0.05        # 코사인 유사도가 이보다 낮으면 관련 없음으로 간주
+SIMILARITY_RECENT_DAYS = 365       # 채용 역량 ↔ 브리핑 매칭 시 최근 자료 기준
+
+# HTML 파서 (lxml이 설치되어 있으면 사용, 없으면 표준 라이브러리 파서)
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# 게시판 페이지네이션 설정
+BOARD_PAGE_PARAM = "pageIndex"
+POST_ID_PARAMS = ("linkId", "nttId", "seq", "idx", "no")
+INCREMENTAL_MAX_PAGES = 5   # 일반 새로고침 시 최대 탐색 페이지
+BACKFILL_MAX_PAGES = 20     # 이력 수집 1회당 최대 페이지
+CRAWL_RETRY_MAX_ATTEMPTS = 5  # 상세·PDF 단계에서 실패한 게시글 재시도 횟수
+
+# SQLite 연결 설정
+DB_MAX_READERS = 8
+DB_CACHE_SIZE_KB = 32 * 1024          # 연결당 페이지 캐시 (32MB)
+DB_MMAP_SIZE = 256 * 1024 * 1024      # 메모리 맵 I/O 크기 (256MB)
+DB_BUSY_TIMEOUT = 10                  # 잠금 대기 시간(초)
+SAVE_BATCH_SIZE = 500                 # 수집 결과 일괄 저장 단위
+DATA_CACHE_TTL = 5 * 60               # 화면 조회 캐시 유지 시간(초), 데이터 버전이 바뀌면 즉시 무효화
+
+# 성능 계측 설정 (단계별 소요 시간·오류를 metrics 테이블에 기록)
+METRICS_FLUSH_INTERVAL = 5            # 버퍼를 DB에 기록하는 최소 간격(초)
+METRICS_FLUSH_SIZE = 500              # 이만큼 쌓이면 간격과 관계없이 기록
+METRICS_RETENTION_DAYS = 7            # 보관 기간
+METRICS_MAX_ROWS = 200_000            # 최대 보관 행 수
+METRICS_PRUNE_INTERVAL = 10 * 60      # 오래된 기록 정리 주기(초)
+DIAGNOSTICS_TAB = "🩺 진단"
+DIAGNOSTICS_WINDOWS = {"최근 1시간": 1, "최근 24시간": 24, "최근 7일": 24 * 7}
+
+# ============================================================
+# 데이터베이스 연결 관리
+# ============================================================
+@st.cache_resource(show_spinner=False)
+def _process_resources() -> Dict:
+    """프로세스 공유 객체 저장소 (Streamlit이 재실행마다 스크립트 모듈을 다시 실행해도 유지)"""
+    return {"_lock": threading.Lock()}
+
+_resources: Optional[Dict] = None
+
+def shared_resource(name: str, factory: Callable[[], object]):
+    """프로세스당 하나만 만드는 공유 객체 조회 (연결 풀, 작업 스레드 등)"""
+    global _resources
+    if _resources is None:
+        _resources = _process_resources()
+    with _resources["_lock"]:
+        if name not in _resources:
+            _resources[name] = factory()
+        return _resources[name]
+
+def drop_shared_resource(name: str):
+    """공유 객체 폐기 (다음 조회 때 새로 만듦)"""
+    global _resources
+    if _resources is None:
+        _resources = _process_resources()
+    with _resources["_lock"]:
+        _resources.pop(name, None)
+
+class SQLitePool:
+    """프로세스별 SQLite 연결 풀
+
+    WAL 모드에서 읽기 연결 여러 개와 전용 쓰기 연결 하나를 재사용한다.
+    쓰기는 하나의 연결로 직렬화되고, 읽기는 진행 중인 쓰기(크롤링)에 막히지 않는다.
+    """
+
+    def __init__(self, path: str, max_readers: int = DB_MAX_READERS):
+        self.path = path
+        self.pid = os.getpid()
+        self._idle_readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(max_readers)
+        self._all_readers: List[sqlite3.Connection] = []
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.RLock()
+        self._writer_depth = 0
+        self._bump_version = True
+        self._lock = threading.Lock()
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=DB_BUSY_TIMEOUT, check_same_thread=False)
+        if not read_only:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self._connect(read_only=False)
+        return self._writer
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """읽기 전용 연결 대여"""
+        self._reader_slots.acquire()
+        try:
+            try:
+                conn = self._idle_readers.get_nowait()
+            except queue.Empty:
+                if self._writer is None:
+                    with self._writer_lock:
+                        self._get_writer()  # WAL 전환이 읽기 연결 생성보다 먼저 일어나도록 보장
+                conn = self._connect(read_only=True)
+                with self._lock:
+                    self._all_readers.append(conn)
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle_readers.put(conn)
+        finally:
+            self._reader_slots.release()
+
+    @contextmanager
+    def writer(self, bump_version: bool = True) -> Iterator[sqlite3.Connection]:
+        """전용 쓰기 연결 대여 (중첩 사용 시 가장 바깥에서 커밋)
+
+        bump_version=False인 쓰기(계측 기록 등)만 있던 트랜잭션은 데이터 버전을 올리지 않아
+        화면 조회 캐시를 무효화하지 않는다.
+        """
+        with self._writer_lock:
+            conn = self._get_writer()
+            self._writer_depth += 1
+            if self._writer_depth == 1:
+                changes_before = conn.total_changes
+                self._bump_version = bump_version
+            else:
+                self._bump_version = self._bump_version or bump_version
+            try:
+                yield conn
+            except BaseException:
+                if self._writer_depth == 1:
+                    conn.rollback()
+                raise
+            else:
+                if self._writer_depth == 1:
+                    conn.commit()
+                    if conn.total_changes != changes_before and self._bump_version:
+                        bump_data_version(self.path)
+            finally:
+                self._writer_depth -= 1
+
+    def close(self):
+        """모든 연결 닫기"""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+
+def data_version_path(db_path: Optional[str] = None) -> str:
+    """데이터 버전 파일 경로 (DB 파일 옆)"""
+    return os.path.abspath(db_path or DB_PATH) + ".version"
+
+def bump_data_version(db_path: Optional[str] = None):
+    """쓰기 커밋 후 데이터 버전 갱신 (버전 파일 수정 시각, 다른 프로세스에서도 보임)"""
+    path = data_version_path(db_path)
+    with open(path, "a"):
+        pass
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+def get_data_version() -> int:
+    """현재 데이터 버전 (SQL 없이 파일 상태만 확인)"""
+    try:
+        return os.stat(data_version_path()).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def _db_pool_state() -> Dict:
+    return shared_resource("db_pool", lambda: {"pool": None, "lock": threading.Lock()})
+
+def get_db_pool() -> SQLitePool:
+    """현재 프로세스·DB_PATH에 대한 연결 풀 (fork 후에는 새로 생성)"""
+    state = _db_pool_state()
+    with state["lock"]:
+        pool = state["pool"]
+        if pool is None or pool.pid != os.getpid() or pool.path != DB_PATH:
+            state["pool"] = pool = SQLitePool(DB_PATH)
+        return pool
+
+def db_read():
+    """읽기 전용 DB 연결 컨텍스트"""
+    return get_db_pool().reader()
+
+def db_write(bump_version: bool = True):
+    """쓰기 DB 연결 컨텍스트 (정상 종료 시 커밋, 예외 시 롤백)"""
+    return get_db_pool().writer(bump_version)
+
+def close_db_connections():
+    """연결 풀을 닫고 초기화 (DB 파일 삭제 전 호출)"""
+    state = _db_pool_state()
+    with state["lock"]:
+        if state["pool"] is not None:
+            state["pool"].close()
+            state["pool"] = None
+    # DB에서 만든 메모리 색인도 함께 폐기 (새 DB의 seq·id와 섞이지 않도록)
+    drop_shared_resource("similarity_index")
+
+# ============================================================
+# 성능 계측 (단계별 소요 시간·전송량·캐시 적중·오류 기록)
+# ============================================================
+
+class MetricsRecorder:
+    """계측 기록 버퍼 (일정 간격·크기마다 metrics 테이블에 일괄 기록)
+
+    기록은 데이터 버전을 올리지 않으므로 화면 조회 캐시를 무효화하지 않는다.
+    DB 기록에 실패해도 계측 대상 작업에는 영향을 주지 않는다.
+    """
+
+    def __init__(self):
+        self._buffer: List[Tuple] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._last_prune = 0.0
+        atexit.register(self.flush)
+
+    def add(self, stage: str, started_at: float, duration_ms: Optional[float],
+            bytes_: Optional[int] = None, cache: Optional[str] = None, error: Optional[str] = None):
+        with self._lock:
+            self._buffer.append((stage, started_at, duration_ms, bytes_, cache, error, os.getpid()))
+            due = (len(self._buffer) >= METRICS_FLUSH_SIZE
+                   or time.monotonic() - self._last_flush >= METRICS_FLUSH_INTERVAL)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """버퍼를 DB에 기록하고 주기적으로 보관 기간이 지난 기록 정리"""
+        if not self._flush_lock.acquire(blocking=False):
+            return  # 다른 스레드가 기록 중
+        try:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+            if not rows:
+                return
+
+            prune = time.monotonic() - self._last_prune >= METRICS_PRUNE_INTERVAL
+            with db_write(bump_version=False) as conn:
+                conn.executemany("""
+                    INSERT INTO metrics (stage, started_at, duration_ms, bytes, cache, error, pid)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                if prune:
+                    conn.execute("DELETE FROM metrics WHERE started_at < ?",
+                                 (time.time() - METRICS_RETENTION_DAYS * 86400,))
+                    conn.execute("DELETE FROM metrics WHERE id <= (SELECT MAX(id) FROM metrics) - ?",
+                                 (METRICS_MAX_ROWS,))
+            if prune:
+                self._last_prune = time.monotonic()
+        except sqlite3.Error:
+            pass  # 테이블이 아직 없거나 DB가 잠긴 경우 이번 기록은 버림
+        finally:
+            self._flush_lock.release()
+
+def get_metrics_recorder() -> MetricsRecorder:
+    """프로세스 공용 계측 기록기"""
+    return shared_resource("metrics_recorder", MetricsRecorder)
+
+@contextmanager
+def span(stage: str) -> Iterator[Dict]:
+    """블록 실행 시간 기록 (블록 안에서 bytes·cache 값을 채울 수 있음, 예외는 오류 종류로 기록 후 다시 발생)"""
+    record: Dict = {"bytes": None, "cache": None}
+    started_at = time.time()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield record
+    except GeneratorExit:
+        raise  # 스트림 소비자가 중간에 그만둔 경우는 오류가 아님
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        get_metrics_recorder().add(stage, started_at, (time.perf_counter() - start) * 1000,
+                                   record["bytes"], record["cache"], error)
+
+def record_cache(stage: str, hit: bool):
+    """캐시 조회 결과만 기록"""
+    get_metrics_recorder().add(stage, time.time(), None, cache="hit" if hit else "miss")
+
+def record_failure(stage: str, error: BaseException):
+    """처리를 계속하느라 넘긴 오류 기록"""
+    get_metrics_recorder().add(stage, time.time(), None, error=type(error).__name__)
+
+def get_stage_metrics(hours: int) -> Dict[str, pd.DataFrame]:
+    """최근 hours시간 단계별 호출 수·p50/p95·오류율·캐시 적중률과 오류 종류별 건수
+
+    소요 시간이 있는 행(span)만 호출로 세고, 캐시 조회 기록은 적중률에만,
+    처리를 계속하느라 넘긴 오류(record_failure)는 별도 건수로만 집계한다.
+    """
+    since = time.time() - hours * 3600
+    with db_read() as conn:
+        frame = pd.read_sql_query("""
+            SELECT stage, duration_ms, bytes, cache, error FROM metrics WHERE started_at >= ?
+        """, conn, params=(since,))
+        errors = pd.read_sql_query("""
+            SELECT stage, error, COUNT(*) AS count, MAX(started_at) AS last_seen
+            FROM metrics WHERE started_at >= ? AND error IS NOT NULL
+            GROUP BY stage, error ORDER BY count DESC
+        """, conn, params=(since,))
+
+    if frame.empty:
+        return {"stages": pd.DataFrame(), "errors": errors}
+
+    calls = frame[frame["duration_ms"].notna()]
+    lookups = frame[frame["cache"].notna()]
+    skipped = frame[frame["duration_ms"].isna() & frame["error"].notna()]
+    grouped = calls.groupby("stage")
+    stages = pd.DataFrame({
+        "호출 수": grouped.size(),
+        "p50 (ms)": grouped["duration_ms"].quantile(0.5),
+        "p95 (ms)": grouped["duration_ms"].quantile(0.95),
+        "최대 (ms)": grouped["duration_ms"].max(),
+        "오류": grouped["error"].count(),
+        "넘긴 오류": skipped.groupby("stage").size(),
+        "캐시 조회": lookups.groupby("stage").size(),
+        "캐시 적중률": (lookups["cache"] == "hit").groupby(lookups["stage"]).mean(),
+        "전송량 (MB)": grouped["bytes"].sum(min_count=1) / (1024 * 1024),
+    }, index=pd.Index(sorted(frame["stage"].unique()), name="stage"))
+    counts = ["호출 수", "오류", "넘긴 오류", "캐시 조회"]
+    stages[counts] = stages[counts].fillna(0).astype(int)
+    stages["오류율"] = stages["오류"] / stages["호출 수"].where(stages["호출 수"] > 0)
+    errors["last_seen"] = pd.to_datetime(errors["last_seen"], unit="s")
+    return {"stages": stages.sort_values("p95 (ms)", ascending=False), "errors": errors}
 
 # ============================================================
 # 데이터베이스 함수
 # ============================================================
 def init_database():
     """SQLite 데이터베이스 초기화 및 테이블 생성"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # 브리핑 게시글 테이블
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS briefings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            source TEXT,
-            category TEXT,
-            url TEXT UNIQUE,
-            pdf_url TEXT,
-            content TEXT,
-            ai_analysis TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # 채용 공고 테이블
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS recruitments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            year INTEGER,
-            position TEXT,
-            department TEXT,
-            requirements TEXT,
-            skills TEXT,
-            hired_count INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    with db_write() as conn:
+        cursor = conn.cursor()
 
-    conn.commit()
-    conn.close()
+        # 브리핑 게시글 테이블
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS briefings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                source TEXT,
+                category TEXT,
+                category_scores TEXT,
+                category_version TEXT,
+                minhash BLOB,
+                canonical_id INTEGER,
+                url TEXT UNIQUE,
+                pdf_url TEXT,
+                content TEXT,
+                ai_analysis TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        _ensure_columns(cursor, "briefings", {
+            "category_scores": "TEXT",
+            "category_version": "TEXT",
+            "minhash": "BLOB",
+            "canonical_id": "INTEGER",
+        })
+
+        # 목록 조회용 인덱스 (카테고리별/전체 최신순 keyset 페이지네이션)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_briefings_category_crawled
+            ON briefings (category, crawled_at DESC, id DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_briefings_crawled
+            ON briefings (crawled_at DESC, id DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_briefings_canonical
+            ON briefings (canonical_id) WHERE canonical_id IS NOT NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_briefings_pdf_url
+            ON briefings (pdf_url) WHERE pdf_url IS NOT NULL
+        """)
 
-    # 더미 채용 데이터 삽입
-    insert_dummy_recruitment_data()
+        # 유사 중복 탐지용 LSH 버킷 (밴드별 MinHash 해시 → 브리핑)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS briefing_lsh (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                briefing_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, briefing_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_briefing_lsh_briefing ON briefing_lsh (briefing_id)
+        """)
 
-def insert_dummy_recruitment_data():
-    """2021~2025년 모의 채용 데이터 삽입"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+        # 관련 브리핑 색인용 n-gram 특성 (seq 순서로 대시보드 색인에 증분 반영)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS briefing_terms (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                briefing_id INTEGER NOT NULL UNIQUE,
+                features BLOB,
+                weights BLOB
+            )
+        """)
+        # 제목·본문이 바뀌거나 브리핑이 삭제되면 특성을 지워 다시 계산되게 함
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS briefing_terms_stale
+            AFTER UPDATE OF title, content ON briefings
+            WHEN old.title IS NOT new.title OR old.content IS NOT new.content BEGIN
+                DELETE FROM briefing_terms WHERE briefing_id = old.id;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS briefing_terms_delete AFTER DELETE ON briefings BEGIN
+                DELETE FROM briefing_terms WHERE briefing_id = old.id;
+            END
+        """)
 
-    # 이미 데이터가 있는지 확인
-    cursor.execute("SELECT COUNT(*) FROM recruitments")
-    if cursor.fetchone()[0] > 0:
-        conn.close()
-        return
+        # 채용 공고 테이블
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS recruitments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                year INTEGER,
+                position TEXT,
+                department TEXT,
+                requirements TEXT,
+                skills TEXT,
+                hired_count INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_recruitments_year ON recruitments (year)
+        """)
 
-    dummy_data = [
-        # 2021년
-        (2021, "보건산업 정책연구원", "정책연구본부", "석사 이상, 보건정책 전공", "정책분석, 통계분석, 보고서 작성", 3),
-        (2021, "R&D 사업관리", "R&D사업본부", "학사 이상, 이공계열", "사업관리, 예산편성, 성과평가", 5),
-        (2021, "행정지원", "경영지원본부", "학사 이상", "문서관리, 회계, 인사", 2),
-
-        # 2022년
-        (2022, "바이오헬스 사업관리", "바이오헬스산업본부", "학사 이상, 생명과학/의공학", "임상시험 관리, 인허가 지원", 4),
-        (2022, "글로벌 진출 지원", "해외사업본부", "학사 이상, 영어 능통", "해외시장 조사, 수출 지원", 3),
-        (2022, "데이터 분석가", "정책연구본부", "석사 이상, 통계/데이터사이언스", "빅데이터 분석, AI 모델링", 2),
-
-        # 2023년
-        (2023, "디지털헬스케어 PM", "디지털헬스본부", "학사 이상, IT/의료 융합", "디지털치료제, AI의료기기 관리", 6),
-        (2023, "규제혁신 전문가", "규제혁신팀", "학사 이상, 법학/보건학", "규제샌드박스, 인허가 컨설팅", 2),
-        (2023, "의료기기 사업관리", "의료기기본부", "학사 이상, 의공학/기계공학", "의료기기 인증, 품질관리", 4),
-
-        # 2024년
-        (2024, "바이오의약품 PM", "바이오의약품본부", "석사 이상, 약학/생명과학", "바이오시밀러, 세포치료제 관리", 5),
-        (2024, "AI 헬스케어 전문가", "디지털헬스본부", "석사 이상, AI/ML 전공", "AI 진단, 디지털바이오마커", 3),
-        (2024, "글로벌 임상 지원", "해외사업본부", "학사 이상, 임상 경험자", "글로벌 임상시험, FDA/EMA 대응", 2),
-        (2024, "ESG 경영 담당", "경영지원본부", "학사 이상", "ESG 전략, 지속가능경영 보고서", 1),
-
-        # 2025년
-        (2025, "첨단바이오 사업관리", "첨단바이오본부", "석사 이상, 유전체학/합성생물학", "유전자치료, mRNA 플랫폼", 4),
-        (2025, "디지털치료제 PM", "디지털헬스본부", "학사 이상, SW/의료 융합", "DTx 인허가, 임상 설계", 3),
-        (2025, "보건안보 전문가", "보건안보팀", "석사 이상, 공중보건/감염병", "팬데믹 대응, 백신 수급", 2),
-        (2025, "메디컬 라이터", "정책연구본부", "석사 이상, 의학/약학", "보건산업 백서, 정책보고서", 2),
-    ]
+        # URL별 조건부 요청 메타데이터 테이블
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS fetch_meta (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                status INTEGER,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
 
-    cursor.executemany("""
-        INSERT INTO recruitments (year, position, department, requirements, skills, hired_count)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, dummy_data)
+        # 게시판별 수집 상태 (최신 게시글 high-water mark, 이력 수집 커서)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS board_state (
+                board_name TEXT PRIMARY KEY,
+                last_post_id INTEGER,
+                last_post_date TEXT,
+                backfill_page INTEGER DEFAULT 1,
+                backfill_done INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
 
-    conn.commit()
-    conn.close()
+        # 상세·PDF 단계에서 실패해 다음 수집 때 다시 받을 게시글 (목록 정보 JSON)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_retries (
+                url TEXT PRIMARY KEY,
+                board_name TEXT NOT NULL,
+                article TEXT NOT NULL,
+                attempts INTEGER DEFAULT 0,
+                error TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
 
-def save_briefing(title: str, source: str, category: str, url: str,
-                  pdf_url: str = None, content: str = None, ai_analysis: str = None):
-    """브리핑 데이터 저장"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+        # AI 분석 캐시 (콘텐츠 해시 + 모델 + 프롬프트 버전 기준)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                cache_key TEXT PRIMARY KEY,
+                content_hash TEXT,
+                model TEXT,
+                prompt_version TEXT,
+                analysis TEXT NOT NULL,
+                hit_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_hit_at TIMESTAMP
+            )
+        """)
 
-    try:
+        # PDF 텍스트 캐시 매니페스트 (PDF 바이트 해시 기준) 및 URL 별칭
         cursor.execute("""
-            INSERT OR REPLACE INTO briefings
-            (title, source, category, url, pdf_url, content, ai_analysis, crawled_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (title, source, category, url, pdf_url, content, ai_analysis, datetime.now()))
-        conn.commit()
-    except Exception as e:
-        st.error(f"DB 저장 오류: {e}")
-    finally:
-        conn.close()
+            CREATE TABLE IF NOT EXISTS pdf_cache_manifest (
+                digest TEXT PRIMARY KEY,
+                size_bytes INTEGER NOT NULL,
+                text_chars INTEGER,
+                extractor_version TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_access_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdf_cache_last_access
+            ON pdf_cache_manifest (last_access_at)
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdf_url_alias (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdf_url_alias_digest ON pdf_url_alias (digest)
+        """)
 
-def get_briefings(category: str = "전체", limit: int = 20) -> List[Dict]:
-    """브리핑 데이터 조회"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+        # 백그라운드 AI 분석 작업 큐 (status: queued → running → done/failed/skipped)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                briefing_id INTEGER UNIQUE NOT NULL,
+                priority INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'queued',
+                attempts INTEGER DEFAULT 0,
+                not_before TIMESTAMP,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_analysis_jobs_queue
+            ON analysis_jobs (status, priority DESC, id DESC)
+        """)
 
-    if category == "전체":
+        # 로컬 자료 수집 이력 (경로·크기·수정 시각이 같으면 해시 없이 건너뜀, 같은 해시는 한 번만 저장)
         cursor.execute("""
-            SELECT * FROM briefings
-            ORDER BY crawled_at DESC LIMIT ?
-        """, (limit,))
-    else:
+            CREATE TABLE IF NOT EXISTS local_files (
+                path TEXT PRIMARY KEY,
+                digest TEXT,
+                size_bytes INTEGER,
+                mtime_ns INTEGER,
+                status TEXT,
+                error TEXT,
+                ingested_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_local_files_digest ON local_files (digest)
+        """)
+
+        # 단계별 성능 계측 기록 (진단 화면용, 보관 기간·행 수 제한)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                stage TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                duration_ms REAL,
+                bytes INTEGER,
+                cache TEXT,
+                error TEXT,
+                pid INTEGER
+            )
+        """)
         cursor.execute("""
-            SELECT * FROM briefings
-            WHERE category = ?
-            ORDER BY crawled_at DESC LIMIT ?
-        """, (category, limit))
+            CREATE INDEX IF NOT EXISTS idx_metrics_started ON metrics (started_at)
+        """)
+
+        # 수집 실행 이력 (대시보드는 이 테이블로 수집 진행 상황만 조회)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                mode TEXT,
+                boards TEXT,
+                pid INTEGER,
+                status TEXT DEFAULT 'running',
+                progress TEXT,
+                inserted INTEGER DEFAULT 0,
+                updated INTEGER DEFAULT 0,
+                unchanged INTEGER DEFAULT 0,
+                errors TEXT,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        """)
+
+    # 전문 검색 인덱스
+    init_search_index()
+
+    # 더미 채용 데이터 삽입
+    insert_dummy_recruitment_data()
+
+    # 관련 브리핑 색인에 빠진 브리핑 특성 계산
+    update_briefing_terms()
+
+def _ensure_columns(cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]):
+    """기존 DB 파일에 없는 컬럼 추가"""
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    for name, column_type in columns.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+def init_search_index():
+    """briefings 전문 검색용 FTS5(trigram) 테이블과 동기화 트리거 생성
+
+    trigram 토크나이저는 형태소 분석 없이 한국어 부분 문자열 검색을 지원한다.
+    FTS5/trigram을 지원하지 않는 SQLite에서는 생성을 건너뛰고 LIKE 검색으로 대체한다.
+    """
+    with db_write() as conn:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'briefings_fts'"
+        ).fetchone()
+        if exists:
+            return
+
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE briefings_fts USING fts5(
+                    title, content, ai_analysis,
+                    content='briefings', content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return
+
+        conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS briefings_fts_insert AFTER INSERT ON briefings BEGIN
+                INSERT INTO briefings_fts (rowid, title, content, ai_analysis)
+                VALUES (new.id, new.title, new.content, new.ai_analysis);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS briefings_fts_delete AFTER DELETE ON briefings BEGIN
+                INSERT INTO briefings_fts (briefings_fts, rowid, title, content, ai_analysis)
+                VALUES ('delete', old.id, old.title, old.content, old.ai_analysis);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS briefings_fts_update
+            AFTER UPDATE OF title, content, ai_analysis ON briefings BEGIN
+                INSERT INTO briefings_fts (briefings_fts, rowid, title, content, ai_analysis)
+                VALUES ('delete', old.id, old.title, old.content, old.ai_analysis);
+                INSERT INTO briefings_fts (rowid, title, content, ai_analysis)
+                VALUES (new.id, new.title, new.content, new.ai_analysis);
+            END;
+        """)
+
+        # 기존 데이터 색인
+        conn.execute("INSERT INTO briefings_fts (briefings_fts) VALUES ('rebuild')")
 
-    columns = [desc[0] for desc in cursor.description]
-    results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-    conn.close()
+def insert_dummy_recruitment_data():
+    """2021~2025년 모의 채용 데이터 삽입"""
+    with db_write() as conn:
+        cursor = conn.cursor()
+
+        # 이미 데이터가 있는지 확인
+        cursor.execute("SELECT COUNT(*) FROM recruitments")
+        if cursor.fetchone()[0] > 0:
+            return
+
+        dummy_data = [
+            # 2021년
+            (2021, "보건산업 정책연구원", "정책연구본부", "석사 이상, 보건정책 전공", "정책분석, 통계분석, 보고서 작성", 3),
+            (2021, "R&D 사업관리", "R&D사업본부", "학사 이상, 이공계열", "사업관리, 예산편성, 성과평가", 5),
+            (2021, "행정지원", "경영지원본부", "학사 이상", "문서관리, 회계, 인사", 2),
+
+            # 2022년
+            (2022, "바이오헬스 사업관리", "바이오헬스산업본부", "학사 이상, 생명과학/의공학", "임상시험 관리, 인허가 지원", 4),
+            (2022, "글로벌 진출 지원", "해외사업본부", "학사 이상, 영어 능통", "해외시장 조사, 수출 지원", 3),
+            (2022, "데이터 분석가", "정책연구본부", "석사 이상, 통계/데이터사이언스", "빅데이터 분석, AI 모델링", 2),
+
+            # 2023년
+            (2023, "디지털헬스케어 PM", "디지털헬스본부", "학사 이상, IT/의료 융합", "디지털치료제, AI의료기기 관리", 6),
+            (2023, "규제혁신 전문가", "규제혁신팀", "학사 이상, 법학/보건학", "규제샌드박스, 인허가 컨설팅", 2),
+            (2023, "의료기기 사업관리", "의료기기본부", "학사 이상, 의공학/기계공학", "의료기기 인증, 품질관리", 4),
+
+            # 2024년
+            (2024, "바이오의약품 PM", "바이오의약품본부", "석사 이상, 약학/생명과학", "바이오시밀러, 세포치료제 관리", 5),
+            (2024, "AI 헬스케어 전문가", "디지털헬스본부", "석사 이상, AI/ML 전공", "AI 진단, 디지털바이오마커", 3),
+            (2024, "글로벌 임상 지원", "해외사업본부", "학사 이상, 임상 경험자", "글로벌 임상시험, FDA/EMA 대응", 2),
+            (2024, "ESG 경영 담당", "경영지원본부", "학사 이상", "ESG 전략, 지속가능경영 보고서", 1),
+
+            # 2025년
+            (2025, "첨단바이오 사업관리", "첨단바이오본부", "석사 이상, 유전체학/합성생물학", "유전자치료, mRNA 플랫폼", 4),
+            (2025, "디지털치료제 PM", "디지털헬스본부", "학사 이상, SW/의료 융합", "DTx 인허가, 임상 설계", 3),
+            (2025, "보건안보 전문가", "보건안보팀", "석사 이상, 공중보건/감염병", "팬데믹 대응, 백신 수급", 2),
+            (2025, "메디컬 라이터", "정책연구본부", "석사 이상, 의학/약학", "보건산업 백서, 정책보고서", 2),
+        ]
+
+        cursor.executemany("""
+            INSERT INTO recruitments (year, position, department, requirements, skills, hired_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, dummy_data)
+
+
+BRIEFING_FIELDS = ("title", "source", "category", "category_scores", "category_version",
+                   "url", "pdf_url", "content", "ai_analysis")
+
+def save_briefings(briefings: List[Dict]) -> Dict[str, int]:
+    """여러 브리핑을 한 트랜잭션으로 UPSERT하고 신규/갱신/변경 없음 건수 반환
+
+    URL이 같은 기존 행은 id와 저장된 AI 분석을 유지한 채 내용이 바뀐 경우에만 갱신한다.
+    """
+    # 같은 URL이 여러 번 들어오면 마지막 값 사용
+    by_url: Dict[Optional[str], Dict] = {}
+    no_url: List[Dict] = []
+    for briefing in briefings:
+        row = {field: briefing.get(field) for field in BRIEFING_FIELDS}
+        if row['url']:
+            by_url[row['url']] = row
+        else:
+            no_url.append(row)
+
+    counts = {"inserted": len(no_url), "updated": 0, "unchanged": 0}
+    compare_fields = [f for f in BRIEFING_FIELDS if f not in ("url", "ai_analysis")]
+    now = datetime.now()
+
+    with span("저장"), db_write() as conn:
+        # 기존 행과 비교해 실제로 바뀐 행만 기록
+        existing = {}
+        urls = list(by_url)
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT url, {', '.join(compare_fields)} FROM briefings WHERE url IN ({placeholders})",
+                chunk,
+            )
+            for row in cursor.fetchall():
+                existing[row[0]] = dict(zip(compare_fields, row[1:]))
+
+        changed = list(no_url)
+        for url, row in by_url.items():
+            old = existing.get(url)
+            if old is None:
+                counts["inserted"] += 1
+                changed.append(row)
+            elif any(row[f] != old[f] for f in compare_fields) or (
+                row['ai_analysis'] is not None
+            ):
+                counts["updated"] += 1
+                changed.append(row)
+            else:
+                counts["unchanged"] += 1
+
+        conn.executemany(f"""
+            INSERT INTO briefings ({', '.join(BRIEFING_FIELDS)}, crawled_at)
+            VALUES ({', '.join('?' * len(BRIEFING_FIELDS))}, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                {', '.join(f"{f} = excluded.{f}" for f in compare_fields)},
+                ai_analysis = COALESCE(excluded.ai_analysis, briefings.ai_analysis),
+                minhash = CASE WHEN briefings.content IS excluded.content AND briefings.title IS excluded.title
+                               THEN briefings.minhash END,
+                crawled_at = excluded.crawled_at
+            WHERE {' OR '.join(f"briefings.{f} IS NOT excluded.{f}" for f in compare_fields)}
+                OR excluded.ai_analysis IS NOT NULL
+        """, [tuple(row[f] for f in BRIEFING_FIELDS) + (now,) for row in changed])
+
+    return counts
+
+BRIEFING_CARD_COLUMNS = ("id", "title", "category", "category_scores", "source", "url", "pdf_url", "crawled_at")
+
+def list_briefings(category: str = "전체", after: Optional[Tuple[str, int]] = None,
+                   limit: int = BRIEFING_PAGE_SIZE) -> Tuple[List[Dict], Optional[Tuple[str, int]]]:
+    """카드 표시용 컬럼만 최신순으로 조회 (after 커서 이후 limit건, 다음 커서 함께 반환)
+
+    본문·분석 텍스트는 제외하며, (crawled_at, id) keyset 조건으로 페이지를 넘기므로
+    아카이브가 커져도 페이지 조회 비용이 일정하다.
+    """
+    conditions, params = ["canonical_id IS NULL"], []
+    if category != "전체":
+        conditions.append("category = ?")
+        params.append(category)
+    if after is not None:
+        conditions.append("(crawled_at, id) < (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(conditions)}"
+
+    with db_read() as conn:
+        cursor = conn.execute(f"""
+            SELECT {', '.join(BRIEFING_CARD_COLUMNS)}, ai_analysis IS NOT NULL AS has_analysis
+            FROM briefings {where}
+            ORDER BY crawled_at DESC, id DESC
+            LIMIT ?
+        """, params + [limit + 1])
+        columns = [desc[0] for desc in cursor.description]
+        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        _attach_duplicate_sources(conn, results[:limit])
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = (results[-1]['crawled_at'], results[-1]['id'])
+    return results, next_cursor
+
+def get_briefing_detail(briefing_id: int) -> Optional[Dict]:
+    """브리핑 본문과 AI 분석 조회 (카드 펼칠 때 호출)"""
+    with db_read() as conn:
+        cursor = conn.execute(
+            "SELECT id, content, ai_analysis FROM briefings WHERE id = ?", (briefing_id,)
+        )
+        row = cursor.fetchone()
+        columns = [desc[0] for desc in cursor.description]
+    return dict(zip(columns, row)) if row else None
+
+SEARCH_SNIPPET_CHARS = 60
+
+def _make_snippet(text: str, terms: List[str], width: int = SEARCH_SNIPPET_CHARS) -> str:
+    """첫 번째 일치 위치 주변을 잘라 검색어를 굵게 표시"""
+    text = text or ""
+    lowered = text.lower()
+    positions = [lowered.find(t.lower()) for t in terms if t.lower() in lowered]
+    start = max(min(positions) - width // 2, 0) if positions else 0
+    snippet = text[start:start + width]
+    for term in terms:
+        snippet = re.sub(re.escape(term), lambda m: f"**{m.group(0)}**", snippet, flags=re.IGNORECASE)
+    return ("…" if start > 0 else "") + snippet + ("…" if start + width < len(text) else "")
+
+def search_briefings(query: str, category: str = "전체",
+                     limit: int = BRIEFING_PAGE_SIZE) -> List[Dict]:
+    """제목·본문·AI 분석 전문 검색 (BM25 순위, 하이라이트 스니펫 포함)
+
+    3글자 이상 검색어는 FTS5 trigram 인덱스로 찾고, 2글자 이하 검색어는
+    인덱스로 좁힌 결과에 LIKE 조건으로 추가 적용한다.
+    """
+    terms = [t for t in query.split() if t]
+    if not terms:
+        return []
+
+    long_terms = [t for t in terms if len(t) >= 3]
+    short_terms = [t for t in terms if len(t) < 3]
+
+    with db_read() as conn:
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'briefings_fts'"
+        ).fetchone()
+
+        conditions, params = ["b.canonical_id IS NULL"], []
+        if category != "전체":
+            conditions.append("b.category = ?")
+            params.append(category)
+        for term in (short_terms if has_fts and long_terms else terms):
+            conditions.append("(b.title LIKE ? OR b.content LIKE ? OR b.ai_analysis LIKE ?)")
+            params.extend([f"%{term}%"] * 3)
+
+        card_columns = ", ".join(f"b.{c}" for c in BRIEFING_CARD_COLUMNS)
+
+        if has_fts and long_terms:
+            match = " ".join('"' + t.replace('"', '""') + '"' for t in long_terms)
+            where = " AND ".join(["briefings_fts MATCH ?"] + conditions)
+            cursor = conn.execute(f"""
+                SELECT {card_columns}, b.ai_analysis IS NOT NULL AS has_analysis,
+                       snippet(briefings_fts, -1, '**', '**', '…', {SEARCH_SNIPPET_CHARS // 2}) AS snippet,
+                       bm25(briefings_fts, 10.0, 1.0, 0.5) AS score
+                FROM briefings_fts
+                JOIN briefings b ON b.id = briefings_fts.rowid
+                WHERE {where}
+                ORDER BY score
+                LIMIT ?
+            """, [match] + params + [limit])
+        else:
+            cursor = conn.execute(f"""
+                SELECT {card_columns}, b.ai_analysis IS NOT NULL AS has_analysis,
+                       substr(b.content, 1, 2000) AS snippet, 0 AS score
+                FROM briefings b
+                WHERE {' AND '.join(conditions)}
+                ORDER BY b.crawled_at DESC, b.id DESC
+                LIMIT ?
+            """, params + [limit])
+
+        columns = [desc[0] for desc in cursor.description]
+        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        _attach_duplicate_sources(conn, results)
+
+    if not (has_fts and long_terms):
+        for result in results:
+            result['snippet'] = _make_snippet(result['snippet'], terms)
     return results
 
-def get_recruitment_data() -> List[Dict]:
-    """채용 데이터 조회"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM recruitments ORDER BY year DESC, position")
-    columns = [desc[0] for desc in cursor.description]
-    results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-    conn.close()
+def get_recruitment_data(year: Optional[int] = None) -> List[Dict]:
+    """채용 데이터 조회 (year를 주면 해당 연도만)"""
+    with db_read() as conn:
+        cursor = conn.cursor()
+        if year is None:
+            cursor.execute("SELECT * FROM recruitments ORDER BY year DESC, position")
+        else:
+            cursor.execute("SELECT * FROM recruitments WHERE year = ? ORDER BY position", (year,))
+        columns = [desc[0] for desc in cursor.description]
+        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
     return results
 
+def save_briefing_analysis(url: str, ai_analysis: str):
+    """브리핑에 AI 분석 결과 저장"""
+    with db_write() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE briefings SET ai_analysis = ? WHERE url = ?", (ai_analysis, url))
+
+def analysis_cache_key(title: str, content: str, model: str = GEMINI_MODEL,
+                       prompt_version: Optional[str] = None) -> Tuple[str, str]:
+    """분석 캐시 키와 콘텐츠 해시 생성"""
+    prompt_version = prompt_version or INBASKET_PROMPT_VERSION
+    content_hash = hashlib.sha256(f"{title}\n{content}".encode()).hexdigest()
+    cache_key = hashlib.sha256(f"{content_hash}:{model}:{prompt_version}".encode()).hexdigest()
+    return cache_key, content_hash
+
+def get_cached_analysis(cache_key: str, count_hit: bool = True) -> Optional[str]:
+    """캐시된 AI 분석 조회 (적중 시 적중 횟수·시각 갱신)"""
+    with db_read() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT analysis FROM analysis_cache WHERE cache_key = ?", (cache_key,))
+        row = cursor.fetchone()
+
+    record_cache("분석 캐시", hit=row is not None)
+    if row is None or not count_hit:
+        return row[0] if row else None
+
+    # 적중 횟수는 화면에 보이지 않으므로 데이터 버전을 올리지 않음 (조회 캐시 유지)
+    with db_write(bump_version=False) as conn:
+        conn.execute("""
+            UPDATE analysis_cache SET hit_count = hit_count + 1, last_hit_at = ?
+            WHERE cache_key = ?
+        """, (datetime.now(), cache_key))
+    return row[0]
+
+def save_cached_analysis(cache_key: str, content_hash: str, analysis: str,
+                         model: str = GEMINI_MODEL, prompt_version: Optional[str] = None):
+    """AI 분석 결과를 캐시에 저장"""
+    with db_write() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO analysis_cache
+            (cache_key, content_hash, model, prompt_version, analysis, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (cache_key, content_hash, model, prompt_version or INBASKET_PROMPT_VERSION,
+              analysis, datetime.now()))
+
+def get_known_urls(urls: Iterable[str]) -> set:
+    """주어진 URL 중 이미 저장된 브리핑 URL 집합"""
+    urls = list(urls)
+    if not urls:
+        return set()
+
+    with db_read() as conn:
+        cursor = conn.cursor()
+        placeholders = ",".join("?" * len(urls))
+        cursor.execute(f"SELECT url FROM briefings WHERE url IN ({placeholders})", urls)
+        known = {row[0] for row in cursor.fetchall()}
+    return known
+
+def get_board_state(board_name: str) -> Dict:
+    """게시판 수집 상태 조회 (없으면 기본값)"""
+    with db_read() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT board_name, last_post_id, last_post_date, backfill_page, backfill_done, updated_at
+            FROM board_state WHERE board_name = ?
+        """, (board_name,))
+        row = cursor.fetchone()
+        columns = [desc[0] for desc in cursor.description]
+
+    if row:
+        return dict(zip(columns, row))
+    return {"board_name": board_name, "last_post_id": None, "last_post_date": None,
+            "backfill_page": 1, "backfill_done": 0, "updated_at": None}
+
+def update_board_high_water(board_name: str, post_id: Optional[int], post_date: Optional[str]):
+    """저장된 최신 게시글 기준으로 게시판 high-water mark 갱신"""
+    with db_write(bump_version=False) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO board_state (board_name, last_post_id, last_post_date, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(board_name) DO UPDATE SET
+                last_post_id = MAX(COALESCE(last_post_id, 0), COALESCE(excluded.last_post_id, 0)),
+                last_post_date = MAX(COALESCE(last_post_date, ''), COALESCE(excluded.last_post_date, '')),
+                updated_at = excluded.updated_at
+        """, (board_name, post_id, post_date, datetime.now()))
+
+def set_backfill_cursor(board_name: str, page: int, done: bool = False, rewind: bool = False):
+    """이력 수집 커서 저장 (rewind면 더 앞쪽 페이지로만 되돌림)"""
+    with db_write(bump_version=False) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            INSERT INTO board_state (board_name, backfill_page, backfill_done, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(board_name) DO UPDATE SET
+                backfill_page = {"MIN(backfill_page, excluded.backfill_page)" if rewind else "excluded.backfill_page"},
+                backfill_done = excluded.backfill_done,
+                updated_at = excluded.updated_at
+        """, (board_name, page, int(done), datetime.now()))
+
+RETRY_ARTICLE_FIELDS = ("title", "source", "date", "post_id", "url")
+
+def get_crawl_retries(board_name: str) -> List[Dict]:
+    """게시판의 재시도 대기 게시글 (목록 단계 정보)"""
+    with db_read() as conn:
+        rows = conn.execute(
+            "SELECT article FROM crawl_retries WHERE board_name = ? AND attempts < ? ORDER BY updated_at",
+            (board_name, CRAWL_RETRY_MAX_ATTEMPTS),
+        ).fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+def save_crawl_retries(failed: Iterable[Tuple[Dict, str]]):
+    """실패한 게시글을 재시도 목록에 추가 (이미 있으면 시도 횟수 증가)"""
+    now = datetime.now()
+    rows = [
+        (article['url'], article['source'],
+         json.dumps({k: article.get(k) for k in RETRY_ARTICLE_FIELDS}, ensure_ascii=False), error, now)
+        for article, error in failed
+    ]
+    if not rows:
+        return
+    with db_write(bump_version=False) as conn:
+        conn.executemany("""
+            INSERT INTO crawl_retries (url, board_name, article, attempts, error, updated_at)
+            VALUES (?, ?, ?, 1, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                attempts = attempts + 1, error = excluded.error, updated_at = excluded.updated_at
+        """, rows)
+
+def clear_crawl_retries(urls: Iterable[str]):
+    """저장에 성공한 게시글을 재시도 목록에서 삭제"""
+    urls = [(url,) for url in urls]
+    if not urls:
+        return
+    with db_write(bump_version=False) as conn:
+        conn.executemany("DELETE FROM crawl_retries WHERE url = ?", urls)
+
+def get_fetch_meta(url: str) -> Optional[Dict]:
+    """URL의 마지막 요청 메타데이터 조회"""
+    with db_read() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT url, etag, last_modified, content_hash, status, fetched_at
+            FROM fetch_meta WHERE url = ?
+        """, (url,))
+        row = cursor.fetchone()
+        columns = [desc[0] for desc in cursor.description]
+    return dict(zip(columns, row)) if row else None
+
+def save_fetch_meta(url: str, etag: Optional[str], last_modified: Optional[str],
+                    content_hash: Optional[str], status: int):
+    """URL의 요청 메타데이터 저장 (수집 기록이라 화면 조회 캐시는 무효화하지 않음)"""
+    with db_write(bump_version=False) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO fetch_meta
+            (url, etag, last_modified, content_hash, status, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (url, etag, last_modified, content_hash, status, datetime.now()))
+
+def save_fetch_metas(metas: Dict[str, Tuple]):
+    """fetch_url(meta_sink=...)로 모아 둔 메타데이터를 한 트랜잭션으로 저장"""
+    with db_write(bump_version=False):
+        for url, (etag, last_modified, content_hash, status) in metas.items():
+            save_fetch_meta(url, etag, last_modified, content_hash, status)
+
+def invalidate_fetch_meta(urls: Iterable[str]):
+    """다음 수집 때 다시 받아오도록 URL 메타데이터 삭제"""
+    with db_write(bump_version=False) as conn:
+        cursor = conn.cursor()
+        cursor.executemany("DELETE FROM fetch_meta WHERE url = ?", [(url,) for url in urls])
+
 # ============================================================
-# 크롤러 함수
+# 채용 통계 집계 (SQL GROUP BY + pandas, 채용 이력 가져오기)
 # ============================================================
-def crawl_khidi_board(board_name: str, board_url: str, max_items: int = 5) -> List[Dict]:
-    """KHIDI 게시판 크롤링"""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
+
+def classify_position_families(frame: pd.DataFrame) -> pd.Series:
+    """직무명·부서명으로 직무군 분류 (POSITION_FAMILIES 순서대로 먼저 맞는 직무군)"""
+    text = frame["position"].fillna("") + " " + frame["department"].fillna("")
+    conditions = [
+        text.str.contains("|".join(re.escape(k) for k in keywords), case=False, regex=True)
+        for keywords in POSITION_FAMILIES.values()
+    ]
+    return pd.Series(np.select(conditions, list(POSITION_FAMILIES), default=OTHER_POSITION_FAMILY),
+                     index=frame.index)
+
+def get_recruitment_stats() -> Dict[str, pd.DataFrame]:
+    """연도별 합계·전년 대비 증감, 직무군·부서별 연도 추이
+
+    yearly: year, hired, positions, hired_change, hired_change_pct
+    by_family / by_department: 연도 × 직무군(부서) 채용 인원 피벗
+    """
+    with db_read() as conn:
+        yearly = pd.read_sql_query("""
+            SELECT year, SUM(hired_count) AS hired, COUNT(*) AS positions
+            FROM recruitments GROUP BY year ORDER BY year
+        """, conn)
+        groups = pd.read_sql_query("""
+            SELECT year, position, department, SUM(hired_count) AS hired
+            FROM recruitments GROUP BY year, position, department
+        """, conn)
+
+    # 중간에 채용이 없던 연도도 0명으로 채워 전년 대비 증감이 연속되게 함
+    if not yearly.empty:
+        years = pd.RangeIndex(yearly["year"].min(), yearly["year"].max() + 1, name="year")
+        yearly = yearly.set_index("year").reindex(years, fill_value=0).reset_index()
+    yearly["hired_change"] = yearly["hired"].diff()
+    yearly["hired_change_pct"] = yearly["hired"].pct_change().replace([np.inf, -np.inf], np.nan)
+
+    groups["family"] = classify_position_families(groups)
+    stats = {"yearly": yearly}
+    for column in ("family", "department"):
+        stats[f"by_{column}"] = groups.pivot_table(index="year", columns=column, values="hired",
+                                                   aggfunc="sum", fill_value=0)
+    families = [f for f in [*POSITION_FAMILIES, OTHER_POSITION_FAMILY] if f in stats["by_family"].columns]
+    stats["by_family"] = stats["by_family"][families]
+    return stats
+
+def read_recruitment_file(source, filename: str) -> pd.DataFrame:
+    """CSV/Excel 채용 이력 파일을 표준 컬럼으로 읽기
+
+    source는 파일 경로나 파일 객체. 헤더는 영문 컬럼명이나 한글 별칭(연도, 직무, 채용인원 등)을
+    쓸 수 있고, 연도·직무·채용인원이 없는 파일이나 읽을 수 없는 형식은 ValueError를 낸다.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".xlsx":
+        try:
+            import openpyxl  # noqa: F401  pandas.read_excel이 사용하는 선택 의존성
+        except ImportError:
+            raise ValueError("Excel 파일을 읽으려면 openpyxl 패키지가 필요합니다 (pip install openpyxl).")
+        frame = pd.read_excel(source, dtype=str)
+    elif extension == ".csv":
+        # 엑셀에서 저장한 CSV는 CP949인 경우가 많음
+        try:
+            frame = pd.read_csv(source, dtype=str, encoding="utf-8-sig")
+        except UnicodeDecodeError:
+            if hasattr(source, "seek"):
+                source.seek(0)
+            frame = pd.read_csv(source, dtype=str, encoding="cp949")
+    else:
+        raise ValueError("CSV 또는 XLSX 파일만 가져올 수 있습니다.")
+
+    aliases = {alias.lower(): column for column, names in RECRUITMENT_COLUMN_ALIASES.items() for alias in names}
+    frame.columns = [aliases.get(str(name).strip().lower(), str(name).strip()) for name in frame.columns]
+    missing = [c for c in RECRUITMENT_REQUIRED_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError("필수 컬럼이 없습니다: " + ", ".join(RECRUITMENT_COLUMN_ALIASES[c][1] for c in missing))
+
+    frame = frame.reindex(columns=list(RECRUITMENT_COLUMN_ALIASES))
+    frame["year"] = pd.to_numeric(frame["year"], errors="coerce")
+    frame["hired_count"] = pd.to_numeric(frame["hired_count"], errors="coerce").fillna(0)
+    frame["position"] = frame["position"].str.strip()
+    frame = frame.dropna(subset=["year", "position"])
+    frame = frame[frame["position"] != ""]
+    frame[["year", "hired_count"]] = frame[["year", "hired_count"]].astype(int)
+    text_columns = ["department", "requirements", "skills"]
+    frame[text_columns] = frame[text_columns].fillna("").apply(lambda column: column.str.strip())
+    return frame
+
+def import_recruitments(frame: pd.DataFrame) -> Dict[str, int]:
+    """채용 이력을 한 트랜잭션으로 저장 (파일에 포함된 연도의 기존 행은 교체)"""
+    years = sorted(int(y) for y in frame["year"].unique())
+    if not years:
+        return {"inserted": 0, "replaced": 0, "years": 0}
+
+    with db_write() as conn:
+        placeholders = ",".join("?" * len(years))
+        replaced = conn.execute(f"DELETE FROM recruitments WHERE year IN ({placeholders})", years).rowcount
+        conn.executemany("""
+            INSERT INTO recruitments (year, position, department, requirements, skills, hired_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, frame[list(RECRUITMENT_COLUMN_ALIASES)].itertuples(index=False, name=None))
+
+    return {"inserted": len(frame), "replaced": replaced, "years": len(years)}
+
+# ============================================================
+# PDF 텍스트 캐시 (PDF 바이트 해시 기준, gzip 압축, LRU 정리)
+# ============================================================
+def _pdf_object_path(digest: str) -> str:
+    """PDF 해시에 대응하는 압축 텍스트 파일 경로"""
+    return os.path.join(PDF_CACHE_DIR, "objects", digest[:2], f"{digest}.txt.gz")
+
+def file_sha256(path: str) -> str:
+    """파일 SHA-256 해시 계산"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(PDF_DOWNLOAD_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_pdf_text_by_digest(digest: str) -> Optional[str]:
+    """PDF 해시로 캐시된 텍스트 조회 (추출기 버전이 다르거나 파일이 없으면 None)"""
+    with db_read() as conn:
+        row = conn.execute(
+            "SELECT extractor_version FROM pdf_cache_manifest WHERE digest = ?", (digest,)
+        ).fetchone()
+    if row is None or row[0] != PDF_EXTRACTOR_VERSION:
+        record_cache("PDF 텍스트 캐시", hit=False)
+        return None
 
     try:
-        response = requests.get(board_url, headers=headers, timeout=10)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with gzip.open(_pdf_object_path(digest), 'rt', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        record_cache("PDF 텍스트 캐시", hit=False)
+        return None
+
+    record_cache("PDF 텍스트 캐시", hit=True)
+
+    with db_write(bump_version=False) as conn:
+        conn.execute(
+            "UPDATE pdf_cache_manifest SET last_access_at = ? WHERE digest = ?",
+            (datetime.now(), digest),
+        )
+    return text
+
+def load_cached_pdf_text(pdf_url: str) -> Optional[str]:
+    """PDF URL 별칭으로 캐시된 텍스트 조회 (없으면 None)"""
+    with db_read() as conn:
+        row = conn.execute("SELECT digest FROM pdf_url_alias WHERE url = ?", (pdf_url,)).fetchone()
+    if row is None:
+        record_cache("PDF 텍스트 캐시", hit=False)
+        return None
+    return load_pdf_text_by_digest(row[0])
+
+def set_pdf_url_alias(pdf_url: str, digest: str):
+    """PDF URL → PDF 해시 별칭 저장"""
+    with db_write(bump_version=False) as conn:
+        conn.execute("""
+            INSERT INTO pdf_url_alias (url, digest, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET digest = excluded.digest, updated_at = excluded.updated_at
+        """, (pdf_url, digest, datetime.now()))
+
+def store_pdf_text(digest: str, text: str):
+    """추출 텍스트를 압축해 원자적으로 저장하고 매니페스트 갱신
+
+    임시 파일에 먼저 쓴 뒤 os.replace로 교체하므로 동시에 실행되는 수집 작업이
+    쓰다 만 캐시 파일을 읽는 일이 없다.
+    """
+    path = _pdf_object_path(digest)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+            f.write(text.encode('utf-8'))
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+    now = datetime.now()
+    with db_write(bump_version=False) as conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO pdf_cache_manifest
+            (digest, size_bytes, text_chars, extractor_version, created_at, last_access_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (digest, os.path.getsize(path), len(text), PDF_EXTRACTOR_VERSION, now, now))
+
+    evict_pdf_cache()
+
+def evict_pdf_cache(max_bytes: int = PDF_CACHE_MAX_BYTES) -> int:
+    """캐시 총 크기가 예산을 넘으면 가장 오래 사용하지 않은 항목부터 삭제하고 삭제 건수 반환"""
+    with db_read() as conn:
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM pdf_cache_manifest").fetchone()[0]
+        if total <= max_bytes:
+            return 0
+        candidates = conn.execute("""
+            SELECT digest, size_bytes FROM pdf_cache_manifest
+            ORDER BY COALESCE(last_access_at, created_at) ASC
+        """).fetchall()
+
+    evicted = []
+    for digest, size_bytes in candidates:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(_pdf_object_path(digest))
+        except FileNotFoundError:
+            pass
+        evicted.append((digest,))
+        total -= size_bytes
+
+    with db_write(bump_version=False) as conn:
+        conn.executemany("DELETE FROM pdf_cache_manifest WHERE digest = ?", evicted)
+        conn.executemany("DELETE FROM pdf_url_alias WHERE digest = ?", evicted)
+    return len(evicted)
+
+def get_pdf_cache_stats() -> Dict[str, int]:
+    """PDF 캐시 항목 수와 총 크기"""
+    with db_read() as conn:
+        entries, size_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM pdf_cache_manifest"
+        ).fetchone()
+    return {"entries": entries, "size_bytes": size_bytes, "max_bytes": PDF_CACHE_MAX_BYTES}
 
-        articles = []
+# ============================================================
+# 유사 중복 탐지 (게시판 간 같은 자료를 MinHash + LSH로 연결)
+# ============================================================
+_minhash_rng = np.random.default_rng(0x4B484944)
+MINHASH_A = _minhash_rng.integers(1, 2 ** 63, size=MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+MINHASH_B = _minhash_rng.integers(0, 2 ** 63, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """공백을 정규화한 문자 n-gram의 64비트 롤링 해시 (중복 제거)"""
+    normalized = re.sub(r"\s+", " ", text.lower()).strip()
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    count = len(codes) - SHINGLE_SIZE + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        hashes = hashes * np.uint64(1000003) + codes[offset:offset + count]
+    return np.unique(hashes)
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash 서명 (uint32 × MINHASH_PERMUTATIONS, 본문이 짧으면 None)"""
+    if not text or len(text) < DUPLICATE_MIN_CHARS:
+        return None
+    hashes = _shingle_hashes(text)
+    if hashes.size == 0:
+        return None
+
+    # 곱셈-시프트 해시로 순열을 근사하고, 메모리를 위해 shingle을 나눠서 최솟값 누적
+    signature = np.full(MINHASH_PERMUTATIONS, np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, hashes.size, MINHASH_CHUNK):
+        chunk = hashes[start:start + MINHASH_CHUNK, None]
+        np.minimum(signature, (chunk * MINHASH_A + MINHASH_B).min(axis=0), out=signature)
+    return (signature >> np.uint64(32)).astype(np.uint32)
+
+def lsh_buckets(signature: np.ndarray) -> List[Tuple[int, int]]:
+    """밴드별 버킷 키 [(밴드, 버킷)]"""
+    buckets = []
+    for band, rows in enumerate(signature.reshape(LSH_BANDS, -1)):
+        digest = hashlib.blake2b(rows.tobytes(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """두 MinHash 서명의 추정 자카드 유사도"""
+    return float(np.mean(a == b))
+
+def link_near_duplicates() -> int:
+    """서명이 없는 브리핑의 MinHash를 계산해 기존 브리핑과 유사하면 대표 브리핑에 연결
+
+    먼저 저장된(id가 작은) 브리핑이 대표가 되며, 같은 배치 안의 중복도 id 순서대로
+    처리되어 서로 연결된다. 연결된 브리핑은 목록·검색·AI 분석 대상에서 빠진다.
+    연결된 건수를 반환한다.
+    """
+    with db_read() as conn:
+        pending = conn.execute("""
+            SELECT id, title, content FROM briefings WHERE minhash IS NULL ORDER BY id
+        """).fetchall()
+    if not pending:
+        return 0
+
+    # 서명 계산과 후보 조회는 쓰기 트랜잭션 밖에서 (쓰기 잠금은 마지막 일괄 기록 동안만)
+    pending_ids = {briefing_id for briefing_id, _, _ in pending}
+    batch_buckets: Dict[Tuple[int, int], List[int]] = {}
+    batch_rows: Dict[int, Tuple[np.ndarray, Optional[int]]] = {}
+    updates, lsh_rows = [], []
+    linked = 0
+
+    with db_read() as conn:
+        for briefing_id, title, content in pending:
+            signature = minhash_signature(f"{title}\n{content or ''}") if content else None
+            if signature is None:
+                updates.append((b"", None, briefing_id, title, content))
+                continue
+
+            buckets = lsh_buckets(signature)
+            conditions = " OR ".join("(band = ? AND bucket = ?)" for _ in buckets)
+            candidates = [
+                (candidate_id, np.frombuffer(candidate_minhash, dtype=np.uint32), candidate_canonical)
+                for candidate_id, candidate_minhash, candidate_canonical in conn.execute(f"""
+                    SELECT DISTINCT b.id, b.minhash, b.canonical_id
+                    FROM briefing_lsh l JOIN briefings b ON b.id = l.briefing_id
+                    WHERE ({conditions}) AND l.briefing_id < ? AND length(b.minhash) > 0
+                """, [value for bucket in buckets for value in bucket] + [briefing_id]).fetchall()
+                if candidate_id not in pending_ids
+            ]
+            # 같은 배치에서 먼저 처리한 브리핑도 후보
+            for candidate_id in {i for bucket in buckets for i in batch_buckets.get(bucket, ())}:
+                candidate_signature, candidate_canonical = batch_rows[candidate_id]
+                candidates.append((candidate_id, candidate_signature, candidate_canonical))
+
+            canonical_id, best = None, DUPLICATE_THRESHOLD
+            for candidate_id, candidate_signature, candidate_canonical in candidates:
+                similarity = estimate_similarity(signature, candidate_signature)
+                if similarity >= best:
+                    canonical_id, best = candidate_canonical or candidate_id, similarity
+
+            batch_rows[briefing_id] = (signature, canonical_id)
+            for bucket in buckets:
+                batch_buckets.setdefault(bucket, []).append(briefing_id)
+            updates.append((signature.tobytes(), canonical_id, briefing_id, title, content))
+            lsh_rows.extend((band, bucket, briefing_id) for band, bucket in buckets)
+            linked += canonical_id is not None
+
+    with db_write() as conn:
+        conn.executemany("DELETE FROM briefing_lsh WHERE briefing_id = ?", [(i,) for i in pending_ids])
+        # 계산하는 동안 내용이 바뀐 행은 건너뜀 (다음 호출 때 새 내용으로 다시 계산)
+        conn.executemany("""
+            UPDATE briefings SET minhash = ?, canonical_id = ?
+            WHERE id = ? AND minhash IS NULL AND title IS ? AND content IS ?
+        """, updates)
+        conn.executemany("INSERT OR IGNORE INTO briefing_lsh (band, bucket, briefing_id) VALUES (?, ?, ?)",
+                         lsh_rows)
+
+    return linked
+
+def load_linked_duplicate_content(pdf_url: str, digest: Optional[str] = None) -> Optional[str]:
+    """같은 PDF(URL 또는 내용 해시)를 가진 브리핑이 이미 중복으로 연결돼 있으면 그 브리핑의 본문 반환
+
+    수집 파이프라인이 이 본문을 그대로 쓰므로 알려진 중복 자료는 PDF 캐시 조회·다운로드·추출을 건너뛴다.
+    """
+    with db_read() as conn:
+        urls = [pdf_url]
+        if digest:
+            urls += [row[0] for row in conn.execute(
+                "SELECT url FROM pdf_url_alias WHERE digest = ? AND url != ?", (digest, pdf_url)
+            )]
+        placeholders = ",".join("?" * len(urls))
+        row = conn.execute(f"""
+            SELECT b.content FROM briefings b
+            WHERE b.pdf_url IN ({placeholders}) AND b.content IS NOT NULL
+              AND (b.canonical_id IS NOT NULL
+                   OR EXISTS (SELECT 1 FROM briefings d WHERE d.canonical_id = b.id))
+            LIMIT 1
+        """, urls).fetchone()
+
+    record_cache("중복 PDF", hit=row is not None)
+    return row[0] if row else None
+
+def _attach_duplicate_sources(conn: sqlite3.Connection, briefings: List[Dict]):
+    """대표 브리핑마다 연결된 중복 게시글의 출처 목록 추가"""
+    ids = [b['id'] for b in briefings]
+    for briefing in briefings:
+        briefing['duplicate_sources'] = []
+    if not ids:
+        return
+
+    by_id = {b['id']: b for b in briefings}
+    placeholders = ",".join("?" * len(ids))
+    cursor = conn.execute(f"""
+        SELECT canonical_id, source, url FROM briefings
+        WHERE canonical_id IN ({placeholders}) ORDER BY id
+    """, ids)
+    for canonical_id, source, url in cursor.fetchall():
+        by_id[canonical_id]['duplicate_sources'].append({"source": source, "url": url})
+
+# ============================================================
+# 관련 브리핑 색인 (문자 n-gram TF-IDF, 외부 임베딩 서비스 없이 로컬 계산)
+# ============================================================
+SIMILARITY_FEATURES = 1 << SIMILARITY_FEATURE_BITS
+
+def _ngram_features(text: str) -> np.ndarray:
+    """어절 안의 문자 n-gram을 특성 번호로 해싱 (중복 포함)"""
+    normalized = re.sub(r"[\W_]+", " ", text.lower()).strip()
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    space = codes == ord(" ")
+
+    features = []
+    for n in SIMILARITY_NGRAMS:
+        count = len(codes) - n + 1
+        if count <= 0:
+            continue
+        hashes = np.full(count, n, dtype=np.uint64)
+        inside_word = np.ones(count, dtype=bool)
+        for offset in range(n):
+            hashes = hashes * np.uint64(1000003) + codes[offset:offset + count]
+            inside_word &= ~space[offset:offset + count]
+        # 피보나치 해싱으로 상위 비트를 특성 번호로 사용
+        hashes = (hashes[inside_word] * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(64 - SIMILARITY_FEATURE_BITS)
+        features.append(hashes.astype(np.uint32))
+    return np.concatenate(features) if features else np.empty(0, dtype=np.uint32)
+
+def text_terms(*parts: Tuple[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """(텍스트, 가중치) 목록의 특성 번호와 로그 TF 가중치 (상위 SIMILARITY_MAX_TERMS개)"""
+    features = [_ngram_features(text[:SIMILARITY_MAX_CHARS]) for text, _ in parts]
+    weights = [np.full(len(f), weight, dtype=np.float32) for f, (_, weight) in zip(features, parts)]
+    features, weights = np.concatenate(features), np.concatenate(weights)
+    if features.size == 0:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.float32)
+
+    unique, inverse = np.unique(features, return_inverse=True)
+    tf = (1.0 + np.log(np.bincount(inverse, weights=weights))).astype(np.float32)
+    if unique.size > SIMILARITY_MAX_TERMS:
+        # 빈도가 같으면 특성 번호 순서로 골라 비슷한 문서끼리 같은 특성이 남도록 함
+        keep = np.sort(np.lexsort((unique, -tf))[:SIMILARITY_MAX_TERMS])
+        unique, tf = unique[keep], tf[keep]
+    return unique, tf
+
+def update_briefing_terms() -> int:
+    """특성이 없는(새로 저장되었거나 내용이 바뀐) 브리핑의 n-gram 특성 계산, 처리 건수 반환"""
+    with db_read() as conn:
+        pending = conn.execute("""
+            SELECT b.id, b.title, b.content FROM briefings b
+            LEFT JOIN briefing_terms t ON t.briefing_id = b.id
+            WHERE t.seq IS NULL ORDER BY b.id
+        """).fetchall()
+    if not pending:
+        return 0
+
+    rows = []
+    for briefing_id, title, content in pending:
+        features, weights = text_terms((title or "", SIMILARITY_TITLE_WEIGHT), (content or "", 1.0))
+        rows.append((briefing_id, features.tobytes(), weights.tobytes()))
+
+    with db_write() as conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO briefing_terms (briefing_id, features, weights) VALUES (?, ?, ?)
+        """, rows)
+    return len(rows)
+
+class SimilarityIndex:
+    """브리핑 TF-IDF 희소 행렬 (CSR 배열)
+
+    briefing_terms의 seq 이후 행만 읽어 문서를 덧붙이고, 다시 계산된 브리핑의
+    이전 행은 비활성으로 표시한다. IDF와 문서 정규화는 내용이 바뀐 뒤 첫 조회 때
+    한 번만 다시 계산하므로 조회는 비영 원소 수에 비례하는 벡터 연산 한 번이다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.last_seq = 0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.alive = np.empty(0, dtype=bool)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.uint32)
+        self.tf = np.empty(0, dtype=np.float32)
+        self.df = np.zeros(SIMILARITY_FEATURES, dtype=np.int32)
+        self.slots: Dict[int, int] = {}
+        self._idf: Optional[np.ndarray] = None
+        self._weighted: Optional[np.ndarray] = None
+
+    def sync(self):
+        """DB에 새로 계산된 특성을 색인에 반영"""
+        with self._lock:
+            with db_read() as conn:
+                # seq가 줄었으면 DB가 새로 만들어진 것이므로 처음부터 다시 색인
+                max_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM briefing_terms").fetchone()[0]
+                if max_seq < self.last_seq:
+                    self._reset()
+                rows = conn.execute("""
+                    SELECT seq, briefing_id, features, weights FROM briefing_terms
+                    WHERE seq > ? ORDER BY seq
+                """, (self.last_seq,)).fetchall()
+            if not rows:
+                return
+
+            self.last_seq = rows[-1][0]
+            latest = {briefing_id: (features, weights) for _, briefing_id, features, weights in rows}
+
+            new_ids, new_lengths, new_indices, new_tf = [], [], [], []
+            for briefing_id, (features, weights) in latest.items():
+                self._retire(briefing_id)
+                features = np.frombuffer(features or b"", dtype=np.uint32)
+                if features.size == 0:
+                    continue
+                self.slots[briefing_id] = len(self.ids) + len(new_ids)
+                new_ids.append(briefing_id)
+                new_lengths.append(features.size)
+                new_indices.append(features)
+                new_tf.append(np.frombuffer(weights, dtype=np.float32))
+
+            if new_ids:
+                indices = np.concatenate(new_indices)
+                np.add.at(self.df, indices, 1)
+                self.ids = np.concatenate([self.ids, np.array(new_ids, dtype=np.int64)])
+                self.alive = np.concatenate([self.alive, np.ones(len(new_ids), dtype=bool)])
+                self.indptr = np.concatenate([self.indptr, self.indptr[-1] + np.cumsum(new_lengths)])
+                self.indices = np.concatenate([self.indices, indices])
+                self.tf = np.concatenate([self.tf, np.concatenate(new_tf)])
+
+            # 비활성 문서가 많아지면 배열 압축
+            dead = len(self.alive) - int(self.alive.sum())
+            if dead > 1000 and dead * 4 > len(self.alive):
+                self._compact()
+            self._weighted = None
+
+    def _retire(self, briefing_id: int):
+        """이전에 색인된 문서를 비활성으로 표시하고 문서 빈도에서 제외"""
+        slot = self.slots.pop(briefing_id, None)
+        if slot is None:
+            return
+        self.alive[slot] = False
+        np.subtract.at(self.df, self.indices[self.indptr[slot]:self.indptr[slot + 1]], 1)
+
+    def _compact(self):
+        keep = np.flatnonzero(self.alive)
+        lengths = np.diff(self.indptr)[keep]
+        element_mask = np.repeat(self.alive, np.diff(self.indptr))
+        self.ids = self.ids[keep]
+        self.alive = np.ones(len(keep), dtype=bool)
+        self.indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self.indices = self.indices[element_mask]
+        self.tf = self.tf[element_mask]
+        self.slots = {int(briefing_id): slot for slot, briefing_id in enumerate(self.ids)}
+
+    def terms_of(self, briefing_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """색인된 브리핑의 특성과 TF 가중치"""
+        with self._lock:
+            slot = self.slots.get(briefing_id)
+            if slot is None:
+                return None
+            start, end = self.indptr[slot], self.indptr[slot + 1]
+            return self.indices[start:end].copy(), self.tf[start:end].copy()
+
+    def query(self, features: np.ndarray, weights: np.ndarray, k: int,
+              exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """코사인 유사도 상위 k개 [(briefing_id, 점수)]"""
+        with self._lock:
+            if not self.slots or features.size == 0:
+                return []
+
+            if self._weighted is None:
+                documents = len(self.slots)
+                self._idf = (np.log((1 + documents) / (1 + self.df)) + 1).astype(np.float32)
+                values = self.tf * self._idf[self.indices]
+                norms = np.sqrt(np.add.reduceat(values ** 2, self.indptr[:-1]))
+                self._weighted = values / np.repeat(norms, np.diff(self.indptr)).astype(np.float32)
+
+            # 색인에 없는 n-gram은 어떤 문서와도 겹치지 않으므로 정규화에서 제외
+            known = self.df[features] > 0
+            features = features[known]
+            query = weights[known] * self._idf[features]
+            query /= np.linalg.norm(query) or 1.0
+            dense = np.zeros(SIMILARITY_FEATURES, dtype=np.float32)
+            dense[features] = query
+
+            scores = np.add.reduceat(dense[self.indices] * self._weighted, self.indptr[:-1])
+            scores[~self.alive] = 0
+            if exclude in self.slots:
+                scores[self.slots[exclude]] = 0
+
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(int(self.ids[i]), float(scores[i])) for i in top if scores[i] >= SIMILARITY_MIN_SCORE]
+
+def get_similarity_index() -> SimilarityIndex:
+    """프로세스 공용 관련 브리핑 색인 (조회 전 DB 변경분 반영)"""
+    index = shared_resource("similarity_index", SimilarityIndex)
+    index.sync()
+    return index
+
+def _briefing_cards_by_score(scored: List[Tuple[int, float]], k: int,
+                             since: Optional[str] = None) -> List[Dict]:
+    """점수 순서를 유지한 카드 표시용 행 (중복으로 연결된 브리핑 제외, similarity 포함)"""
+    if not scored:
+        return []
+    scores = dict(scored)
+    placeholders = ",".join("?" * len(scores))
+    conditions, params = [f"id IN ({placeholders})", "canonical_id IS NULL"], list(scores)
+    if since is not None:
+        conditions.append("crawled_at >= ?")
+        params.append(since)
+
+    with db_read() as conn:
+        cursor = conn.execute(f"""
+            SELECT {', '.join(BRIEFING_CARD_COLUMNS)} FROM briefings
+            WHERE {' AND '.join(conditions)}
+        """, params)
+        columns = [desc[0] for desc in cursor.description]
+        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    for result in results:
+        result['similarity'] = scores[result['id']]
+    results.sort(key=lambda r: r['similarity'], reverse=True)
+    return results[:k]
+
+def related_briefings(briefing_id: int, k: int = SIMILARITY_TOP_K) -> List[Dict]:
+    """내용이 비슷한 다른 브리핑"""
+    index = get_similarity_index()
+    terms = index.terms_of(briefing_id)
+    if terms is None:
+        return []
+    # 중복 연결로 빠지는 후보를 감안해 여유 있게 조회
+    return _briefing_cards_by_score(index.query(*terms, k=k * 3, exclude=briefing_id), k)
+
+def recruitment_related_briefings(recruitment: Dict, k: int = SIMILARITY_TOP_K,
+                                  recent_days: int = SIMILARITY_RECENT_DAYS) -> List[Dict]:
+    """채용 공고의 직무·필요 역량과 관련된 최근 브리핑"""
+    features, weights = text_terms(
+        (recruitment.get('position') or "", SIMILARITY_TITLE_WEIGHT),
+        (recruitment.get('skills') or "", SIMILARITY_TITLE_WEIGHT),
+        (recruitment.get('requirements') or "", 1.0),
+    )
+    since = (datetime.now() - timedelta(days=recent_days)).strftime("%Y-%m-%d %H:%M:%S")
+    scored = get_similarity_index().query(features, weights, k=k * 10)
+    return _briefing_cards_by_score(scored, k, since=since)
 
-        # KHIDI 게시판 구조에 맞게 파싱 (일반적인 게시판 구조)
-        rows = soup.select('table tbody tr, .board-list li, .list-item')
+# ============================================================
+# 게시판 어댑터 (게시판별 선택자와 파싱 범위)
+# ============================================================
+
+class BoardAdapter:
+    """게시판 HTML 구조 (목록·상세·첨부 선택자와 트리로 만들 범위)
+
+    list_scope/detail_scope(SoupStrainer)를 지정하면 머리말·메뉴·바닥글은 건너뛰고
+    해당 요소만 트리로 만든다. host/menu_id가 URL과 맞는 어댑터가 자동 선택된다.
+    """
+
+    def __init__(self, name: str, row_selector: str, title_selector: str, date_selector: str,
+                 content_selector: str, attachment_selector: str,
+                 list_scope: Optional[SoupStrainer] = None, detail_scope: Optional[SoupStrainer] = None,
+                 host: Optional[str] = None, menu_id: Optional[str] = None):
+        self.name = name
+        self.row_selector = row_selector
+        self.title_selector = title_selector
+        self.date_selector = date_selector
+        self.content_selector = content_selector
+        self.attachment_selector = attachment_selector
+        self.list_scope = list_scope
+        self.detail_scope = detail_scope
+        self.host = host
+        self.menu_id = menu_id
+
+    def matches(self, url: str, match_menu: bool = True) -> bool:
+        """URL이 이 게시판(호스트·menuId) 것인지"""
+        if self.host is None:
+            return False
+        parsed = urlparse(url)
+        host = parsed.hostname or ""
+        if host != self.host and not host.endswith("." + self.host):
+            return False
+        return not match_menu or self.menu_id is None or (
+            parse_qs(parsed.query).get("menuId", [None])[0] == self.menu_id
+        )
 
-        for row in rows[:max_items]:
+    def parse_list(self, html: str, board_name: str, board_url: str,
+                   max_items: Optional[int] = None) -> List[Dict]:
+        """목록 페이지에서 게시글 제목·링크·날짜 추출"""
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=self.list_scope)
+
+        articles = []
+        for row in soup.select(self.row_selector)[:max_items]:
             try:
-                # 제목 추출
-                title_elem = row.select_one('a, .title, .subject')
+                title_elem = row.select_one(self.title_selector)
                 if not title_elem:
                     continue
 
                 title = title_elem.get_text(strip=True)
                 link = title_elem.get('href', '')
-
                 if link and not link.startswith('http'):
-                    link = f"https://www.khidi.or.kr{link}"
+                    link = urljoin(board_url, link)
 
-                # 날짜 추출
-                date_elem = row.select_one('.date, .regdate, td:last-child')
+                date_elem = row.select_one(self.date_selector)
                 date_str = date_elem.get_text(strip=True) if date_elem else ""
 
                 articles.append({
                     "title": title,
                     "url": link,
                     "date": date_str,
-                    "source": board_name
+                    "source": board_name,
+                    "post_id": extract_post_id(link) if link else None,
                 })
             except Exception as e:
+                record_failure("게시판 행 파싱", e)
                 continue
 
         return articles
 
-    except Exception as e:
-        st.warning(f"{board_name} 크롤링 실패: {e}")
-        return []
-
-def get_article_detail(url: str) -> Tuple[str, Optional[str]]:
-    """게시글 상세 내용 및 PDF URL 추출"""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
-
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+    def parse_detail(self, html: str, url: str) -> Tuple[str, Optional[str]]:
+        """상세 페이지에서 본문과 첨부 PDF URL 추출 (PDF로 보이는 첨부를 우선)"""
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=self.detail_scope)
 
-        # 본문 내용 추출
-        content_elem = soup.select_one('.board-view-content, .content, .view-content, article')
+        content_elem = soup.select_one(self.content_selector)
         content = content_elem.get_text(strip=True) if content_elem else ""
 
-        # PDF 링크 추출
         pdf_url = None
-        for link in soup.select('a[href*=".pdf"], a[href*="download"]'):
+        for link in soup.select(self.attachment_selector):
             href = link.get('href', '')
-            if '.pdf' in href.lower() or 'download' in href.lower():
-                if not href.startswith('http'):
-                    href = f"https://www.khidi.or.kr{href}"
-                pdf_url = href
-                break
+            if not href:
+                continue
+            if not href.startswith('http'):
+                href = urljoin(url, href)
+            if '.pdf' in (href + link.get_text()).lower():
+                return content, href
+            pdf_url = pdf_url or href
 
         return content, pdf_url
 
-    except Exception as e:
-        return "", None
-
-def download_and_extract_pdf(pdf_url: str) -> str:
-    """PDF 다운로드 및 텍스트 추출"""
-    if not pdf_url:
-        return ""
+# 등록되지 않은 게시판용 (페이지 전체를 파싱해 흔한 게시판 선택자를 차례로 시도)
+GENERIC_BOARD_ADAPTER = BoardAdapter(
+    "일반",
+    row_selector='table tbody tr, .board-list li, .list-item',
+    title_selector='a, .title, .subject',
+    date_selector='.date, .regdate, td:last-child',
+    content_selector='.board-view-content, .content, .view-content, article',
+    attachment_selector='a[href*=".pdf"], a[href*="download"]',
+)
+
+def _khidi_board_adapter(board_name: str, board_url: str) -> BoardAdapter:
+    """khidi.or.kr 게시판 어댑터 (목록은 tbody, 상세는 본문·첨부 영역만 파싱)"""
+    return BoardAdapter(
+        board_name,
+        row_selector='tr',
+        title_selector='td.subject a, td.title a, td.tit a, a[href*="linkId"]',
+        date_selector='td.date, td.regdate, td.day',
+        content_selector='.view_cont, .view-cont, .view-content, .board-view-content',
+        attachment_selector='.file_list a, .file a, .attach a, a[href*=".pdf"], a[href*="fileDown"]',
+        list_scope=SoupStrainer("tbody"),
+        detail_scope=SoupStrainer(class_=re.compile(
+            r"^(board_view|view_cont|view-cont|view-content|board-view-content|file_list|file|attach)$"
+        )),
+        host="khidi.or.kr",
+        menu_id=parse_qs(urlparse(board_url).query).get("menuId", [None])[0],
+    )
 
-    # 캐시 디렉토리 생성
-    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+# KHIDI_URLS 게시판별 어댑터 (다른 게시판 스킨을 쓰는 게시판은 여기서 선택자를 바꿈)
+BOARD_ADAPTERS: Dict[str, BoardAdapter] = {
+    name: _khidi_board_adapter(name, url) for name, url in KHIDI_URLS.items()
+}
 
-    # URL 해시로 캐시 파일명 생성
-    url_hash = hashlib.md5(pdf_url.encode()).hexdigest()
-    cache_path = os.path.join(PDF_CACHE_DIR, f"{url_hash}.txt")
+def get_board_adapter(url: str) -> BoardAdapter:
+    """URL에 맞는 게시판 어댑터 (menuId가 같은 게시판 → 같은 호스트 → 일반 선택자 순)"""
+    for match_menu in (True, False):
+        for adapter in BOARD_ADAPTERS.values():
+            if adapter.matches(url, match_menu):
+                return adapter
+    return GENERIC_BOARD_ADAPTER
+
+def parse_board_list(html: str, board_name: str, board_url: str,
+                     max_items: Optional[int] = None) -> List[Dict]:
+    """게시판 어댑터로 목록 파싱 (선택자가 맞지 않으면 일반 선택자로 다시 시도하고 기록)"""
+    adapter = get_board_adapter(board_url)
+    articles = adapter.parse_list(html, board_name, board_url, max_items)
+    if not articles and adapter is not GENERIC_BOARD_ADAPTER:
+        articles = GENERIC_BOARD_ADAPTER.parse_list(html, board_name, board_url, max_items)
+        if articles:
+            get_metrics_recorder().add("게시판 어댑터", time.time(), None, error=f"{adapter.name} 목록 선택자 불일치")
+    return articles
+
+def parse_article_detail(html: str, url: str) -> Tuple[str, Optional[str]]:
+    """게시판 어댑터로 상세 파싱 (본문·첨부를 못 찾으면 일반 선택자로 다시 시도하고 기록)"""
+    adapter = get_board_adapter(url)
+    content, pdf_url = adapter.parse_detail(html, url)
+    if not content and not pdf_url and adapter is not GENERIC_BOARD_ADAPTER:
+        content, pdf_url = GENERIC_BOARD_ADAPTER.parse_detail(html, url)
+        if content or pdf_url:
+            get_metrics_recorder().add("게시판 어댑터", time.time(), None, error=f"{adapter.name} 상세 선택자 불일치")
+    return content, pdf_url
 
-    # 캐시 확인
-    if os.path.exists(cache_path):
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            return f.read()
+# ============================================================
+# 크롤러 함수
+# ============================================================
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """호스트별 동시 연결 수 제한용 세마포어 조회"""
+    host = urlparse(url).netloc
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST)
+        return _host_semaphores[host]
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """keep-alive 연결을 재사용하는 공용 HTTP 세션"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            session.headers.update(HTTP_HEADERS)
+            adapter = HTTPAdapter(
+                pool_connections=len(KHIDI_URLS) + 1,
+                pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+                max_retries=Retry(total=HTTP_MAX_RETRIES, backoff_factor=0.5,
+                                  status_forcelist=[502, 503, 504]),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+def http_get(url: str, timeout: int = 10, headers: Optional[Dict] = None) -> requests.Response:
+    """호스트별 동시 연결 수를 제한한 GET 요청"""
+    with _host_semaphore(url):
+        return get_http_session().get(url, headers=headers, timeout=timeout)
+
+def fetch_url(url: str, timeout: int = 10, conditional: bool = True,
+              meta_sink: Optional[Dict[str, Tuple]] = None) -> Optional[requests.Response]:
+    """ETag/Last-Modified 기반 조건부 GET (변경이 없으면 None 반환)
+
+    meta_sink를 주면 새 응답의 메타데이터를 바로 저장하지 않고 넘겨받은 dict에 모아 두므로,
+    호출한 쪽이 응답 내용을 모두 처리한 뒤에 save_fetch_metas로 기록할 수 있다.
+    메타데이터는 조건부 요청에서만 다시 읽으므로 conditional=False이고 meta_sink도 없으면 기록하지 않는다.
+    """
+    meta = get_fetch_meta(url) if conditional else None
+
+    headers = {}
+    if meta and meta['etag']:
+        headers['If-None-Match'] = meta['etag']
+    if meta and meta['last_modified']:
+        headers['If-Modified-Since'] = meta['last_modified']
+
+    response = http_get(url, timeout=timeout, headers=headers)
+
+    if response.status_code == 304 and meta:
+        save_fetch_meta(url, meta['etag'], meta['last_modified'], meta['content_hash'], 304)
+        return None
+
+    response.raise_for_status()
+
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    meta_row = (
+        response.headers.get('ETag'),
+        response.headers.get('Last-Modified'),
+        content_hash,
+        response.status_code,
+    )
+    if meta_sink is not None:
+        meta_sink[url] = meta_row
+    elif conditional:
+        save_fetch_meta(url, *meta_row)
+
+    # 조건부 헤더를 무시하는 서버도 본문 해시가 같으면 변경 없음으로 처리
+    if meta and meta['content_hash'] == content_hash:
+        return None
+
+    return response
+
+def board_page_url(board_url: str, page: int) -> str:
+    """게시판 URL에 페이지 번호 파라미터 적용"""
+    if page <= 1:
+        return board_url
+    parsed = urlparse(board_url)
+    query = parse_qs(parsed.query)
+    query[BOARD_PAGE_PARAM] = [str(page)]
+    return parsed._replace(query=urlencode(query, doseq=True)).geturl()
+
+def extract_post_id(url: str) -> Optional[int]:
+    """게시글 URL에서 게시글 번호 추출"""
+    query = parse_qs(urlparse(url).query)
+    for param in POST_ID_PARAMS:
+        value = query.get(param, [""])[0]
+        if value.isdigit():
+            return int(value)
+    match = re.search(r'(\d+)(?:\D*)$', urlparse(url).path)
+    return int(match.group(1)) if match else None
+
+def fetch_board_articles(board_name: str, board_url: str, max_items: Optional[int] = 5,
+                         conditional: bool = False,
+                         meta_sink: Optional[Dict[str, Tuple]] = None) -> List[Dict]:
+    """게시판 목록 페이지 파싱 (실패 시 예외 발생, 변경 없으면 빈 목록)"""
+    with span("게시판 목록") as metric:
+        response = fetch_url(board_url, conditional=conditional, meta_sink=meta_sink)
+        if conditional:
+            metric["cache"] = "hit" if response is None else "miss"
+        if response is None:
+            return []
+
+        metric["bytes"] = len(response.content)
+        response.encoding = 'utf-8'
+        return parse_board_list(response.text, board_name, board_url, max_items)
+
+def crawl_board_incremental(board_name: str, board_url: str,
+                            max_pages: int = INCREMENTAL_MAX_PAGES,
+                            meta_sink: Optional[Dict[str, Tuple]] = None) -> List[Dict]:
+    """이미 저장된 게시글에 도달할 때까지 페이지를 넘기며 새 게시글만 수집
+
+    첫 페이지의 조건부 요청 메타데이터를 meta_sink에 모아 두면 호출한 쪽이 게시글을 모두
+    저장한 뒤 기록할 수 있다 (중단된 수집이 다음 실행에서 304로 건너뛰어지지 않도록).
+    """
+    high_water = get_board_state(board_name)['last_post_id']
+    new_articles = []
+
+    for page in range(1, max_pages + 1):
+        # 첫 페이지는 조건부 요청 (304면 새 게시글 없음)
+        articles = [
+            a for a in fetch_board_articles(board_name, board_page_url(board_url, page),
+                                            max_items=None, conditional=(page == 1),
+                                            meta_sink=meta_sink if page == 1 else None)
+            if a['url']
+        ]
+        if not articles:
+            break
+
+        known = get_known_urls(a['url'] for a in articles)
+        new_articles.extend(a for a in articles if a['url'] not in known)
+
+        # 페이지 마지막(가장 오래된) 게시글이 이미 알려진 글이면 이후 페이지는 모두 수집됨
+        oldest = articles[-1]
+        if oldest['url'] in known or (
+            high_water and oldest['post_id'] and oldest['post_id'] <= high_water
+        ):
+            break
+
+    return new_articles
+
+def crawl_board_backfill(board_name: str, board_url: str,
+                         max_pages: int = BACKFILL_MAX_PAGES) -> List[Dict]:
+    """게시판 과거 이력을 저장된 커서부터 최대 max_pages 페이지 수집"""
+    state = get_board_state(board_name)
+    if state['backfill_done']:
+        return []
 
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        response = requests.get(pdf_url, headers=headers, timeout=30)
+    new_articles = []
+
+    for page in range(state['backfill_page'], state['backfill_page'] + max_pages):
+        articles = [
+            dict(a, page=page)
+            for a in fetch_board_articles(board_name, board_page_url(board_url, page), max_items=None)
+            if a['url']
+        ]
+        if not articles:
+            set_backfill_cursor(board_name, page, done=True)
+            return new_articles
+
+        known = get_known_urls(a['url'] for a in articles)
+        new_articles.extend(a for a in articles if a['url'] not in known)
+        set_backfill_cursor(board_name, page + 1)
+
+    return new_articles
+
+def fetch_article_detail(url: str, conditional: bool = False) -> Optional[Tuple[str, Optional[str]]]:
+    """게시글 상세 페이지 파싱 (실패 시 예외 발생, 변경 없으면 None)"""
+    with span("게시글 상세") as metric:
+        response = fetch_url(url, conditional=conditional)
+        if conditional:
+            metric["cache"] = "hit" if response is None else "miss"
+        if response is None:
+            return None
+
+        metric["bytes"] = len(response.content)
+        response.encoding = 'utf-8'
+        return parse_article_detail(response.text, url)
+
+def download_pdf(pdf_url: str) -> Tuple[str, str]:
+    """PDF를 청크 단위로 임시 파일에 스트리밍 다운로드하고 (경로, SHA-256) 반환 (실패 시 예외 발생)
+
+    PDF_MAX_BYTES를 넘으면 다운로드를 중단한다. 이미 받은 PDF는 URL 별칭·내용 해시 캐시에서
+    텍스트를 찾아 다운로드 자체를 건너뛰므로 조건부 요청 헤더는 보내지 않는다.
+    """
+    with _host_semaphore(pdf_url), span("PDF 다운로드") as metric:
+        with get_http_session().get(pdf_url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+
+            declared_size = int(response.headers.get('Content-Length') or 0)
+            if declared_size > PDF_MAX_BYTES:
+                raise ValueError(f"PDF 크기 초과 ({declared_size:,} bytes)")
+
+            digest = hashlib.sha256()
+            size = 0
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+                try:
+                    for chunk in response.iter_content(chunk_size=PDF_DOWNLOAD_CHUNK):
+                        size += len(chunk)
+                        if size > PDF_MAX_BYTES:
+                            raise ValueError(f"PDF 크기 초과 ({PDF_MAX_BYTES:,} bytes 이상)")
+                        digest.update(chunk)
+                        tmp_file.write(chunk)
+                except Exception:
+                    tmp_file.close()
+                    os.unlink(tmp_file.name)
+                    raise
+            metric["bytes"] = size
+
+    return tmp_file.name, digest.hexdigest()
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """[start, end) 페이지 텍스트 추출 (프로세스 풀 작업 단위)"""
+    with pdfplumber.open(pdf_path, pages=list(range(start + 1, end + 1))) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+_pdf_process_pool: Optional[ProcessPoolExecutor] = None
+_pdf_process_pool_lock = threading.Lock()
+
+def _get_pdf_process_pool(reset: bool = False) -> ProcessPoolExecutor:
+    """PDF 추출용 공용 프로세스 풀 (pdfplumber는 CPU 바운드라 스레드로는 병렬화되지 않음)"""
+    global _pdf_process_pool
+    with _pdf_process_pool_lock:
+        if reset and _pdf_process_pool is not None:
+            _pdf_process_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_process_pool = None
+        if _pdf_process_pool is None:
+            _pdf_process_pool = ProcessPoolExecutor(
+                max_workers=PDF_EXTRACT_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_pdf_process_pool.shutdown, wait=False, cancel_futures=True)
+        return _pdf_process_pool
+
+def iter_pdf_pages(pdf_path: str) -> Iterator[str]:
+    """PDF 전체 페이지 텍스트를 페이지 순서대로 하나씩 반환
+
+    페이지 범위를 프로세스 풀에 나눠 병렬로 추출하되, 미리 제출하는 작업 수를
+    워커 수의 2배로 제한해 긴 보고서도 메모리 사용량이 일정하게 유지된다.
+    프로세스 풀을 쓸 수 없으면 현재 프로세스에서 순차 추출한다.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        total_pages = len(pdf.pages)
+
+    ranges = deque(
+        (start, min(start + PDF_PAGES_PER_TASK, total_pages))
+        for start in range(0, total_pages, PDF_PAGES_PER_TASK)
+    )
+    if len(ranges) <= 1 or PDF_EXTRACT_PROCESSES <= 1:
+        for start, end in ranges:
+            yield from _extract_page_range(pdf_path, start, end)
+        return
 
-        if response.status_code != 200:
-            return ""
+    pool = _get_pdf_process_pool()
+    pending = deque()
+    window = PDF_EXTRACT_PROCESSES * 2
 
-        # 임시 파일에 PDF 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            tmp_file.write(response.content)
-            tmp_path = tmp_file.name
+    while ranges or pending:
+        while ranges and len(pending) < window:
+            start, end = ranges.popleft()
+            try:
+                pending.append(((start, end), pool.submit(_extract_page_range, pdf_path, start, end)))
+            except (BrokenProcessPool, RuntimeError):
+                pending.append(((start, end), None))
 
-        # pdfplumber로 텍스트 추출
-        text_content = []
+        page_range, future = pending.popleft()
         try:
-            with pdfplumber.open(tmp_path) as pdf:
-                for page in pdf.pages[:20]:  # 최대 20페이지만 처리
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(page_text)
-        finally:
-            os.unlink(tmp_path)  # 임시 파일 삭제
-
-        full_text = "\n".join(text_content)
+            if future is None:
+                raise BrokenProcessPool("프로세스 풀 사용 불가")
+            pages = future.result()
+        except BrokenProcessPool:
+            # 워커가 죽으면 풀을 새로 만들고 해당 범위는 직접 추출
+            pool = _get_pdf_process_pool(reset=True)
+            pages = _extract_page_range(pdf_path, *page_range)
+        except Exception:
+            # 워커 쪽 오류는 현재 프로세스에서 한 번 더 시도 (손상된 PDF면 여기서 예외 발생)
+            pages = _extract_page_range(pdf_path, *page_range)
+        yield from pages
+
+def extract_pdf_text(pdf_path: str, pdf_url: Optional[str] = None,
+                     digest: Optional[str] = None) -> str:
+    """PDF 전체 페이지 텍스트를 추출해 캐시에 저장 (임시 파일은 삭제)"""
+    try:
+        with span("PDF 추출") as metric:
+            metric["bytes"] = os.path.getsize(pdf_path)
+            digest = digest or file_sha256(pdf_path)
+            text_content = [page_text for page_text in iter_pdf_pages(pdf_path) if page_text]
+    finally:
+        os.unlink(pdf_path)  # 임시 파일 삭제
 
-        # 캐시에 저장
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            f.write(full_text)
+    full_text = PDF_PAGE_SEPARATOR.join(text_content)
 
-        return full_text
+    # 캐시에 저장
+    store_pdf_text(digest, full_text)
+    if pdf_url:
+        set_pdf_url_alias(pdf_url, digest)
 
-    except Exception as e:
-        st.warning(f"PDF 처리 실패: {e}")
-        return ""
+    return full_text
 
 # ============================================================
-# AI 분석 함수 (Gemini API)
+# 크롤링 파이프라인
 # ============================================================
-def configure_gemini(api_key: str):
-    """Gemini API 설정"""
-    genai.configure(api_key=api_key)
-
-def generate_inbasket_analysis(content: str, title: str, api_key: str) -> str:
-    """인바스켓 형식의 AI 분석 생성"""
-    if not api_key:
-        return "⚠️ Gemini API 키가 설정되지 않았습니다."
-
-    if not content or len(content) < 100:
-        return "⚠️ 분석할 내용이 충분하지 않습니다."
-
-    try:
-        configure_gemini(api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
+_STAGE_END = object()
+
+class CrawlPipeline:
+    """목록 → 상세 → PDF 다운로드 → PDF 추출 단계를 큐로 연결한 크롤링 파이프라인
+
+    각 단계는 CRAWL_STAGE_WORKERS 크기의 워커 스레드로 동작하며, 단계 함수는
+    (다음 단계 이름, 항목) 쌍을 반환해 항목을 이후 단계 또는 결과 큐(None)로 보낸다.
+    전체 소요 시간은 단계 합이 아니라 가장 느린 단계에 수렴한다.
+    """
+
+    def __init__(self, stage_workers: Optional[Dict[str, int]] = None,
+                 mode: str = "incremental", max_pages: Optional[int] = None):
+        self.mode = mode
+        self.max_pages = max_pages or (BACKFILL_MAX_PAGES if mode == "backfill" else INCREMENTAL_MAX_PAGES)
+        self.stage_workers = dict(stage_workers or CRAWL_STAGE_WORKERS)
+        self.stage_funcs = {
+            "목록": self._list_stage,
+            "상세": self._detail_stage,
+            "PDF 다운로드": self._pdf_download_stage,
+            "PDF 추출": self._pdf_extract_stage,
+        }
+        self.stage_names = list(self.stage_funcs)
+        self.queues = {name: queue.Queue() for name in self.stage_names}
+        self.results: "queue.Queue" = queue.Queue()
+        self.stats = {name: {"queued": 0, "done": 0, "failed": 0} for name in self.stage_names}
+        self.errors: List[str] = []
+        self.failed_items: List[Tuple[str, object, str]] = []
+        self.list_meta: Dict[str, Tuple] = {}   # 첫 목록 페이지 메타데이터 (게시글 저장 후 기록)
+        self._lock = threading.Lock()
+        self._alive = {name: self.stage_workers[name] for name in self.stage_names}
+        self._cancelled = threading.Event()
+
+    # ---------- 단계 함수 ----------
+    def _list_stage(self, board: Tuple[str, str]) -> Iterable[Tuple[Optional[str], Dict]]:
+        # 이미 저장된 게시글은 목록 단계에서 걸러져 상세·PDF 요청이 발생하지 않음
+        board_name, board_url = board
+        if self.mode == "backfill":
+            articles = crawl_board_backfill(board_name, board_url, max_pages=self.max_pages)
+        else:
+            articles = crawl_board_incremental(board_name, board_url, max_pages=self.max_pages,
+                                               meta_sink=self.list_meta)
+            # 지난 수집에서 상세·PDF 단계가 실패한 게시글은 목록 위치와 무관하게 다시 받음
+            retries = get_crawl_retries(board_name)
+            saved = get_known_urls(a['url'] for a in retries)
+            clear_crawl_retries(saved)
+            seen = {a['url'] for a in articles} | saved
+            articles += [dict(a, retry=True) for a in retries if a['url'] not in seen]
+        for article in articles:
+            yield "상세", dict(article, board_url=board_url)
+
+    def _detail_stage(self, article: Dict) -> Iterable[Tuple[Optional[str], Dict]]:
+        content, pdf_url = fetch_article_detail(article['url'])
+        article = dict(article, content=content, pdf_url=pdf_url)
+        yield ("PDF 다운로드" if pdf_url else None), article
+
+    def _pdf_download_stage(self, article: Dict) -> Iterable[Tuple[Optional[str], Dict]]:
+        # 이미 다른 게시판 브리핑과 중복으로 연결된 PDF면 저장된 본문을 그대로 사용
+        cached = load_linked_duplicate_content(article['pdf_url'])
+        if cached is None:
+            cached = load_cached_pdf_text(article['pdf_url'])
+        if cached is not None:
+            yield None, dict(article, pdf_text=cached)
+            return
+
+        pdf_path, digest = download_pdf(article['pdf_url'])
+
+        # 다른 게시판·URL에서 이미 추출한 같은 파일이면 추출 생략
+        cached = load_linked_duplicate_content(article['pdf_url'], digest)
+        if cached is None:
+            cached = load_pdf_text_by_digest(digest)
+        if cached is not None:
+            os.unlink(pdf_path)
+            set_pdf_url_alias(article['pdf_url'], digest)
+            yield None, dict(article, pdf_text=cached)
+            return
+
+        yield "PDF 추출", dict(article, pdf_path=pdf_path, pdf_digest=digest)
+
+    def _pdf_extract_stage(self, article: Dict) -> Iterable[Tuple[Optional[str], Dict]]:
+        pdf_text = extract_pdf_text(article.pop('pdf_path'), article['pdf_url'], article.pop('pdf_digest'))
+        yield None, dict(article, pdf_text=pdf_text)
+
+    # ---------- 실행 ----------
+    def _put(self, stage: Optional[str], item) -> None:
+        if stage is None:
+            self.results.put(item)
+            return
+        with self._lock:
+            self.stats[stage]["queued"] += 1
+        self.queues[stage].put(item)
+
+    def _worker(self, stage: str) -> None:
+        func = self.stage_funcs[stage]
+        while True:
+            item = self.queues[stage].get()
+            if item is _STAGE_END:
+                break
+            if self._cancelled.is_set():
+                if isinstance(item, dict) and item.get('pdf_path'):
+                    os.unlink(item['pdf_path'])
+                continue
+            try:
+                for next_stage, next_item in func(item):
+                    self._put(next_stage, next_item)
+                outcome = "done"
+            except Exception as e:
+                outcome = "failed"
+                with self._lock:
+                    self.errors.append(f"[{stage}] {e}")
+                    self.failed_items.append((stage, item, str(e)))
+            with self._lock:
+                self.stats[stage][outcome] += 1
+
+        # 마지막 워커가 다음 단계(또는 결과 큐)에 종료 신호 전달
+        with self._lock:
+            self._alive[stage] -= 1
+            finished = self._alive[stage] == 0
+        if finished:
+            idx = self.stage_names.index(stage)
+            if idx + 1 < len(self.stage_names):
+                next_stage = self.stage_names[idx + 1]
+                for _ in range(self.stage_workers[next_stage]):
+                    self.queues[next_stage].put(_STAGE_END)
+            else:
+                self.results.put(_STAGE_END)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """단계별 진행 현황 복사본"""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self.stats.items()}
+
+    def run(self, boards: Iterable[Tuple[str, str]],
+            on_progress: Optional[Callable[[Dict[str, Dict[str, int]]], None]] = None) -> Iterator[Dict]:
+        """파이프라인 실행, 완료된 게시글을 순서와 무관하게 즉시 반환"""
+        threads = [
+            threading.Thread(target=self._worker, args=(stage,), daemon=True)
+            for stage in self.stage_names
+            for _ in range(self.stage_workers[stage])
+        ]
+        for thread in threads:
+            thread.start()
+
+        for board in boards:
+            self._put("목록", board)
+        for _ in range(self.stage_workers["목록"]):
+            self.queues["목록"].put(_STAGE_END)
 
-        # 콘텐츠가 너무 길면 앞부분만 사용
-        if len(content) > 15000:
-            content = content[:15000] + "\n...(이하 생략)"
+        try:
+            while True:
+                try:
+                    item = self.results.get(timeout=0.2)
+                except queue.Empty:
+                    if on_progress:
+                        on_progress(self.snapshot())
+                    continue
+                if item is _STAGE_END:
+                    break
+                if on_progress:
+                    on_progress(self.snapshot())
+                yield item
+        finally:
+            # 소비가 중단되면 남은 작업은 건너뛰고 워커를 정리
+            self._cancelled.set()
+            if on_progress:
+                on_progress(self.snapshot())
+
+def format_pipeline_progress(stats: Dict[str, Dict[str, int]]) -> str:
+    """단계별 진행 현황을 표시용 문자열로 변환"""
+    parts = []
+    for stage, counts in stats.items():
+        part = f"{stage} {counts['done']}/{counts['queued']}"
+        if counts['failed']:
+            part += f" (실패 {counts['failed']})"
+        parts.append(part)
+    return " · ".join(parts)
+
+def collect_briefings(boards: Iterable[Tuple[str, str]], mode: str = "incremental",
+                      max_pages: Optional[int] = None,
+                      on_progress: Optional[Callable[[Dict[str, Dict[str, int]]], None]] = None
+                      ) -> Tuple[Dict[str, int], List[str]]:
+    """파이프라인으로 게시판을 수집해 분류·일괄 저장하고 (저장 건수, 오류 목록) 반환"""
+    pipeline = CrawlPipeline(mode=mode, max_pages=max_pages)
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    batch: List[Dict] = []
+    retried: List[str] = []
+    saved_posts: Dict[str, List[Tuple[Optional[int], str]]] = {}
+
+    def flush():
+        for key, value in save_briefings(batch).items():
+            counts[key] += value
+        clear_crawl_retries(retried)
+        retried.clear()
+        # 다른 게시판에 이미 있는 자료는 대표 브리핑에 연결하고, 나머지만 분석 대기열로
+        link_near_duplicates()
+        update_briefing_terms()
+        enqueue_analysis_jobs((b['url'] for b in batch),
+                              ANALYSIS_PRIORITY_BACKFILL if mode == "backfill" else ANALYSIS_PRIORITY_NEW)
+        batch.clear()
+
+    for article in pipeline.run(boards, on_progress=on_progress):
+        content = article.get('pdf_text') or article.get('content', '')
+
+        batch.append({
+            "title": article['title'],
+            "source": article['source'],
+            **categorize_briefing(article['title'], content),
+            "url": article['url'],
+            "pdf_url": article.get('pdf_url'),
+            "content": content or None,
+        })
+        if article.get('retry'):
+            retried.append(article['url'])
+        if len(batch) >= SAVE_BATCH_SIZE:
+            flush()
+
+        saved_posts.setdefault(article['source'], []).append((article.get('post_id'), article.get('date') or ""))
+
+    if batch:
+        flush()
+
+    # 일부 게시글이 실패한 게시판은 다음 수집 때 다시 시도
+    failed = [item for _, item, _ in pipeline.failed_items]
+    failed_boards = {item['board_url'] if isinstance(item, dict) else item[1] for item in failed}
+    if failed_boards:
+        invalidate_fetch_meta(failed_boards)
+    failed_articles = [(item, error) for _, item, error in pipeline.failed_items if isinstance(item, dict)]
+    if mode != "backfill":
+        save_crawl_retries(failed_articles)
+
+    # high-water mark는 실패한 게시글보다 앞선(더 오래된) 저장 게시글까지만 올림
+    lowest_failed: Dict[str, int] = {}
+    for item, _ in failed_articles:
+        if item.get('post_id'):
+            lowest_failed[item['source']] = min(lowest_failed.get(item['source'], item['post_id']), item['post_id'])
+    for board_name, posts in saved_posts.items():
+        limit = lowest_failed.get(board_name)
+        if limit is not None:
+            posts = [(post_id, date) for post_id, date in posts if post_id and post_id < limit]
+        post_id = max(filter(None, (post_id for post_id, _ in posts)), default=None)
+        post_date = max((date for _, date in posts), default="")
+        if post_id or post_date:
+            update_board_high_water(board_name, post_id, post_date or None)
+    # 게시글을 모두 저장한 게시판만 첫 페이지 메타데이터 기록 (중단되면 다음 수집이 다시 확인)
+    save_fetch_metas({url: meta for url, meta in pipeline.list_meta.items() if url not in failed_boards})
+    if mode == "backfill":
+        for item in failed:
+            if isinstance(item, dict) and 'page' in item:
+                set_backfill_cursor(item['source'], item['page'], rewind=True)
+
+    return counts, pipeline.errors
 
-        prompt = f"""
+# ============================================================
+# AI 분석 함수 (Gemini API)
+# ============================================================
+INBASKET_PROMPT_TEMPLATE = """
 당신은 한국보건산업진흥원(KHIDI) R&D 사업지원부문 3년 차 주임입니다.
 아래 보건산업 관련 자료를 읽고, 입사 시험인 '인바스켓(In-Basket)' 답안 형식으로 분석 보고서를 작성하세요.
 
@@ -369,22 +2599,237 @@ def generate_inbasket_analysis(content: str, title: str, api_key: str) -> str:
 답변은 한국어로 작성하고, 실제 KHIDI 직원이 작성한 것처럼 전문적이고 구체적으로 작성하세요.
 """
 
-        response = model.generate_content(prompt)
-        return response.text
+INBASKET_MAP_PROMPT_TEMPLATE = """
+당신은 한국보건산업진흥원(KHIDI) R&D 사업지원부문 3년 차 주임입니다.
+아래는 긴 보건산업 자료 '{title}'의 일부({index}/{total})입니다.
+이후 인바스켓 분석 보고서 작성에 쓸 수 있도록 이 부분의 핵심 내용만 추출하세요.
 
-    except Exception as e:
-        return f"⚠️ AI 분석 생성 실패: {e}"
+[자료 일부]:
+{content}
 
-def predict_future_jobs(api_key: str) -> str:
-    """2026년 채용 유망 직무 예측"""
-    if not api_key:
-        return "⚠️ Gemini API 키가 설정되지 않았습니다."
+---
+
+다음 항목별로 불릿 포인트로 간결하게 정리하세요. 해당 내용이 없는 항목은 "없음"으로 적으세요.
+- 현황 및 배경: 산업 수치, 정책 기조, 시장 동향
+- 문제점: 규제 장벽, 인력 부족, 기술 격차 등 갈등 요소
+- 대응 방안: 자료에 제시된 정책·사업 방향
+- 성과 지표: 수치로 제시된 목표나 기대 효과
 
+한국어로 작성하고, 자료에 있는 수치와 고유명사는 그대로 유지하세요.
+"""
+
+# 프롬프트가 바뀌면 버전이 바뀌어 이전 분석 캐시가 자동으로 무효화됨
+INBASKET_PROMPT_VERSION = hashlib.sha256(
+    (INBASKET_PROMPT_TEMPLATE + INBASKET_MAP_PROMPT_TEMPLATE).encode()
+).hexdigest()[:12]
+INBASKET_MAP_PROMPT_VERSION = "map-" + hashlib.sha256(
+    INBASKET_MAP_PROMPT_TEMPLATE.encode()
+).hexdigest()[:12]
+
+SECTION_HEADING_PATTERN = re.compile(
+    r'\n(?=\s*(?:[IVXⅠ-Ⅹ]+\.|\d+(?:\.\d+)*\.\s|제\s*\d+\s*[장절]|[□■◆▶]))'
+)
+
+def configure_gemini(api_key: str):
+    """Gemini API 설정"""
+    genai.configure(api_key=api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_model(api_key: str, model_name: str = GEMINI_MODEL):
+    """API 키·모델별 Gemini 클라이언트 (재실행마다 새로 만들지 않도록 리소스 캐시)"""
+    configure_gemini(api_key)
+    return genai.GenerativeModel(model_name)
+
+class RateLimiter:
+    """분당 호출 수 제한 (최근 60초 호출 시각 기준, 화면 요청 우선)
+
+    백그라운드 호출은 GEMINI_INTERACTIVE_RESERVE만큼 여유를 남기고, 화면 요청이
+    기다리는 동안에는 양보한다. 할당량 초과 응답을 받으면 pause()로 백그라운드
+    호출을 잠시 멈춘다.
+    """
+
+    def __init__(self, per_minute: int, interactive_reserve: int = 0):
+        self.per_minute = max(1, per_minute)
+        self.interactive_reserve = min(interactive_reserve, self.per_minute - 1)
+        self._calls = deque()
+        self._interactive_waiting = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, interactive: bool = False):
+        """호출 슬롯이 날 때까지 대기"""
+        with self._cond:
+            if interactive:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    while self._calls and now - self._calls[0] >= 60:
+                        self._calls.popleft()
+
+                    if interactive:
+                        ready = len(self._calls) < self.per_minute
+                    else:
+                        ready = (not self._interactive_waiting and now >= self._paused_until
+                                 and len(self._calls) < self.per_minute - self.interactive_reserve)
+                    if ready:
+                        self._calls.append(now)
+                        return
+
+                    wait = 60 - (now - self._calls[0]) if self._calls else 1.0
+                    if not interactive and now < self._paused_until:
+                        wait = self._paused_until - now
+                    self._cond.wait(timeout=max(wait, 0.05))
+            finally:
+                if interactive:
+                    self._interactive_waiting -= 1
+                    self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """백그라운드 호출 일시 중지 (할당량 초과 시)"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+def get_gemini_rate_limiter() -> RateLimiter:
+    """프로세스 공용 Gemini 호출 한도"""
+    return shared_resource(
+        "gemini_rate_limiter",
+        lambda: RateLimiter(GEMINI_REQUESTS_PER_MINUTE, GEMINI_INTERACTIVE_RESERVE),
+    )
+
+def is_quota_error(error: Exception) -> bool:
+    """Gemini 할당량 초과(429) 오류 여부"""
+    return (isinstance(error, google_exceptions.ResourceExhausted)
+            or getattr(error, "code", None) == 429 or "429" in str(error))
+
+def gemini_generate(model, prompt: str, interactive: bool = True, **kwargs):
+    """호출 한도를 지키며 Gemini 생성 요청"""
+    get_gemini_rate_limiter().acquire(interactive=interactive)
     try:
-        configure_gemini(api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        with span("Gemini 호출"):
+            return model.generate_content(prompt, **kwargs)
+    except Exception as e:
+        if is_quota_error(e):
+            get_gemini_rate_limiter().pause(ANALYSIS_JOB_BACKOFF_BASE)
+        raise
+
+def estimate_tokens(text: str) -> int:
+    """입력 토큰 수 근사치 (한글은 글자당 1토큰, 그 외는 4글자당 1토큰)"""
+    hangul = len(re.findall(r'[가-힣]', text))
+    return hangul + (len(text) - hangul) // 4 + 1
+
+def _split_block(block: str, max_tokens: int) -> List[str]:
+    """예산을 넘는 블록을 줄 단위로 분할"""
+    if estimate_tokens(block) <= max_tokens:
+        return [block]
+
+    pieces, current = [], ""
+    for line in block.split("\n"):
+        while estimate_tokens(line) > max_tokens:
+            cut = max(1, len(line) * max_tokens // estimate_tokens(line))
+            pieces.append(line[:cut])
+            line = line[cut:]
+        if current and estimate_tokens(current + "\n" + line) > max_tokens:
+            pieces.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        pieces.append(current)
+    return pieces
+
+def split_into_chunks(text: str, max_tokens: int = ANALYSIS_CHUNK_TOKENS) -> List[str]:
+    """페이지·섹션 경계를 기준으로 토큰 예산 이하의 청크로 분할
+
+    블록 해시로 청크 경계를 정하는 방식(content-defined chunking)을 함께 써서,
+    문서 일부만 바뀌어도 나머지 청크의 경계와 내용이 그대로 유지되도록 한다.
+    """
+    blocks = []
+    for page in text.split("\f"):
+        for section in SECTION_HEADING_PATTERN.split(page):
+            if section.strip():
+                blocks.extend(_split_block(section.strip(), max_tokens))
+
+    chunks, current, current_tokens = [], [], 0
+    for block in blocks:
+        block_tokens = estimate_tokens(block)
+        if current and current_tokens + block_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(block)
+        current_tokens += block_tokens
+
+        # 예산 절반 이상 찼고 블록 해시가 경계 조건을 만족하면 청크 종료
+        block_hash = int(hashlib.md5(block.encode()).hexdigest()[:8], 16)
+        if current_tokens >= max_tokens // 2 and block_hash % 4 == 0:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def _extract_chunk_notes(model, title: str, chunk: str, index: int, total: int,
+                         interactive: bool = True) -> str:
+    """청크 하나의 핵심 내용 추출 (청크 내용 기준으로 캐시)"""
+    cache_key, content_hash = analysis_cache_key(title, chunk, prompt_version=INBASKET_MAP_PROMPT_VERSION)
+    cached = get_cached_analysis(cache_key)
+    if cached is not None:
+        return cached
+
+    prompt = INBASKET_MAP_PROMPT_TEMPLATE.format(title=title, index=index, total=total, content=chunk)
+    notes = gemini_generate(model, prompt, interactive=interactive).text
+    save_cached_analysis(cache_key, content_hash, notes, prompt_version=INBASKET_MAP_PROMPT_VERSION)
+    return notes
+
+def condense_long_content(model, title: str, content: str,
+                          max_tokens: int = ANALYSIS_CHUNK_TOKENS, interactive: bool = True) -> str:
+    """토큰 예산을 넘는 문서를 청크별 병렬 추출(map)로 압축해 종합(reduce) 입력으로 변환"""
+    for _ in range(ANALYSIS_MAX_REDUCE_DEPTH):
+        if estimate_tokens(content) <= max_tokens:
+            break
+
+        chunks = split_into_chunks(content, max_tokens)
+        with ThreadPoolExecutor(max_workers=ANALYSIS_MAP_CONCURRENCY) as executor:
+            notes = list(executor.map(
+                lambda item: _extract_chunk_notes(model, title, item[1], item[0], len(chunks), interactive),
+                enumerate(chunks, start=1),
+            ))
+        content = "\n\n".join(
+            f"[자료 {index}/{len(notes)} 부분 요약]\n{note}" for index, note in enumerate(notes, start=1)
+        )
+
+    return content
+
+def build_inbasket_prompt(model, title: str, content: str, interactive: bool = True) -> str:
+    """인바스켓 분석 프롬프트 생성 (토큰 예산 초과 시 청크별 핵심 내용으로 압축)"""
+    condensed = condense_long_content(model, title, content, interactive=interactive)
+    return INBASKET_PROMPT_TEMPLATE.format(title=title, content=condensed)
+
+def run_inbasket_analysis(content: str, title: str, api_key: str,
+                          briefing_url: Optional[str] = None, interactive: bool = True) -> str:
+    """인바스켓 분석 생성 후 저장 (캐시 우선, API 오류는 예외로 전달)"""
+    # 콘텐츠·모델·프롬프트 버전이 같으면 저장된 분석 재사용
+    cache_key, content_hash = analysis_cache_key(title, content)
+    cached = get_cached_analysis(cache_key)
+    if cached is not None:
+        if briefing_url:
+            save_briefing_analysis(briefing_url, cached)
+        return cached
+
+    model = get_gemini_model(api_key)
 
-        prompt = """
+    prompt = build_inbasket_prompt(model, title, content, interactive=interactive)
+
+    response = gemini_generate(model, prompt, interactive=interactive)
+    analysis = response.text
+
+    save_cached_analysis(cache_key, content_hash, analysis)
+    if briefing_url:
+        save_briefing_analysis(briefing_url, analysis)
+    return analysis
+
+FUTURE_JOBS_PROMPT = """
 당신은 한국보건산업진흥원(KHIDI) 인사담당 전문가입니다.
 2025년 보건산업 백서, 디지털헬스케어 정책 동향, 바이오헬스 산업 전략을 기반으로
 2026년 KHIDI에서 신규 채용이 예상되는 유망 직무를 예측해주세요.
@@ -414,168 +2859,1232 @@ def predict_future_jobs(api_key: str) -> str:
 한국어로 작성하고, 실제 보건산업 트렌드를 반영하여 현실적으로 작성하세요.
 """
 
-        response = model.generate_content(prompt)
-        return response.text
+FUTURE_JOBS_PROMPT_VERSION = "jobs-" + hashlib.sha256(FUTURE_JOBS_PROMPT.encode()).hexdigest()[:12]
+
+def _future_jobs_cache_key() -> Tuple[str, str]:
+    """유망 직무 예측 저장 키 (프롬프트가 같으면 마지막 예측을 덮어씀)"""
+    return analysis_cache_key("2026 유망 직무 예측", FUTURE_JOBS_PROMPT,
+                              prompt_version=FUTURE_JOBS_PROMPT_VERSION)
+
+def save_future_jobs_prediction(prediction: str):
+    """유망 직무 예측 결과 저장"""
+    cache_key, content_hash = _future_jobs_cache_key()
+    save_cached_analysis(cache_key, content_hash, prediction, prompt_version=FUTURE_JOBS_PROMPT_VERSION)
+
+def get_saved_future_jobs_prediction() -> Optional[str]:
+    """마지막으로 저장된 유망 직무 예측 조회"""
+    cache_key, _ = _future_jobs_cache_key()
+    return get_cached_analysis(cache_key, count_hit=False)
+
+CATEGORY_RULES_VERSION = hashlib.sha256(json.dumps(
+    [CATEGORY_KEYWORDS, CATEGORY_TITLE_WEIGHT, CATEGORY_MIN_SCORE, CATEGORY_MIN_CONFIDENCE],
+    ensure_ascii=False, sort_keys=True,
+).encode()).hexdigest()[:12]
+
+def _compile_category_matcher() -> Tuple["re.Pattern", Dict[str, List[Tuple[str, float]]]]:
+    """전체 키워드를 하나의 정규식으로 컴파일 (긴 키워드 우선, 영문 키워드는 단어 경계 적용)"""
+    keyword_categories: Dict[str, List[Tuple[str, float]]] = {}
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        for keyword, weight in keywords.items():
+            keyword_categories.setdefault(keyword.lower(), []).append((category, weight))
+
+    alternatives = []
+    for keyword in sorted(keyword_categories, key=len, reverse=True):
+        if keyword.isascii():
+            alternatives.append(rf"(?<![a-z0-9]){re.escape(keyword)}(?![a-z0-9])")
+        else:
+            alternatives.append(re.escape(keyword))
+    return re.compile("|".join(alternatives), re.IGNORECASE), keyword_categories
+
+CATEGORY_PATTERN, CATEGORY_KEYWORD_MAP = _compile_category_matcher()
+
+def score_categories(title: str, content: str) -> Dict[str, float]:
+    """카테고리별 가중 점수 (본문 반복 출현은 로그로 완화)"""
+    title_hits: Dict[str, int] = {}
+    content_hits: Dict[str, int] = {}
+    for hits, text in ((title_hits, title or ""), (content_hits, content or "")):
+        for match in CATEGORY_PATTERN.finditer(text):
+            keyword = match.group(0).lower()
+            hits[keyword] = hits.get(keyword, 0) + 1
+
+    scores: Dict[str, float] = {}
+    for keyword in title_hits.keys() | content_hits.keys():
+        strength = CATEGORY_TITLE_WEIGHT * title_hits.get(keyword, 0)
+        if content_hits.get(keyword):
+            strength += 1 + math.log(content_hits[keyword])
+        for category, weight in CATEGORY_KEYWORD_MAP[keyword]:
+            scores[category] = scores.get(category, 0.0) + weight * strength
+    return scores
+
+def classify_content(title: str, content: str) -> List[Tuple[str, float]]:
+    """다중 카테고리 분류 결과 [(카테고리, 비중)] (비중 높은 순, 미분류면 빈 목록)"""
+    scores = score_categories(title, content)
+    total = sum(scores.values())
+    if total < CATEGORY_MIN_SCORE:
+        return []
+
+    labels = sorted(((c, round(v / total, 3)) for c, v in scores.items()), key=lambda item: -item[1])
+    return [labels[0]] + [item for item in labels[1:] if item[1] >= CATEGORY_MIN_CONFIDENCE]
+
+def category_fields(labels: List[Tuple[str, float]]) -> Dict[str, Optional[str]]:
+    """분류 결과를 briefings 저장용 컬럼으로 변환 (대표 카테고리, 카테고리별 비중 JSON, 규칙 버전)"""
+    return {
+        "category": labels[0][0] if labels else UNCATEGORIZED,
+        "category_scores": json.dumps(dict(labels), ensure_ascii=False) if labels else None,
+        "category_version": CATEGORY_RULES_VERSION,
+    }
+
+def categorize_briefing(title: str, content: str) -> Dict[str, Optional[str]]:
+    """briefings 저장용 분류 컬럼 (대표 카테고리, 카테고리별 비중 JSON, 규칙 버전)"""
+    with span("분류"):
+        labels = classify_content(title, content)
+    return category_fields(labels)
+
+def reclassify_briefings(force: bool = False, batch_size: int = SAVE_BATCH_SIZE) -> int:
+    """분류 규칙 버전이 다른 브리핑을 일괄 재분류하고 변경 건수 반환
+
+    수집 작업 시작 시와 python app.py reclassify에서 실행한다. 건마다 계측하면 분류 단계 통계가
+    왜곡되므로 classify_content를 직접 호출하고, 카테고리가 그대로인 행은 규칙 버전만 갱신한다.
+    """
+    with db_read() as conn:
+        if force:
+            cursor = conn.execute("SELECT id FROM briefings")
+        else:
+            cursor = conn.execute(
+                "SELECT id FROM briefings WHERE category_version IS NOT ?", (CATEGORY_RULES_VERSION,)
+            )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    changed = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        placeholders = ",".join("?" * len(chunk))
+        with db_read() as conn:
+            rows = conn.execute(
+                f"SELECT id, title, content, category, category_scores FROM briefings WHERE id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+
+        updates = []
+        batch_changed = 0
+        for briefing_id, title, content, category, category_scores in rows:
+            fields = category_fields(classify_content(title, content))
+            if (fields["category"], fields["category_scores"]) != (category, category_scores):
+                batch_changed += 1
+            updates.append((fields["category"], fields["category_scores"], fields["category_version"], briefing_id))
+
+        with db_write(bump_version=batch_changed > 0) as conn:
+            conn.executemany("""
+                UPDATE briefings SET category = ?, category_scores = ?, category_version = ?
+                WHERE id = ?
+            """, updates)
+        changed += batch_changed
+
+    return changed
+
+# ============================================================
+# AI 스트리밍 응답
+# ============================================================
+
+def _iter_response_text(response) -> Iterator[str]:
+    """스트리밍 응답에서 텍스트 조각만 추출 (안전 필터로 비어 있는 조각은 건너뜀)"""
+    with span("Gemini 스트림") as metric:
+        metric["bytes"] = 0
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            if text:
+                metric["bytes"] += len(text.encode('utf-8'))
+                yield text
+
+class BackgroundStream:
+    """백그라운드 스레드에서 Gemini 스트림을 끝까지 받아 완료 시 저장하는 스트림
+
+    화면 쪽 소비자가 중간에 사라져도(다른 탭 이동, 재실행) 스레드는 응답을 끝까지
+    받아 on_complete로 저장하므로, 비용을 들인 응답이 버려지지 않는다.
+    같은 스트림에 재연결한 호출도 subscribe로 결과·실패 후처리를 등록할 수 있다.
+    """
+
+    def __init__(self, key: str, produce: Callable[[], Iterable[str]],
+                 on_complete: Callable[[str], None],
+                 on_result: Optional[Callable[[str], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.key = key
+        self.parts: List[str] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+        self._produce = produce
+        self._on_complete = on_complete
+        self._listeners: Optional[List[Tuple[Callable[[str], None], Optional[Callable[[Exception], None]]]]] = []
+        if on_result is not None:
+            self._listeners.append((on_result, on_error))
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f"gemini-stream-{key[:8]}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            for text in self._produce():
+                with self._cond:
+                    self.parts.append(text)
+                    self._cond.notify_all()
+            self._on_complete("".join(self.parts))
+        except Exception as e:
+            self.error = e
+        finally:
+            with self._cond:
+                listeners, self._listeners = self._listeners, None
+            for on_result, on_error in listeners:
+                try:
+                    if self.error is None:
+                        on_result("".join(self.parts))
+                    elif on_error is not None:
+                        on_error(self.error)
+                except Exception as e:
+                    record_failure("스트림 후처리", e)
+
+            streams, lock = _stream_registry()
+            with lock:
+                if streams.get(self.key) is self:
+                    del streams[self.key]
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def subscribe(self, on_result: Callable[[str], None],
+                  on_error: Optional[Callable[[Exception], None]] = None) -> bool:
+        """완료·실패 시 실행할 후처리 등록 (이미 후처리가 시작된 스트림이면 False)"""
+        with self._cond:
+            if self._listeners is None:
+                return False
+            self._listeners.append((on_result, on_error))
+            return True
+
+    def iter_text(self) -> Iterator[str]:
+        """지금까지 받은 조각부터 완료 시까지 텍스트를 순서대로 반환"""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.parts) and not self.done:
+                    self._cond.wait()
+                new_parts = self.parts[index:]
+                index = len(self.parts)
+                finished = self.done
+            yield from new_parts
+            if finished:
+                if self.error is not None:
+                    yield f"\n\n⚠️ AI 응답 생성 실패: {self.error}"
+                return
+
+def _stream_registry() -> Tuple[Dict[str, BackgroundStream], threading.Lock]:
+    """진행 중인 스트림 목록 (재실행·세션 간 공유)"""
+    return shared_resource("active_streams", lambda: ({}, threading.Lock()))
+
+def start_background_stream(key: str, produce: Callable[[], Iterable[str]],
+                            on_complete: Callable[[str], None],
+                            on_result: Optional[Callable[[str], None]] = None,
+                            on_error: Optional[Callable[[Exception], None]] = None) -> BackgroundStream:
+    """같은 키의 스트림이 진행 중이면 재연결, 없으면 새로 시작
+
+    on_complete는 스트림을 새로 만든 호출의 것만 한 번 실행하고, on_result/on_error는
+    재연결한 호출을 포함해 호출마다 등록한다.
+    """
+    streams, lock = _stream_registry()
+    with lock:
+        stream = streams.get(key)
+        if stream is None or (on_result is not None and not stream.subscribe(on_result, on_error)):
+            stream = BackgroundStream(key, produce, on_complete, on_result, on_error)
+            streams[key] = stream
+    return stream
+
+def get_active_stream(key: str) -> Optional[BackgroundStream]:
+    """진행 중인 스트림 조회"""
+    streams, lock = _stream_registry()
+    with lock:
+        return streams.get(key)
+
+def stream_inbasket_analysis(content: str, title: str, api_key: str,
+                             briefing_url: Optional[str] = None) -> Tuple[Optional[str], Iterator[str]]:
+    """인바스켓 분석을 스트리밍으로 생성 (스트림 키, 텍스트 조각 반복자)
+
+    캐시 적중이나 입력 오류면 스트림 키 없이 완성된 텍스트 하나만 반환한다.
+    """
+    if not content or len(content) < 100:
+        return None, iter(["⚠️ 분석할 내용이 충분하지 않습니다."])
+
+    cache_key, content_hash = analysis_cache_key(title, content)
+    cached = get_cached_analysis(cache_key)
+    if cached is not None:
+        if briefing_url:
+            save_briefing_analysis(briefing_url, cached)
+        return None, iter([cached])
+
+    if not api_key:
+        return None, iter(["⚠️ Gemini API 키가 설정되지 않았습니다."])
+
+    # 대기 중인 백그라운드 작업은 이 호출이 가져가고, 실패하면 다시 대기열로 돌려놓음.
+    # 같은 본문의 스트림이 이미 진행 중이면 그 결과로 이 브리핑도 저장·완료 처리한다.
+    job_id = claim_briefing_analysis_job(briefing_url) if briefing_url else None
+
+    def produce() -> Iterator[str]:
+        model = get_gemini_model(api_key)
+        prompt = build_inbasket_prompt(model, title, content)
+        yield from _iter_response_text(gemini_generate(model, prompt, stream=True))
+
+    def on_complete(analysis: str):
+        save_cached_analysis(cache_key, content_hash, analysis)
+
+    def on_result(analysis: str):
+        if briefing_url:
+            save_briefing_analysis(briefing_url, analysis)
+        if job_id is not None:
+            finish_analysis_job(job_id, "done")
+
+    def on_error(error: Exception):
+        if job_id is not None:
+            finish_analysis_job(job_id, "queued", error=str(error), retry_after=ANALYSIS_JOB_BACKOFF_BASE)
 
+    stream = start_background_stream(cache_key, produce, on_complete, on_result, on_error)
+    return stream.key, stream.iter_text()
+
+def stream_future_jobs(api_key: str) -> Tuple[Optional[str], Iterator[str]]:
+    """2026년 유망 직무 예측을 스트리밍으로 생성 (스트림 키, 텍스트 조각 반복자)"""
+    if not api_key:
+        return None, iter(["⚠️ Gemini API 키가 설정되지 않았습니다."])
+
+    def produce() -> Iterator[str]:
+        model = get_gemini_model(api_key)
+        yield from _iter_response_text(gemini_generate(model, FUTURE_JOBS_PROMPT, stream=True))
+
+    cache_key, _ = _future_jobs_cache_key()
+    stream = start_background_stream(cache_key, produce, save_future_jobs_prediction)
+    return stream.key, stream.iter_text()
+
+# ============================================================
+# AI 분석 작업 큐 (새 브리핑 분석을 백그라운드에서 미리 생성)
+# ============================================================
+
+def _analysis_worker_state() -> Dict:
+    """분석 워커 스레드와 제어 이벤트 (재실행·세션 간 공유)"""
+    return shared_resource("analysis_workers", lambda: {
+        "threads": [],
+        "lock": threading.Lock(),
+        "api_key": "",
+        "wakeup": threading.Event(),
+        "stop": threading.Event(),
+    })
+
+ANALYSIS_JOB_STATUS_LABELS = {
+    "queued": "⏳ 분석 대기 중",
+    "running": "⚙️ 분석 중",
+    "failed": "⚠️ 자동 분석 실패",
+}
+
+def get_gemini_api_key(session_api_key: Optional[str] = None) -> str:
+    """화면에서 입력한 API 키, 없으면 GEMINI_API_KEY 환경 변수"""
+    return session_api_key or os.environ.get("GEMINI_API_KEY", "")
+
+def enqueue_analysis_jobs(urls: Iterable[str], priority: int = ANALYSIS_PRIORITY_NEW) -> int:
+    """분석이 없는 브리핑을 작업 큐에 등록하고 등록 건수 반환"""
+    urls = list(urls)
+    if not urls:
+        return 0
+
+    now = datetime.now()
+    with db_write() as conn:
+        placeholders = ",".join("?" * len(urls))
+        cursor = conn.execute(f"""
+            INSERT OR IGNORE INTO analysis_jobs (briefing_id, priority, status, not_before, created_at, updated_at)
+            SELECT id, ?, 'queued', ?, ?, ? FROM briefings
+            WHERE url IN ({placeholders}) AND ai_analysis IS NULL AND length(content) >= 100
+              AND canonical_id IS NULL
+        """, [priority, now, now, now] + urls)
+        queued = cursor.rowcount
+
+    if queued:
+        _analysis_worker_state()["wakeup"].set()
+    return queued
+
+def claim_analysis_job() -> Optional[Dict]:
+    """실행할 작업 하나를 진행 중으로 표시하고 반환 (우선순위 높은 순, 같으면 최신 순)"""
+    now = datetime.now()
+    stale_before = now - timedelta(seconds=ANALYSIS_JOB_STALE_AFTER)
+    # 작업 수거는 조회 캐시를 무효화하지 않음 (카드의 진행 상태 표시는 다음 데이터 변경 때 반영)
+    with db_write(bump_version=False) as conn:
+        row = conn.execute("""
+            UPDATE analysis_jobs SET status = 'running', attempts = attempts + 1, updated_at = ?
+            WHERE id = (
+                SELECT id FROM analysis_jobs
+                WHERE (status = 'queued' AND not_before <= ?)
+                   OR (status = 'running' AND updated_at < ?)
+                ORDER BY priority DESC, id DESC
+                LIMIT 1
+            )
+            RETURNING id, briefing_id, attempts
+        """, (now, now, stale_before)).fetchone()
+
+    if row is None:
+        return None
+    return {"id": row[0], "briefing_id": row[1], "attempts": row[2]}
+
+def claim_briefing_analysis_job(briefing_url: str) -> Optional[int]:
+    """화면에서 직접 분석할 브리핑의 대기 중 작업을 진행 중으로 가져옴 (워커가 같은 분석을 다시 호출하지 않도록)"""
+    now = datetime.now()
+    with db_write(bump_version=False) as conn:
+        row = conn.execute("""
+            UPDATE analysis_jobs SET status = 'running', updated_at = ?
+            WHERE status = 'queued'
+              AND briefing_id IN (SELECT id FROM briefings WHERE url = ?)
+            RETURNING id
+        """, (now, briefing_url)).fetchone()
+    return row[0] if row else None
+
+def get_briefing_analysis_job_status(briefing_id: int) -> Optional[str]:
+    """브리핑 한 건의 현재 분석 작업 상태 (캐시 없이 조회)"""
+    with db_read() as conn:
+        row = conn.execute("SELECT status FROM analysis_jobs WHERE briefing_id = ?", (briefing_id,)).fetchone()
+    return row[0] if row else None
+
+def finish_analysis_job(job_id: int, status: str, error: Optional[str] = None,
+                        retry_after: Optional[float] = None):
+    """작업 결과 기록 (retry_after가 있으면 그 뒤에 다시 대기열로)
+
+    완료는 분석 저장(save_briefing_analysis)이, 재시도는 화면상 대기 상태 그대로이므로
+    실패·건너뜀처럼 카드 표시가 바뀌는 경우에만 데이터 버전을 올린다.
+    """
+    now = datetime.now()
+    not_before = now + timedelta(seconds=retry_after) if retry_after is not None else None
+    with db_write(bump_version=status in ("failed", "skipped")) as conn:
+        conn.execute("""
+            UPDATE analysis_jobs
+            SET status = ?, error = ?, not_before = COALESCE(?, not_before), updated_at = ?
+            WHERE id = ?
+        """, (status, error, not_before, now, job_id))
+
+def get_analysis_job_statuses(briefing_ids: Iterable[int]) -> Dict[int, str]:
+    """브리핑별 분석 작업 상태"""
+    briefing_ids = [i for i in briefing_ids if i is not None]
+    if not briefing_ids:
+        return {}
+
+    with db_read() as conn:
+        placeholders = ",".join("?" * len(briefing_ids))
+        cursor = conn.execute(
+            f"SELECT briefing_id, status FROM analysis_jobs WHERE briefing_id IN ({placeholders})",
+            briefing_ids,
+        )
+        return dict(cursor.fetchall())
+
+def get_analysis_queue_stats() -> Dict[str, int]:
+    """상태별 분석 작업 수"""
+    with db_read() as conn:
+        cursor = conn.execute("SELECT status, COUNT(*) FROM analysis_jobs GROUP BY status")
+        return dict(cursor.fetchall())
+
+def _analysis_backoff(attempts: int) -> float:
+    """재시도 대기 시간 (지수 증가, 상한 있음)"""
+    return min(ANALYSIS_JOB_BACKOFF_MAX, ANALYSIS_JOB_BACKOFF_BASE * 2 ** (attempts - 1))
+
+def process_analysis_job(job: Dict, api_key: str):
+    """작업 하나 실행 (할당량 초과는 횟수 제한 없이, 그 밖의 오류는 최대 횟수까지 재시도)"""
+    with db_read() as conn:
+        row = conn.execute(
+            "SELECT title, url, content, ai_analysis FROM briefings WHERE id = ?", (job['briefing_id'],)
+        ).fetchone()
+
+    if row is None or row[3]:
+        finish_analysis_job(job['id'], "done")
+        return
+    title, url, content, _ = row
+    if not content or len(content) < 100:
+        finish_analysis_job(job['id'], "skipped", error="분석할 내용이 충분하지 않음")
+        return
+
+    try:
+        run_inbasket_analysis(content, title, api_key, briefing_url=url, interactive=False)
+        finish_analysis_job(job['id'], "done")
     except Exception as e:
-        return f"⚠️ 예측 생성 실패: {e}"
-
-def categorize_content(title: str, content: str) -> str:
-    """콘텐츠 카테고리 자동 분류"""
-    text = (title + " " + content).lower()
-
-    if any(kw in text for kw in ['r&d', '연구개발', '기술개발', '연구비', '과제']):
-        return "R&D 정책"
-    elif any(kw in text for kw in ['글로벌', '해외', '수출', '진출', 'fda', 'ema', '국제']):
-        return "글로벌 진출"
-    elif any(kw in text for kw in ['규제', '법령', '인허가', '승인', '제도', '법률']):
-        return "규제/법령"
-    elif any(kw in text for kw in ['채용', '인재', '일자리', '취업', '고용']):
-        return "채용 분석"
+        record_failure("분석 작업", e)
+        if is_quota_error(e) or job['attempts'] < ANALYSIS_JOB_MAX_ATTEMPTS:
+            finish_analysis_job(job['id'], "queued", error=str(e), retry_after=_analysis_backoff(job['attempts']))
+        else:
+            finish_analysis_job(job['id'], "failed", error=str(e))
+
+def _analysis_worker_loop():
+    """작업 큐를 비울 때까지 처리하고, 비면 새 작업 알림을 기다림"""
+    state = _analysis_worker_state()
+    while not state["stop"].is_set():
+        api_key = state["api_key"]
+        job = claim_analysis_job() if api_key else None
+        if job is None:
+            state["wakeup"].wait(timeout=10)
+            state["wakeup"].clear()
+            continue
+        try:
+            process_analysis_job(job, api_key)
+        except Exception as e:
+            record_failure("분석 작업", e)
+            # DB 오류 등으로 결과를 기록하지 못한 작업은 오래된 진행 중 작업으로 재수거됨
+            state["stop"].wait(timeout=ANALYSIS_JOB_BACKOFF_BASE)
+
+def start_analysis_workers(api_key: str, workers: int = ANALYSIS_JOB_WORKERS) -> int:
+    """백그라운드 분석 워커 시작 (이미 실행 중이면 API 키만 갱신), 실행 중인 워커 수 반환"""
+    if not api_key:
+        return 0
+
+    state = _analysis_worker_state()
+    with state["lock"]:
+        changed = state["api_key"] != api_key
+        state["api_key"] = api_key
+        state["stop"].clear()
+        threads = state["threads"]
+        threads[:] = [t for t in threads if t.is_alive()]
+        while len(threads) < workers:
+            thread = threading.Thread(target=_analysis_worker_loop, daemon=True,
+                                      name=f"analysis-worker-{len(threads)}")
+            thread.start()
+            threads.append(thread)
+            changed = True
+        if changed:
+            state["wakeup"].set()
+        return len(threads)
+
+def stop_analysis_workers(timeout: float = 5.0):
+    """백그라운드 분석 워커 종료"""
+    state = _analysis_worker_state()
+    state["stop"].set()
+    state["wakeup"].set()
+    with state["lock"]:
+        for thread in state["threads"]:
+            thread.join(timeout=timeout)
+        state["threads"].clear()
+
+# ============================================================
+# 로컬 자료 일괄 수집 (python app.py ingest-local 폴더)
+# ============================================================
+
+def local_briefing_url(digest: str) -> str:
+    """로컬 파일 브리핑의 고유 URL (파일 해시 기준이라 복사본은 같은 브리핑)"""
+    return f"local://{digest}"
+
+def iter_local_files(root: str) -> Iterator[str]:
+    """폴더 아래 수집 대상 파일 경로 (정렬된 순서)"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.lower().endswith(LOCAL_INGEST_EXTENSIONS) and not name.startswith("."):
+                yield os.path.join(dirpath, name)
+
+def _read_text_file(path: str) -> str:
+    """텍스트 파일 읽기 (UTF-8, 안 되면 CP949)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode("utf-8", errors="replace")
+
+def _extract_local_file(path: str) -> str:
+    """로컬 파일 전체 텍스트 추출 (프로세스 풀 작업 단위, 파일 하나씩 병렬 처리)"""
+    if not path.lower().endswith(".pdf"):
+        return _read_text_file(path)
+    with pdfplumber.open(path) as pdf:
+        pages = [page.extract_text() or "" for page in pdf.pages]
+    return PDF_PAGE_SEPARATOR.join(page for page in pages if page)
+
+def _local_file_states(paths: List[str]) -> Dict[str, Tuple[int, int, str]]:
+    """이전 실행에서 처리를 마친 파일의 {경로: (크기, 수정 시각, 상태)}"""
+    states = {}
+    with db_read() as conn:
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            cursor = conn.execute(f"""
+                SELECT path, size_bytes, mtime_ns, status FROM local_files
+                WHERE path IN ({','.join('?' * len(chunk))}) AND status != 'failed'
+            """, chunk)
+            states.update({path: (size, mtime, status) for path, size, mtime, status in cursor.fetchall()})
+    return states
+
+def _is_known_digest(digest: str) -> bool:
+    """같은 내용의 파일을 이미 수집했는지 확인"""
+    with db_read() as conn:
+        return conn.execute(
+            "SELECT 1 FROM local_files WHERE digest = ? AND status IN ('done', 'empty') LIMIT 1", (digest,)
+        ).fetchone() is not None
+
+def _record_local_files(records: List[Tuple]):
+    """처리한 파일 기록 (path, digest, size_bytes, mtime_ns, status, error)"""
+    now = datetime.now()
+    with db_write(bump_version=False) as conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO local_files (path, digest, size_bytes, mtime_ns, status, error, ingested_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [record + (now,) for record in records])
+
+def ingest_local_files(root: str, on_progress: Optional[Callable[[Dict[str, Dict[str, int]]], None]] = None
+                       ) -> Tuple[Dict[str, int], List[str]]:
+    """폴더의 PDF·텍스트 파일을 추출·분류해 일괄 저장하고 (저장 건수, 오류 목록) 반환
+
+    파일 해시로 중복을 거르고, PDF 텍스트는 수집기와 같은 PDF 캐시에 저장한다.
+    추출은 PDF 추출용 프로세스 풀에서 파일 단위로 병렬 실행하며, LOCAL_INGEST_BATCH
+    단위로 저장과 처리 기록을 함께 남기므로 중단 후 다시 실행하면 남은 파일만 처리한다.
+    """
+    paths = [os.path.abspath(path) for path in iter_local_files(root)]
+    previous = _local_file_states(paths)
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    errors: List[str] = []
+    stats = {stage: {"queued": 0, "done": 0, "failed": 0} for stage in ("파일 확인", "텍스트 추출", "저장")}
+    stats["파일 확인"]["queued"] = len(paths)
+
+    batch: List[Dict] = []
+    records: List[Tuple] = []
+    seen_digests = set()
+
+    def report():
+        if on_progress:
+            on_progress(stats)
+
+    def flush():
+        if batch:
+            for key, value in save_briefings(batch).items():
+                counts[key] += value
+            link_near_duplicates()
+            update_briefing_terms()
+            enqueue_analysis_jobs((b['url'] for b in batch), ANALYSIS_PRIORITY_BACKFILL)
+            stats["저장"]["done"] += len(batch)
+        if records:
+            _record_local_files(records)
+        batch.clear()
+        records.clear()
+
+    def finish(task: Tuple[str, str, os.stat_result], text: Optional[str], error: Optional[str],
+               from_cache: bool = False):
+        path, digest, stat = task
+        stats["텍스트 추출"]["done"] += 1
+        if error is not None:
+            stats["텍스트 추출"]["failed"] += 1
+            errors.append(f"{os.path.relpath(path, root)}: {error}")
+            records.append((path, digest, stat.st_size, stat.st_mtime_ns, "failed", error))
+        elif not text.strip():
+            # 스캔 이미지 PDF처럼 텍스트가 없는 파일
+            records.append((path, digest, stat.st_size, stat.st_mtime_ns, "empty", None))
+        else:
+            if path.lower().endswith(".pdf") and not from_cache:
+                store_pdf_text(digest, text)
+            title = os.path.splitext(os.path.basename(path))[0].replace("_", " ").strip()
+            batch.append({
+                "title": title,
+                "source": LOCAL_INGEST_SOURCE,
+                **categorize_briefing(title, text),
+                "url": local_briefing_url(digest),
+                "pdf_url": None,
+                "content": text,
+                "ai_analysis": None,
+            })
+            stats["저장"]["queued"] += 1
+            records.append((path, digest, stat.st_size, stat.st_mtime_ns, "done", None))
+        if len(records) >= LOCAL_INGEST_BATCH:
+            flush()
+        report()
+
+    def extract_inline(task):
+        try:
+            with span("로컬 파일 추출") as metric:
+                metric["bytes"] = task[2].st_size
+                text = _extract_local_file(task[0])
+            finish(task, text, None)
+        except Exception as e:
+            finish(task, None, str(e) or type(e).__name__)
+
+    pool = _get_pdf_process_pool() if PDF_EXTRACT_PROCESSES > 1 else None
+    pending: Dict = {}
+    window = PDF_EXTRACT_PROCESSES * 2
+
+    def drain(until: int):
+        nonlocal pool
+        while len(pending) > until:
+            completed, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in completed:
+                task = pending.pop(future)
+                try:
+                    finish(task, future.result(), None)
+                except BrokenProcessPool:
+                    # 워커가 죽으면 풀을 새로 만들고 해당 파일은 직접 추출
+                    pool = _get_pdf_process_pool(reset=True)
+                    extract_inline(task)
+                except Exception as e:
+                    record_failure("로컬 파일 추출", e)
+                    finish(task, None, str(e) or type(e).__name__)
+
+    for path in paths:
+        stats["파일 확인"]["done"] += 1
+        try:
+            stat = os.stat(path)
+            if previous.get(path, (None, None))[:2] == (stat.st_size, stat.st_mtime_ns):
+                continue
+            digest = file_sha256(path)
+        except OSError as e:
+            record_failure("로컬 파일 확인", e)
+            stats["파일 확인"]["failed"] += 1
+            errors.append(f"{os.path.relpath(path, root)}: {e}")
+            continue
+
+        # 다른 경로에 같은 파일이 있으면 한 번만 저장
+        if digest in seen_digests or _is_known_digest(digest):
+            records.append((path, digest, stat.st_size, stat.st_mtime_ns, "duplicate", None))
+            continue
+        seen_digests.add(digest)
+
+        task = (path, digest, stat)
+        stats["텍스트 추출"]["queued"] += 1
+        cached = load_pdf_text_by_digest(digest) if path.lower().endswith(".pdf") else None
+        if cached is not None:
+            finish(task, cached, None, from_cache=True)
+        elif pool is None:
+            extract_inline(task)
+        else:
+            drain(window - 1)
+            try:
+                pending[pool.submit(_extract_local_file, path)] = task
+            except (BrokenProcessPool, RuntimeError):
+                pool = _get_pdf_process_pool(reset=True)
+                extract_inline(task)
+        report()
+
+    drain(0)
+    flush()
+    report()
+    return counts, errors
+
+# ============================================================
+# 헤드리스 수집 (python app.py ingest, 대시보드와 별도 프로세스)
+# ============================================================
+
+def ingest_lock_path() -> str:
+    """수집 잠금 파일 경로 (DB 파일 옆)"""
+    return os.path.abspath(DB_PATH) + ".ingest.lock"
+
+@contextmanager
+def ingest_lock(path: Optional[str] = None) -> Iterator[bool]:
+    """수집 프로세스 단일 실행 잠금 (획득 여부 반환)
+
+    OS 파일 잠금을 쓰므로 수집 프로세스가 비정상 종료돼도 잠금이 자동으로 풀린다.
+    잠금을 잡는 동안 파일에 PID를 기록해 대시보드가 잠금을 건드리지 않고 실행 여부를 확인한다.
+    """
+    handle = open(path or ingest_lock_path(), "a+")
+    try:
+        handle.seek(0)
+        try:
+            if os.name == "nt":
+                import msvcrt
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+
+        handle.truncate(0)
+        handle.write(str(os.getpid()))
+        handle.flush()
+        try:
+            yield True
+        finally:
+            handle.truncate(0)
+            handle.flush()
+            handle.seek(0)
+            if os.name == "nt":
+                import msvcrt
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    finally:
+        handle.close()
+
+def _pid_alive(pid: int) -> bool:
+    """프로세스 생존 여부 (신호를 보내지 않고 확인)"""
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def is_ingest_running() -> bool:
+    """다른 프로세스가 수집 중인지 확인
+
+    잠금을 직접 잡아 보면 그 순간 시작한 수집이 잠금을 얻지 못하고 조용히 끝나므로,
+    잠금 보유자가 기록한 PID의 생존 여부로만 판단한다.
+    """
+    # 대시보드가 띄운 수집 프로세스가 끝났으면 회수 (좀비 PID가 살아 있는 것으로 보이지 않도록)
+    spawned = shared_resource("ingest_processes", list)
+    spawned[:] = [process for process in spawned if process.poll() is None]
+
+    try:
+        with open(ingest_lock_path()) as f:
+            pid = int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return False
+    except ValueError:
+        return False
+    except OSError:
+        # Windows는 잠긴 영역을 다른 프로세스가 읽을 수 없음 = 수집 중
+        return True
+    return pid > 0 and _pid_alive(pid)
+
+def start_ingest_run(mode: str, boards: List[str]) -> int:
+    """수집 실행 기록 생성"""
+    with db_write(bump_version=False) as conn:
+        cursor = conn.execute("""
+            INSERT INTO ingest_runs (mode, boards, pid, status, started_at)
+            VALUES (?, ?, ?, 'running', ?)
+        """, (mode, ", ".join(boards), os.getpid(), datetime.now()))
+        return cursor.lastrowid
+
+def update_ingest_run(run_id: int, **fields):
+    """수집 실행 기록 갱신"""
+    columns = ", ".join(f"{name} = ?" for name in fields)
+    with db_write(bump_version=False) as conn:
+        conn.execute(f"UPDATE ingest_runs SET {columns} WHERE id = ?", list(fields.values()) + [run_id])
+
+def get_latest_ingest_run() -> Optional[Dict]:
+    """가장 최근 수집 실행 기록"""
+    with db_read() as conn:
+        cursor = conn.execute("SELECT * FROM ingest_runs ORDER BY id DESC LIMIT 1")
+        row = cursor.fetchone()
+        columns = [desc[0] for desc in cursor.description]
+    return dict(zip(columns, row)) if row else None
+
+def _run_ingest_job(mode: str, targets: List[str],
+                    collect: Callable[[Callable[[Dict[str, Dict[str, int]]], None]],
+                                      Tuple[Dict[str, int], List[str]]]
+                    ) -> Optional[Tuple[Dict[str, int], List[str]]]:
+    """잠금을 잡고 실행 기록을 남기며 수집 함수 실행 (다른 수집이 실행 중이면 None)"""
+    with ingest_lock() as acquired:
+        if not acquired:
+            return None
+
+        init_database()
+        # 분류 키워드가 바뀌었으면 저장된 브리핑 재분류 (대시보드 시작을 막지 않도록 수집 프로세스에서)
+        reclassify_briefings()
+        run_id = start_ingest_run(mode, targets)
+        last_report = [0.0]
+        last_stats: List[Dict[str, Dict[str, int]]] = []
+
+        def on_progress(stats: Dict[str, Dict[str, int]]):
+            last_stats[:] = [stats]
+            now = time.monotonic()
+            if now - last_report[0] >= INGEST_PROGRESS_INTERVAL:
+                last_report[0] = now
+                progress = format_pipeline_progress(stats)
+                update_ingest_run(run_id, progress=progress)
+                print(progress, flush=True)
+
+        try:
+            counts, errors = collect(on_progress)
+        except BaseException as e:
+            update_ingest_run(run_id, status="failed", errors=json.dumps([str(e)], ensure_ascii=False),
+                              finished_at=datetime.now())
+            raise
+        finally:
+            get_metrics_recorder().flush()
+
+        # 진행 기록은 간격을 두고 남기므로 마지막 상태를 한 번 더 기록
+        update_ingest_run(
+            run_id, status="done", progress=format_pipeline_progress(last_stats[0]) if last_stats else None,
+            inserted=counts['inserted'], updated=counts['updated'],
+            unchanged=counts['unchanged'], errors=json.dumps(errors[:20], ensure_ascii=False),
+            finished_at=datetime.now(),
+        )
+        return counts, errors
+
+def run_ingest(boards: Iterable[Tuple[str, str]], mode: str = "incremental",
+               max_pages: Optional[int] = None) -> Optional[Tuple[Dict[str, int], List[str]]]:
+    """잠금을 잡고 한 번 수집 (다른 수집이 실행 중이면 None)"""
+    boards = list(boards)
+    return _run_ingest_job(
+        mode, [name for name, _ in boards],
+        lambda on_progress: collect_briefings(boards, mode=mode, max_pages=max_pages, on_progress=on_progress),
+    )
+
+def run_local_ingest(root: str) -> Optional[Tuple[Dict[str, int], List[str]]]:
+    """잠금을 잡고 로컬 폴더 자료를 한 번 수집 (다른 수집이 실행 중이면 None)"""
+    return _run_ingest_job("local", [os.path.abspath(root)],
+                           lambda on_progress: ingest_local_files(root, on_progress=on_progress))
+
+def spawn_ingest_process(extra_args: Optional[List[str]] = None) -> subprocess.Popen:
+    """대시보드에서 수집을 별도 프로세스로 실행 (화면 재실행과 무관하게 끝까지 진행)"""
+    env = dict(os.environ, KHIDI_DB_PATH=os.path.abspath(DB_PATH),
+               KHIDI_PDF_CACHE_DIR=os.path.abspath(PDF_CACHE_DIR))
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
     else:
-        return "R&D 정책"  # 기본값
+        kwargs["start_new_session"] = True
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "ingest", "--once"] + (extra_args or []),
+        env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        **kwargs,
+    )
+    shared_resource("ingest_processes", list).append(process)
+    return process
+
+def run_local_ingest_command(root: str) -> int:
+    """로컬 폴더 수집 (명령행)"""
+    if not os.path.isdir(root):
+        print(f"폴더가 없습니다: {root}", file=sys.stderr)
+        return 1
+
+    try:
+        result = run_local_ingest(root)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        close_db_connections()
+
+    if result is None:
+        print("다른 수집 작업이 실행 중입니다.", file=sys.stderr)
+        return 1
+
+    counts, errors = result
+    for error in errors:
+        print(f"수집 실패: {error}", file=sys.stderr)
+    print(f"신규 {counts['inserted']}건, 갱신 {counts['updated']}건, "
+          f"변경 없음 {counts['unchanged']}건", flush=True)
+    return 0
+
+def run_import_recruitments(path: str) -> int:
+    """채용 이력 파일 가져오기 (명령행)"""
+    init_database()
+    try:
+        result = import_recruitments(read_recruitment_file(path, path))
+    except (ValueError, OSError) as e:
+        print(f"가져오기 실패: {e}", file=sys.stderr)
+        return 1
+    finally:
+        close_db_connections()
+
+    print(f"{result['years']}개 연도 {result['inserted']}건 저장 (기존 {result['replaced']}건 교체)")
+    return 0
+
+def run_reclassify(force: bool) -> int:
+    """저장된 브리핑 재분류 (명령행)"""
+    init_database()
+    try:
+        changed = reclassify_briefings(force=force)
+    finally:
+        close_db_connections()
+
+    print(f"카테고리 변경 {changed}건")
+    return 0
+
+def run_cli(argv: List[str]) -> int:
+    """명령행 진입점
+
+    python app.py ingest [--once | --interval 초] [--backfill 게시판 --max-pages N]
+    python app.py ingest-local 폴더
+    python app.py import-recruitments 파일.csv|파일.xlsx
+    python app.py reclassify [--force]
+    """
+    parser = argparse.ArgumentParser(prog="app.py", description="KHIDI 브리핑 수집기")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="게시판을 수집해 DB에 저장")
+    schedule = ingest.add_mutually_exclusive_group()
+    schedule.add_argument("--once", action="store_true", help="한 번만 수집 (기본값)")
+    schedule.add_argument("--interval", type=int, nargs="?", const=INGEST_DEFAULT_INTERVAL,
+                          help=f"주기적으로 수집 (초, 기본 {INGEST_DEFAULT_INTERVAL})")
+    ingest.add_argument("--backfill", choices=list(KHIDI_URLS), help="지정한 게시판의 과거 게시글 수집")
+    ingest.add_argument("--max-pages", type=int, help="게시판당 최대 탐색 페이지")
+
+    local = subparsers.add_parser("ingest-local", help="로컬 폴더의 PDF·텍스트 파일을 브리핑으로 저장")
+    local.add_argument("root", help="수집할 폴더 경로 (하위 폴더 포함)")
+
+    importer = subparsers.add_parser("import-recruitments", help="채용 이력 CSV/Excel 파일을 DB로 가져오기")
+    importer.add_argument("path", help="CSV 또는 XLSX 파일 경로")
+
+    reclassify = subparsers.add_parser("reclassify", help="분류 키워드 변경 후 저장된 브리핑 재분류")
+    reclassify.add_argument("--force", action="store_true", help="규칙 버전이 같은 브리핑도 모두 재분류")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import-recruitments":
+        return run_import_recruitments(args.path)
+    if args.command == "reclassify":
+        return run_reclassify(args.force)
+    if args.command == "ingest-local":
+        return run_local_ingest_command(args.root)
+
+    if args.backfill:
+        boards, mode = [(args.backfill, KHIDI_URLS[args.backfill])], "backfill"
+    else:
+        boards, mode = list(KHIDI_URLS.items()), "incremental"
+
+    # 상주 실행 시 API 키가 있으면 새 브리핑 분석도 이 프로세스에서 처리
+    if args.interval:
+        init_database()
+        start_analysis_workers(get_gemini_api_key())
+
+    try:
+        while True:
+            result = run_ingest(boards, mode=mode, max_pages=args.max_pages)
+            if result is None:
+                print("다른 수집 작업이 실행 중입니다.", file=sys.stderr)
+                if not args.interval:
+                    return 1
+            else:
+                counts, errors = result
+                for error in errors:
+                    print(f"수집 실패: {error}", file=sys.stderr)
+                print(f"신규 {counts['inserted']}건, 갱신 {counts['updated']}건, "
+                      f"변경 없음 {counts['unchanged']}건", flush=True)
+
+            if not args.interval:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        stop_analysis_workers()
+        close_db_connections()
 
 # ============================================================
 # 샘플 데이터 생성 (크롤링 실패 시 대체용)
 # ============================================================
-def get_sample_briefings() -> List[Dict]:
-    """샘플 브리핑 데이터"""
-    return [
-        {
-            "id": 1,
-            "title": "2025년 바이오헬스 산업 글로벌 경쟁력 강화 전략",
-            "source": "보건산업브리프",
-            "category": "R&D 정책",
-            "url": "https://www.khidi.or.kr/sample1",
-            "content": """
-            2025년 바이오헬스 산업은 글로벌 시장 규모 3조 달러를 돌파할 전망이다.
-            한국은 바이오시밀러 분야에서 세계 2위의 시장 점유율을 기록하고 있으며,
-            세포·유전자치료제 분야에서도 급성장하고 있다.
-
-            주요 정책 방향:
-            1. 바이오의약품 R&D 투자 확대 (연간 2조원 규모)
-            2. 규제 샌드박스를 통한 신속 인허가 지원
-            3. 글로벌 임상 네트워크 구축
-            4. 바이오 인력 양성 프로그램 확대
-
-            산업계 현황:
-            - 국내 바이오기업 수: 1,200개 이상
-            - 바이오헬스 수출액: 200억 달러 (전년 대비 15% 증가)
-            - R&D 투자 비중: 매출 대비 평균 12%
-            """,
-            "ai_analysis": None,
-            "crawled_at": datetime.now().isoformat()
-        },
-        {
-            "id": 2,
-            "title": "디지털치료제(DTx) 산업 동향 및 정책 과제",
-            "source": "글로벌보건산업동향",
-            "category": "R&D 정책",
-            "url": "https://www.khidi.or.kr/sample2",
-            "content": """
-            디지털치료제(Digital Therapeutics)는 소프트웨어를 기반으로 질병을 예방,
-            관리, 치료하는 새로운 의료 패러다임이다.
-
-            글로벌 시장 현황:
-            - 2025년 시장 규모: 89억 달러
-            - 연평균 성장률: 25.4%
-            - 주요 적용 분야: 정신건강, 당뇨관리, 호흡기질환
-
-            국내 현황 및 과제:
-            1. 국내 DTx 개발 기업: 50개 이상
-            2. 임상시험 진행 중인 제품: 30개 이상
-            3. 건강보험 급여 적용 논의 진행 중
-
-            정책 제언:
-            - DTx 전용 인허가 트랙 마련
-            - 의료데이터 활용 규제 완화
-            - 수가 체계 및 급여 기준 수립
-            """,
-            "ai_analysis": None,
-            "crawled_at": datetime.now().isoformat()
-        },
-        {
-            "id": 3,
-            "title": "미국 FDA 의료기기 인허가 동향 분석",
-            "source": "글로벌보건산업동향",
-            "category": "글로벌 진출",
-            "url": "https://www.khidi.or.kr/sample3",
-            "content": """
-            미국 FDA의 의료기기 인허가 정책 변화와 국내 기업의 대응 전략을 분석한다.
-
-            FDA 주요 정책 변화:
-            1. AI/ML 기반 의료기기 가이드라인 강화
-            2. 사이버보안 요구사항 의무화
-            3. Real-World Evidence 활용 확대
-            4. 510(k) 심사 현대화 프로그램
-
-            국내 기업 FDA 인허가 현황:
-            - 2024년 FDA 승인 획득: 45건
-            - 주요 승인 분야: 진단기기, AI 의료기기, 수술로봇
-
-            진출 전략 제언:
-            - 초기 단계부터 FDA 규제 고려한 개발
-            - Pre-submission 미팅 적극 활용
-            - 현지 RA 전문인력 확보
-            """,
-            "ai_analysis": None,
-            "crawled_at": datetime.now().isoformat()
-        },
-        {
-            "id": 4,
-            "title": "의료기기 규제 샌드박스 운영 성과 및 개선 방향",
-            "source": "보건산업브리프",
-            "category": "규제/법령",
-            "url": "https://www.khidi.or.kr/sample4",
-            "content": """
-            의료기기 규제 샌드박스는 혁신 의료기기의 신속한 시장 진입을 지원하는 제도이다.
-
-            운영 성과 (2020-2024):
-            - 신청 건수: 320건
-            - 승인 건수: 180건 (승인률 56%)
-            - 사업화 성공: 45건
-
-            주요 승인 사례:
-            1. AI 기반 의료영상 분석 소프트웨어
-            2. 웨어러블 건강 모니터링 기기
-            3. 원격의료 플랫폼
-
-            개선 과제:
-            - 심사 기간 단축 (현재 평균 6개월 → 3개월 목표)
-            - 임시허가 후 정식허가 전환율 제고
-            - 사후관리 체계 강화
-            """,
-            "ai_analysis": None,
-            "crawled_at": datetime.now().isoformat()
-        },
-        {
-            "id": 5,
-            "title": "보건산업 인력 수급 전망 및 양성 전략",
-            "source": "뉴스레터",
-            "category": "채용 분석",
-            "url": "https://www.khidi.or.kr/sample5",
-            "content": """
-            보건산업 분야의 인력 수급 현황과 미래 전망을 분석한다.
-
-            현재 인력 현황:
-            - 보건산업 종사자: 약 85만 명
-            - 연평균 증가율: 4.2%
-            - 인력 부족 분야: AI 헬스케어, 바이오 데이터, RA 전문가
-
-            2026년 수요 전망:
-            1. 디지털 헬스케어 전문가: 5,000명 추가 필요
-            2. 바이오 데이터 사이언티스트: 2,000명 추가 필요
-            3. 글로벌 RA 전문가: 1,500명 추가 필요
-
-            인력 양성 전략:
-            - 산학협력 프로그램 확대
-            - 재직자 역량 강화 교육
-            - 해외 우수 인력 유치
-            """,
-            "ai_analysis": None,
-            "crawled_at": datetime.now().isoformat()
-        }
-    ]
+_SAMPLE_CRAWLED_AT = datetime.now().isoformat()
+
+# 샘플 카드는 DB 행이 아니므로 id가 없음 (관련 브리핑·작업 상태 등 id 기반 기능은 URL로 구분하거나 건너뜀)
+
+SAMPLE_BRIEFINGS: Tuple[Dict, ...] = (
+    {
+        "id": None,
+        "title": "2025년 바이오헬스 산업 글로벌 경쟁력 강화 전략",
+        "source": "보건산업브리프",
+        "category": "R&D 정책",
+        "url": "https://www.khidi.or.kr/sample1",
+        "content": """
+        2025년 바이오헬스 산업은 글로벌 시장 규모 3조 달러를 돌파할 전망이다.
+        한국은 바이오시밀러 분야에서 세계 2위의 시장 점유율을 기록하고 있으며,
+        세포·유전자치료제 분야에서도 급성장하고 있다.
+
+        주요 정책 방향:
+        1. 바이오의약품 R&D 투자 확대 (연간 2조원 규모)
+        2. 규제 샌드박스를 통한 신속 인허가 지원
+        3. 글로벌 임상 네트워크 구축
+        4. 바이오 인력 양성 프로그램 확대
+
+        산업계 현황:
+        - 국내 바이오기업 수: 1,200개 이상
+        - 바이오헬스 수출액: 200억 달러 (전년 대비 15% 증가)
+        - R&D 투자 비중: 매출 대비 평균 12%
+        """,
+        "ai_analysis": None,
+        "crawled_at": _SAMPLE_CRAWLED_AT
+    },
+    {
+        "id": None,
+        "title": "디지털치료제(DTx) 산업 동향 및 정책 과제",
+        "source": "글로벌보건산업동향",
+        "category": "R&D 정책",
+        "url": "https://www.khidi.or.kr/sample2",
+        "content": """
+        디지털치료제(Digital Therapeutics)는 소프트웨어를 기반으로 질병을 예방,
+        관리, 치료하는 새로운 의료 패러다임이다.
+
+        글로벌 시장 현황:
+        - 2025년 시장 규모: 89억 달러
+        - 연평균 성장률: 25.4%
+        - 주요 적용 분야: 정신건강, 당뇨관리, 호흡기질환
+
+        국내 현황 및 과제:
+        1. 국내 DTx 개발 기업: 50개 이상
+        2. 임상시험 진행 중인 제품: 30개 이상
+        3. 건강보험 급여 적용 논의 진행 중
+
+        정책 제언:
+        - DTx 전용 인허가 트랙 마련
+        - 의료데이터 활용 규제 완화
+        - 수가 체계 및 급여 기준 수립
+        """,
+        "ai_analysis": None,
+        "crawled_at": _SAMPLE_CRAWLED_AT
+    },
+    {
+        "id": None,
+        "title": "미국 FDA 의료기기 인허가 동향 분석",
+        "source": "글로벌보건산업동향",
+        "category": "글로벌 진출",
+        "url": "https://www.khidi.or.kr/sample3",
+        "content": """
+        미국 FDA의 의료기기 인허가 정책 변화와 국내 기업의 대응 전략을 분석한다.
+
+        FDA 주요 정책 변화:
+        1. AI/ML 기반 의료기기 가이드라인 강화
+        2. 사이버보안 요구사항 의무화
+        3. Real-World Evidence 활용 확대
+        4. 510(k) 심사 현대화 프로그램
+
+        국내 기업 FDA 인허가 현황:
+        - 2024년 FDA 승인 획득: 45건
+        - 주요 승인 분야: 진단기기, AI 의료기기, 수술로봇
+
+        진출 전략 제언:
+        - 초기 단계부터 FDA 규제 고려한 개발
+        - Pre-submission 미팅 적극 활용
+        - 현지 RA 전문인력 확보
+        """,
+        "ai_analysis": None,
+        "crawled_at": _SAMPLE_CRAWLED_AT
+    },
+    {
+        "id": None,
+        "title": "의료기기 규제 샌드박스 운영 성과 및 개선 방향",
+        "source": "보건산업브리프",
+        "category": "규제/법령",
+        "url": "https://www.khidi.or.kr/sample4",
+        "content": """
+        의료기기 규제 샌드박스는 혁신 의료기기의 신속한 시장 진입을 지원하는 제도이다.
+
+        운영 성과 (2020-2024):
+        - 신청 건수: 320건
+        - 승인 건수: 180건 (승인률 56%)
+        - 사업화 성공: 45건
+
+        주요 승인 사례:
+        1. AI 기반 의료영상 분석 소프트웨어
+        2. 웨어러블 건강 모니터링 기기
+        3. 원격의료 플랫폼
+
+        개선 과제:
+        - 심사 기간 단축 (현재 평균 6개월 → 3개월 목표)
+        - 임시허가 후 정식허가 전환율 제고
+        - 사후관리 체계 강화
+        """,
+        "ai_analysis": None,
+        "crawled_at": _SAMPLE_CRAWLED_AT
+    },
+    {
+        "id": None,
+        "title": "보건산업 인력 수급 전망 및 양성 전략",
+        "source": "뉴스레터",
+        "category": "채용 분석",
+        "url": "https://www.khidi.or.kr/sample5",
+        "content": """
+        보건산업 분야의 인력 수급 현황과 미래 전망을 분석한다.
+
+        현재 인력 현황:
+        - 보건산업 종사자: 약 85만 명
+        - 연평균 증가율: 4.2%
+        - 인력 부족 분야: AI 헬스케어, 바이오 데이터, RA 전문가
+
+        2026년 수요 전망:
+        1. 디지털 헬스케어 전문가: 5,000명 추가 필요
+        2. 바이오 데이터 사이언티스트: 2,000명 추가 필요
+        3. 글로벌 RA 전문가: 1,500명 추가 필요
+
+        인력 양성 전략:
+        - 산학협력 프로그램 확대
+        - 재직자 역량 강화 교육
+        - 해외 우수 인력 유치
+        """,
+        "ai_analysis": None,
+        "crawled_at": _SAMPLE_CRAWLED_AT
+    }
+)
+
+def get_sample_briefings(category: str = "전체") -> List[Dict]:
+    """샘플 브리핑 데이터 (카테고리 필터, 호출마다 복사본 반환)"""
+    return [dict(b) for b in SAMPLE_BRIEFINGS if category == "전체" or b['category'] == category]
+
+# ============================================================
+# 화면 조회 캐시 (재실행 시 SQL 없이 재사용, 데이터 버전이 바뀌면 다시 조회)
+# ============================================================
+
+@st.cache_resource(show_spinner=False)
+def ensure_database(db_path: str) -> bool:
+    """DB 파일당 한 번만 스키마 생성"""
+    init_database()
+    return True
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_list_briefings(data_version: int, category: str = "전체",
+                          after: Optional[Tuple[str, int]] = None,
+                          limit: int = BRIEFING_PAGE_SIZE) -> Tuple[List[Dict], Optional[Tuple[str, int]]]:
+    """list_briefings 캐시"""
+    return list_briefings(category, after, limit)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_search_briefings(data_version: int, query: str, category: str = "전체",
+                            limit: int = BRIEFING_PAGE_SIZE) -> List[Dict]:
+    """search_briefings 캐시"""
+    return search_briefings(query, category, limit)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_briefing_detail(data_version: int, briefing_id: int) -> Optional[Dict]:
+    """get_briefing_detail 캐시"""
+    return get_briefing_detail(briefing_id)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_recruitment_data(data_version: int, year: Optional[int] = None) -> List[Dict]:
+    """get_recruitment_data 캐시"""
+    return get_recruitment_data(year)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_recruitment_stats(data_version: int) -> Dict[str, pd.DataFrame]:
+    """get_recruitment_stats 캐시"""
+    return get_recruitment_stats()
+
+@st.cache_data(ttl=METRICS_FLUSH_INTERVAL * 6, show_spinner=False)
+def cached_stage_metrics(hours: int) -> Dict[str, pd.DataFrame]:
+    """get_stage_metrics 캐시 (계측 기록은 데이터 버전을 올리지 않으므로 짧은 TTL로만 갱신)"""
+    return get_stage_metrics(hours)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_related_briefings(data_version: int, briefing_id: int) -> List[Dict]:
+    """related_briefings 캐시"""
+    return related_briefings(briefing_id)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_recruitment_related_briefings(data_version: int, recruitment: Dict) -> List[Dict]:
+    """recruitment_related_briefings 캐시"""
+    return recruitment_related_briefings(recruitment)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_analysis_job_statuses(data_version: int, briefing_ids: Tuple[int, ...]) -> Dict[int, str]:
+    """get_analysis_job_statuses 캐시"""
+    return get_analysis_job_statuses(briefing_ids)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_sidebar_status(data_version: int) -> Dict:
+    """사이드바 상태 표시용 조회 묶음 (분석 큐)"""
+    return {
+        "queue_stats": get_analysis_queue_stats(),
+    }
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def cached_saved_future_jobs_prediction(data_version: int) -> Optional[str]:
+    """get_saved_future_jobs_prediction 캐시"""
+    return get_saved_future_jobs_prediction()
 
 # ============================================================
 # Streamlit UI
@@ -625,18 +4134,6 @@ def main():
             padding: 1.5rem;
             margin-top: 1rem;
         }
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 8px;
-        }
-        .stTabs [data-baseweb="tab"] {
-            padding: 10px 20px;
-            background-color: #f1f5f9;
-            border-radius: 8px 8px 0 0;
-        }
-        .stTabs [aria-selected="true"] {
-            background-color: #3182ce;
-            color: white;
-        }
         .metric-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
@@ -647,8 +4144,10 @@ def main():
     </style>
     """, unsafe_allow_html=True)
 
-    # 데이터베이스 초기화
-    init_database()
+    # 데이터베이스 초기화 (DB 파일당 한 번)
+    ensure_database(os.path.abspath(DB_PATH))
+    data_version = get_data_version()
+    sidebar_status = cached_sidebar_status(data_version)
 
     # ========== 사이드바 ==========
     with st.sidebar:
@@ -661,54 +4160,41 @@ def main():
         api_key = st.text_input(
             "Gemini API 키",
             type="password",
-            help="Google AI Studio에서 발급받은 API 키를 입력하세요."
+            help="Google AI Studio에서 발급받은 API 키를 입력하세요. 비워 두면 GEMINI_API_KEY 환경 변수를 사용합니다."
         )
+        api_key = get_gemini_api_key(api_key)
 
         if api_key:
             st.success("✅ API 키가 설정되었습니다.")
 
+        # 새 브리핑 분석은 백그라운드 워커가 미리 생성 (서버 설정 키로만 실행, 화면에서 입력한 키는 이 세션에서만 사용)
+        if start_analysis_workers(get_gemini_api_key()):
+            queue_stats = sidebar_status['queue_stats']
+            if queue_stats:
+                st.caption(
+                    f"🤖 자동 분석: 대기 {queue_stats.get('queued', 0)} · 진행 {queue_stats.get('running', 0)}"
+                    f" · 완료 {queue_stats.get('done', 0)} · 실패 {queue_stats.get('failed', 0)}"
+                )
+
         st.markdown("---")
 
         # 데이터 새로고침
         st.markdown("### 🔄 데이터 관리")
 
-        if st.button("📥 최신 브리핑 수집", use_container_width=True):
-            with st.spinner("KHIDI 웹사이트에서 데이터를 수집 중..."):
-                collected = 0
-                for board_name, board_url in KHIDI_URLS.items():
-                    articles = crawl_khidi_board(board_name, board_url)
-                    for article in articles:
-                        content, pdf_url = get_article_detail(article['url'])
-
-                        if pdf_url:
-                            pdf_content = download_and_extract_pdf(pdf_url)
-                            if pdf_content:
-                                content = pdf_content
-
-                        category = categorize_content(article['title'], content)
-
-                        save_briefing(
-                            title=article['title'],
-                            source=board_name,
-                            category=category,
-                            url=article['url'],
-                            pdf_url=pdf_url,
-                            content=content[:5000] if content else None
-                        )
-                        collected += 1
-
-                if collected > 0:
-                    st.success(f"✅ {collected}개의 브리핑을 수집했습니다.")
-                else:
-                    st.info("새로운 브리핑이 없거나 크롤링에 실패했습니다. 샘플 데이터를 사용합니다.")
-
-        if st.button("🗑️ 캐시 초기화", use_container_width=True):
-            if os.path.exists(DB_PATH):
-                os.remove(DB_PATH)
+        # 수집 버튼·진행 상황은 독립 프래그먼트로 주기적으로 갱신
+        render_ingest_controls()
+
+        if st.button("🗑️ 캐시 초기화", use_container_width=True, disabled=is_ingest_running()):
+            close_db_connections()
+            for path in (DB_PATH, f"{DB_PATH}-wal", f"{DB_PATH}-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
             if os.path.exists(PDF_CACHE_DIR):
                 import shutil
                 shutil.rmtree(PDF_CACHE_DIR)
-            init_database()
+            ensure_database.clear()
+            st.cache_data.clear()
+            ensure_database(os.path.abspath(DB_PATH))
             st.success("캐시가 초기화되었습니다.")
             st.rerun()
 
@@ -731,109 +4217,315 @@ def main():
     today = datetime.now().strftime("%Y년 %m월 %d일")
     st.markdown(f"**📅 {today}** 기준 브리핑")
 
-    # 카테고리 탭
-    tabs = st.tabs(CATEGORIES)
+    # 전문 검색
+    search_query = st.text_input(
+        "🔍 브리핑 검색",
+        placeholder="예: 디지털치료제 인허가",
+        help="제목·본문·PDF 내용·AI 분석에서 검색합니다.",
+    )
+    if search_query.strip():
+        render_search_results(search_query, api_key)
+        return
 
-    for idx, tab in enumerate(tabs):
-        category = CATEGORIES[idx]
+    # 카테고리 선택 (선택한 화면만 조회·렌더링)
+    category = st.radio("카테고리", CATEGORIES + [DIAGNOSTICS_TAB], horizontal=True,
+                        key="active_category", label_visibility="collapsed")
 
-        with tab:
-            if category == "채용 분석":
-                render_recruitment_tab(api_key)
-            else:
-                render_briefing_tab(category, api_key)
+    if category == "채용 분석":
+        render_recruitment_tab(api_key)
+    elif category == DIAGNOSTICS_TAB:
+        render_diagnostics_tab()
+    else:
+        render_briefing_tab(category, api_key)
+
+def load_briefing_body(briefing: Dict) -> Dict:
+    """카드의 본문·분석 로드 (샘플 데이터는 그대로, DB 행은 필요할 때 조회)"""
+    if 'content' in briefing:
+        return briefing
+    return cached_briefing_detail(get_data_version(), briefing['id']) or {"content": "", "ai_analysis": None}
+
+@st.fragment(run_every=INGEST_STATUS_REFRESH)
+def render_ingest_controls():
+    """수집 실행 버튼과 진행 상황 (수집은 python app.py ingest 별도 프로세스에서 실행)
+
+    진행 기록·이력 커서·PDF 캐시는 데이터 버전을 올리지 않고 갱신되므로 캐시 없이 직접 조회한다.
+    """
+    ingest_running = is_ingest_running()
+
+    # 수집이 끝나면 목록까지 갱신되도록 전체 화면 재실행
+    was_running = st.session_state.get("ingest_was_running", False)
+    st.session_state["ingest_was_running"] = ingest_running
+    if was_running and not ingest_running:
+        st.rerun()
+
+    if st.button("📥 최신 브리핑 수집", use_container_width=True, disabled=ingest_running):
+        spawn_ingest_process()
+        ingest_running = st.session_state["ingest_was_running"] = True
+        st.toast("백그라운드에서 수집을 시작했습니다.")
+
+    render_ingest_status(get_latest_ingest_run(), ingest_running)
+
+    with st.expander("📚 게시판 이력 수집"):
+        backfill_board = st.selectbox("게시판", list(KHIDI_URLS))
+        backfill_pages = st.number_input(
+            "1회 최대 페이지", min_value=1, max_value=200, value=BACKFILL_MAX_PAGES
+        )
+        state = get_board_state(backfill_board)
+        if state['backfill_done']:
+            st.caption("✅ 전체 이력 수집 완료")
+        else:
+            st.caption(f"다음 수집 시작 페이지: {state['backfill_page']}")
+
+        if st.button("📚 이력 수집 실행", use_container_width=True, disabled=ingest_running):
+            spawn_ingest_process(["--backfill", backfill_board, "--max-pages", str(int(backfill_pages))])
+            st.session_state["ingest_was_running"] = True
+            st.toast(f"백그라운드에서 {backfill_board} 이력 수집을 시작했습니다.")
+
+    cache_stats = get_pdf_cache_stats()
+    st.caption(
+        f"PDF 캐시: {cache_stats['entries']}건 · "
+        f"{cache_stats['size_bytes'] / 1024 / 1024:.1f}MB / {cache_stats['max_bytes'] / 1024 / 1024:.0f}MB"
+    )
+
+def render_ingest_status(run: Optional[Dict], ingest_running: bool):
+    """최근 수집 실행 상태 표시"""
+    if run is None:
+        if ingest_running:
+            st.caption("⏳ 수집 준비 중...")
+        return
+
+    if ingest_running:
+        st.caption(f"⏳ 수집 중 ({run['mode']}): {run['progress'] or '준비 중'}")
+    elif run['status'] == "done":
+        st.caption(
+            f"✅ 마지막 수집 {str(run['finished_at'])[:16]} · "
+            f"신규 {run['inserted']}건, 갱신 {run['updated']}건"
+        )
+        for error in json.loads(run['errors'] or "[]")[:5]:
+            st.warning(f"수집 실패: {error}")
+    else:
+        st.caption(f"⚠️ 마지막 수집이 완료되지 않았습니다 ({str(run['started_at'])[:16]})")
+
+def _load_more_briefings(category: str):
+    """'더 보기' 클릭 시 표시할 페이지 수 증가"""
+    key = f"briefing_pages_{category}"
+    st.session_state[key] = st.session_state.get(key, 1) + 1
 
 def render_briefing_tab(category: str, api_key: str):
-    """브리핑 탭 렌더링"""
+    """브리핑 목록 렌더링 (BRIEFING_PAGE_SIZE씩, '더 보기'로 다음 페이지)"""
 
-    # DB에서 데이터 조회
-    briefings = get_briefings(category)
+    # 펼친 페이지 수만큼 커서를 따라가며 카드 목록 조회 (본문 제외, 페이지별 캐시)
+    data_version = get_data_version()
+    briefings, cursor = [], None
+    for _ in range(st.session_state.get(f"briefing_pages_{category}", 1)):
+        page, cursor = cached_list_briefings(data_version, category, cursor)
+        briefings.extend(page)
+        if cursor is None:
+            break
 
     # 데이터가 없으면 샘플 데이터 사용
     if not briefings:
-        briefings = get_sample_briefings()
-        if category != "전체":
-            briefings = [b for b in briefings if b['category'] == category]
+        briefings = get_sample_briefings(category)
 
     if not briefings:
         st.info(f"'{category}' 카테고리에 해당하는 브리핑이 없습니다.")
         return
 
+    job_statuses = cached_analysis_job_statuses(data_version, tuple(b.get('id') for b in briefings))
     for briefing in briefings:
-        with st.container():
-            st.markdown(f"""
-            <div class="briefing-card">
-                <span class="category-tag">{briefing.get('category', 'N/A')}</span>
-                <span class="category-tag">{briefing.get('source', 'N/A')}</span>
-                <h3 style="margin-top: 0.5rem; margin-bottom: 0.5rem;">{briefing['title']}</h3>
-            </div>
-            """, unsafe_allow_html=True)
-
-            col1, col2 = st.columns([3, 1])
-
-            with col1:
-                # 원문 내용 표시
-                content = briefing.get('content', '')
-                if content:
-                    with st.expander("📄 원문 보기", expanded=False):
-                        st.markdown(content[:2000] + ("..." if len(content) > 2000 else ""))
-
-            with col2:
-                # AI 분석 버튼
-                if st.button(f"🤖 AI 분석", key=f"analyze_{briefing.get('id', briefing['title'][:10])}"):
-                    if not api_key:
-                        st.warning("사이드바에서 Gemini API 키를 입력해주세요.")
-                    else:
-                        with st.spinner("AI가 인바스켓 형식으로 분석 중..."):
-                            analysis = generate_inbasket_analysis(
-                                content=briefing.get('content', briefing['title']),
-                                title=briefing['title'],
-                                api_key=api_key
-                            )
-                            st.session_state[f"analysis_{briefing['title']}"] = analysis
-
-            # 저장된 분석 결과 표시
-            if f"analysis_{briefing['title']}" in st.session_state:
-                st.markdown("---")
-                st.markdown("### 🎯 인바스켓 분석 결과")
-                st.markdown(st.session_state[f"analysis_{briefing['title']}"])
+        briefing['job_status'] = job_statuses.get(briefing.get('id'))
+        render_briefing_card(briefing, api_key, key_prefix=category)
+
+    if cursor is not None:
+        st.button("⬇️ 더 보기", key=f"more_{category}", use_container_width=True,
+                  on_click=_load_more_briefings, args=(category,))
+
+def render_search_results(query: str, api_key: str):
+    """검색 결과 렌더링"""
+    results = cached_search_briefings(get_data_version(), query)
+    if not results:
+        st.info(f"'{query}'에 대한 검색 결과가 없습니다.")
+        return
 
+    st.caption(f"검색 결과 {len(results)}건 (관련도순)")
+    job_statuses = cached_analysis_job_statuses(get_data_version(), tuple(b.get('id') for b in results))
+    for briefing in results:
+        briefing['job_status'] = job_statuses.get(briefing.get('id'))
+        render_briefing_card(briefing, api_key, key_prefix="search")
+
+@st.fragment
+def render_briefing_card(briefing: Dict, api_key: str, key_prefix: str):
+    """브리핑 카드 렌더링 (카드 안의 버튼·토글은 이 카드만 다시 실행)"""
+    # 대표 카테고리 외에 비중이 높은 보조 카테고리도 태그로 표시
+    category_scores = json.loads(briefing.get('category_scores') or "{}")
+    if len(category_scores) > 1:
+        category_tags = "".join(
+            f'<span class="category-tag">{name} {confidence:.0%}</span>'
+            for name, confidence in category_scores.items()
+        )
+    else:
+        category_tags = f'<span class="category-tag">{briefing.get("category", "N/A")}</span>'
+
+    with st.container():
+        st.markdown(f"""
+        <div class="briefing-card">
+            {category_tags}
+            <span class="category-tag">{briefing.get('source', 'N/A')}</span>
+            <h3 style="margin-top: 0.5rem; margin-bottom: 0.5rem;">{briefing['title']}</h3>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # 다른 게시판에 같은 자료가 올라온 경우 출처를 함께 표시
+        duplicates = briefing.get('duplicate_sources') or []
+        if duplicates:
+            st.caption("🔗 같은 자료: " + ", ".join(
+                f"[{d['source']}]({d['url']})" for d in duplicates
+            ))
+
+        if briefing.get('snippet'):
+            st.markdown(briefing['snippet'])
+
+        card_key = f"{key_prefix}_{briefing.get('id') or briefing['url']}"
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            # 원문 내용 표시 (펼칠 때만 본문 조회)
+            if st.toggle("📄 원문 보기", key=f"body_{card_key}"):
+                content = load_briefing_body(briefing).get('content') or ''
+                st.markdown(content[:2000] + ("..." if len(content) > 2000 else ""))
+
+            # 관련 브리핑 (펼칠 때만 색인 조회, 샘플 데이터는 제외)
+            if briefing.get('id') and st.toggle("🔎 관련 브리핑", key=f"related_{card_key}"):
+                render_related_briefings(cached_related_briefings(get_data_version(), briefing['id']))
+
+        with col2:
+            # AI 분석 버튼
+            analyze_clicked = st.button(f"🤖 AI 분석", key=f"analyze_{card_key}")
+
+            # 백그라운드 분석 상태
+            job_status = briefing.get('job_status')
+            if job_status in ANALYSIS_JOB_STATUS_LABELS and not briefing.get('has_analysis'):
+                st.caption(ANALYSIS_JOB_STATUS_LABELS[job_status])
+
+        analysis_key = f"analysis_{briefing.get('id') or briefing['url']}"
+        stream_key = f"analysis_stream_{card_key}"
+        if analyze_clicked and not api_key:
+            st.warning("사이드바에서 Gemini API 키를 입력해주세요.")
+            analyze_clicked = False
+        elif analyze_clicked and job_status in ("queued", "running") and \
+                get_briefing_analysis_job_status(briefing['id']) == "running":
+            # 카드의 작업 상태는 캐시된 값이므로 클릭 시 DB에서 다시 확인
+            st.info("⚙️ 백그라운드에서 분석 중입니다. 잠시 후 다시 확인해주세요.")
+            analyze_clicked = False
+
+        if analyze_clicked or get_active_stream(st.session_state.get(stream_key, "")):
+            # 생성 중인 분석은 받은 조각부터 이어서 표시 (화면을 떠나도 백그라운드에서 완료·저장)
+            if analyze_clicked:
+                key, chunks = stream_inbasket_analysis(
+                    content=load_briefing_body(briefing).get('content') or briefing['title'],
+                    title=briefing['title'],
+                    api_key=api_key,
+                    briefing_url=briefing.get('url')
+                )
+                st.session_state[stream_key] = key
+            else:
+                chunks = get_active_stream(st.session_state[stream_key]).iter_text()
+            st.markdown("---")
+            st.markdown("### 🎯 인바스켓 분석 결과")
+            st.session_state[analysis_key] = st.write_stream(chunks)
+            st.session_state.pop(stream_key, None)
+            st.markdown("---")
+            return
+
+        # 분석 결과 표시 (세션 결과 우선, 없으면 저장된 분석을 펼칠 때 조회)
+        analysis = st.session_state.get(analysis_key)
+        if not analysis and briefing.get('has_analysis'):
+            if st.toggle("🎯 저장된 분석 보기", key=f"saved_analysis_{card_key}"):
+                analysis = load_briefing_body(briefing).get('ai_analysis')
+        elif not analysis:
+            analysis = briefing.get('ai_analysis')
+        if analysis:
             st.markdown("---")
+            st.markdown("### 🎯 인바스켓 분석 결과")
+            st.markdown(analysis)
+
+        st.markdown("---")
+
+@st.fragment
+def render_job_prediction_panel(api_key: str):
+    """2026년 유망 직무 예측 패널 (예측 생성 시 이 패널만 다시 실행)"""
+    predict_clicked = st.button("🚀 AI 예측 생성", use_container_width=True)
+    if predict_clicked and not api_key:
+        st.warning("사이드바에서 Gemini API 키를 입력해주세요.")
+        predict_clicked = False
+
+    # 이 세션에서 만든 예측이 없으면 마지막으로 저장된 예측 표시
+    if "job_prediction" not in st.session_state:
+        saved_prediction = cached_saved_future_jobs_prediction(get_data_version())
+        if saved_prediction:
+            st.session_state["job_prediction"] = saved_prediction
+
+    if predict_clicked or get_active_stream(st.session_state.get("job_prediction_stream", "")):
+        # 생성 중인 예측은 받은 조각부터 이어서 표시 (화면을 떠나도 백그라운드에서 완료·저장)
+        if predict_clicked:
+            key, chunks = stream_future_jobs(api_key)
+            st.session_state["job_prediction_stream"] = key
+        else:
+            chunks = get_active_stream(st.session_state["job_prediction_stream"]).iter_text()
+        st.session_state["job_prediction"] = st.write_stream(chunks)
+        st.session_state.pop("job_prediction_stream", None)
+    elif "job_prediction" in st.session_state:
+        st.markdown(st.session_state["job_prediction"])
+    else:
+        st.info("""
+        **예측 기반 키워드**: 2025 보건산업 백서, 디지털헬스케어 육성전략,
+        바이오헬스 산업 혁신전략, 의료기기 산업 발전 방안
+
+        'AI 예측 생성' 버튼을 클릭하여 2026년 유망 직무를 확인하세요.
+        """)
+
+def render_related_briefings(briefings: List[Dict]):
+    """관련 브리핑 목록 (제목 링크 · 출처 · 유사도)"""
+    if not briefings:
+        st.caption("관련 브리핑이 없습니다.")
+        return
+    for related in briefings:
+        st.markdown(f"- [{related['title']}]({related['url']}) · {related['source']} · 유사도 {related['similarity']:.0%}")
 
 def render_recruitment_tab(api_key: str):
     """채용 분석 탭 렌더링"""
 
     st.markdown("## 📊 KHIDI 채용 분석 아카이브")
 
-    # 채용 데이터 조회
-    recruitment_data = get_recruitment_data()
-
-    # 연도별 통계
-    col1, col2, col3, col4 = st.columns(4)
+    # 채용 통계 조회 (집계는 DB에서, 데이터 버전별 캐시)
+    data_version = get_data_version()
+    stats = cached_recruitment_stats(data_version)
+    yearly = stats["yearly"]
 
-    years = [2022, 2023, 2024, 2025]
-    for i, year in enumerate(years):
-        year_data = [r for r in recruitment_data if r['year'] == year]
-        total_hired = sum(r['hired_count'] for r in year_data)
+    if yearly.empty:
+        st.info("채용 데이터가 없습니다. 아래에서 채용 이력 파일을 가져와 주세요.")
+        render_recruitment_import()
+        return
 
-        with [col1, col2, col3, col4][i]:
+    # 최근 연도별 통계 (전년 대비 증감)
+    recent = yearly.tail(RECENT_YEARS_SHOWN)
+    for column, row in zip(st.columns(len(recent)), recent.itertuples()):
+        with column:
             st.metric(
-                label=f"{year}년",
-                value=f"{total_hired}명",
-                delta=f"{len(year_data)}개 직무"
+                label=f"{row.year}년",
+                value=f"{row.hired}명",
+                delta=None if pd.isna(row.hired_change) else f"{int(row.hired_change):+d}명 (전년 대비)"
             )
+            st.caption(f"{row.positions}개 직무")
 
     st.markdown("---")
 
     # 연도별 채용 상세
-    st.markdown("### 📋 연도별 채용 현황 (2021-2025)")
+    first_year, last_year = int(yearly["year"].iloc[0]), int(yearly["year"].iloc[-1])
+    st.markdown(f"### 📋 연도별 채용 현황 ({first_year}-{last_year})")
 
-    year_filter = st.selectbox("연도 선택", ["전체"] + list(range(2025, 2020, -1)))
-
-    if year_filter == "전체":
-        filtered_data = recruitment_data
-    else:
-        filtered_data = [r for r in recruitment_data if r['year'] == year_filter]
+    year_filter = st.selectbox("연도 선택", ["전체"] + list(range(last_year, first_year - 1, -1)))
+    filtered_data = cached_recruitment_data(data_version, None if year_filter == "전체" else year_filter)
 
     if filtered_data:
         for data in filtered_data:
@@ -844,49 +4536,112 @@ def render_recruitment_tab(api_key: str):
                 - **필요 역량**: {data['skills']}
                 """)
 
+    with st.expander("📈 연도별 증감 · 본부별 채용 인원"):
+        st.dataframe(
+            yearly.rename(columns={"year": "연도", "hired": "채용 인원", "positions": "직무 수",
+                                   "hired_change": "전년 대비", "hired_change_pct": "증감률"}),
+            hide_index=True,
+            column_config={"증감률": st.column_config.NumberColumn(format="percent")},
+        )
+        st.dataframe(stats["by_department"])
+
+    render_recruitment_import()
+
     st.markdown("---")
 
-    # 2026년 유망 직무 예측
-    st.markdown("### 🔮 2026년 유망 채용 직무 예측")
+    # 직무 역량 ↔ 최근 브리핑
+    st.markdown("### 🔗 직무 역량과 관련된 최근 브리핑")
 
-    if st.button("🚀 AI 예측 생성", use_container_width=True):
-        if not api_key:
-            st.warning("사이드바에서 Gemini API 키를 입력해주세요.")
-        else:
-            with st.spinner("AI가 2026년 채용 트렌드를 분석 중..."):
-                prediction = predict_future_jobs(api_key)
-                st.session_state["job_prediction"] = prediction
+    recruitment_data = cached_recruitment_data(data_version)
+    if recruitment_data:
+        selected = st.selectbox(
+            "채용 직무", recruitment_data,
+            format_func=lambda r: f"{r['year']}년 | {r['position']} ({r['department']})",
+        )
+        st.caption(f"필요 역량: {selected['skills']}")
+        render_related_briefings(cached_recruitment_related_briefings(data_version, selected))
 
-    if "job_prediction" in st.session_state:
-        st.markdown(st.session_state["job_prediction"])
-    else:
-        st.info("""
-        **예측 기반 키워드**: 2025 보건산업 백서, 디지털헬스케어 육성전략,
-        바이오헬스 산업 혁신전략, 의료기기 산업 발전 방안
+    st.markdown("---")
 
-        'AI 예측 생성' 버튼을 클릭하여 2026년 유망 직무를 확인하세요.
-        """)
+    # 2026년 유망 직무 예측
+    st.markdown("### 🔮 2026년 유망 채용 직무 예측")
+
+    render_job_prediction_panel(api_key)
 
     st.markdown("---")
 
-    # 직무별 트렌드 시각화
+    # 직무군별 트렌드 시각화
     st.markdown("### 📈 직무별 채용 트렌드")
 
-    # 간단한 차트 데이터
-    import pandas as pd
+    st.bar_chart(stats["by_family"])
 
-    trend_data = {
-        "연도": [2021, 2022, 2023, 2024, 2025],
-        "R&D 사업관리": [5, 4, 4, 5, 4],
-        "디지털헬스": [0, 2, 6, 3, 3],
-        "글로벌진출": [0, 3, 0, 2, 0],
-        "정책연구": [3, 2, 0, 0, 2],
-    }
+def render_recruitment_import():
+    """채용 이력 CSV/Excel 가져오기"""
+    with st.expander("📥 채용 이력 가져오기 (CSV/Excel)"):
+        st.caption("컬럼: 연도, 직무, 부서, 자격요건, 필요역량, 채용인원 · 파일에 있는 연도의 기존 데이터는 교체됩니다.")
+        uploaded = st.file_uploader("채용 이력 파일", type=["csv", "xlsx"], key="recruitment_upload")
+        if uploaded is not None and st.button("가져오기", key="recruitment_import"):
+            try:
+                result = import_recruitments(read_recruitment_file(uploaded, uploaded.name))
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                # 통계가 새 데이터로 다시 그려지도록 재실행 (토스트는 재실행 후에도 표시됨)
+                st.toast(f"✅ {result['years']}개 연도 {result['inserted']}건을 가져왔습니다 "
+                         f"(기존 {result['replaced']}건 교체).")
+                st.rerun()
+
+def render_diagnostics_tab():
+    """단계별 소요 시간·오류·캐시 적중률 (관리자용)"""
+    st.markdown("## 🩺 수집·분석 진단")
+
+    window = st.radio("기간", list(DIAGNOSTICS_WINDOWS), horizontal=True, key="diagnostics_window")
+    if st.button("🔄 새로고침", key="diagnostics_refresh"):
+        get_metrics_recorder().flush()
+        cached_stage_metrics.clear()
+    metrics = cached_stage_metrics(DIAGNOSTICS_WINDOWS[window])
+    stages = metrics["stages"]
+
+    if stages.empty:
+        st.info("기록된 계측 데이터가 없습니다. 수집이나 AI 분석을 실행하면 단계별 통계가 표시됩니다.")
+        return
 
-    df = pd.DataFrame(trend_data)
-    df_melted = df.melt(id_vars=["연도"], var_name="직무", value_name="채용인원")
+    total_calls = int(stages["호출 수"].sum())
+    total_errors = int(stages["오류"].sum())
+    timed = stages["p95 (ms)"].dropna()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("호출 수", f"{total_calls:,}")
+    col2.metric("오류", f"{total_errors:,}",
+                delta=f"{total_errors / total_calls:.1%}" if total_calls else None, delta_color="inverse")
+    if not timed.empty:
+        col3.metric("가장 느린 단계 (p95)", timed.index[0], f"{timed.iloc[0]:,.0f} ms", delta_color="off")
+    skipped = int(stages["넘긴 오류"].sum())
+    if skipped:
+        st.caption(f"처리를 계속하며 넘긴 오류 {skipped:,}건 (행 파싱·작업 재시도 등)은 오류율에 포함하지 않습니다.")
+
+    st.markdown("### ⏱️ 단계별 소요 시간")
+    st.dataframe(
+        stages,
+        column_config={
+            "p50 (ms)": st.column_config.NumberColumn(format="%.1f"),
+            "p95 (ms)": st.column_config.NumberColumn(format="%.1f"),
+            "최대 (ms)": st.column_config.NumberColumn(format="%.1f"),
+            "캐시 적중률": st.column_config.NumberColumn(format="percent"),
+            "오류율": st.column_config.NumberColumn(format="percent"),
+            "전송량 (MB)": st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
 
-    st.bar_chart(df.set_index("연도"))
+    if not metrics["errors"].empty:
+        st.markdown("### ⚠️ 오류 종류별 건수")
+        st.dataframe(
+            metrics["errors"].rename(columns={"stage": "단계", "error": "오류", "count": "건수",
+                                              "last_seen": "마지막 발생"}),
+            hide_index=True,
+        )
+    st.caption(f"계측 기록은 {METRICS_RETENTION_DAYS}일(최대 {METRICS_MAX_ROWS:,}건)까지 보관됩니다.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in ("ingest", "ingest-local", "import-recruitments", "reclassify"):
+        sys.exit(run_cli(sys.argv[1:]))
     main()
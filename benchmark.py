@@ -0,0 +1,577 @@
+"""
+KHIDI 대시보드 오프라인 벤치마크
+
+네트워크 없이 로컬 가짜 KHIDI 서버와 가짜 Gemini 모델로 주요 경로를 측정하고
+비교 가능한 JSON 보고서를 남긴다.
+
+    python benchmark.py                                  # 1k/10k/100k 전체 측정
+    python benchmark.py --sizes 1000 10000 --output before.json
+    python benchmark.py --sizes 1000 --compare before.json   # 기준보다 느려지면 종료 코드 1
+
+측정 항목
+- 수집: 가짜 게시판 목록·상세·PDF를 파이프라인으로 수집하는 처리량
+- PDF 추출: 여러 페이지 PDF의 초당 추출 페이지 수
+- HTML 파싱: 저장된 KHIDI 목록·상세 페이지(fixtures/)를 게시판 어댑터와 일반 선택자로 파싱한 시간
+- LLM: 고정 지연 가짜 모델 기준 단일 분석·map-reduce·스트리밍 첫 조각까지의 시간
+- 규모별(1k/10k/100k): 목록·검색·상세·관련 브리핑 조회 지연, 중복 연결·색인 계산 시간,
+  main() 첫 실행·재실행 시간
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "app.py")
+FIXTURE_DIR = os.path.join(APP_DIR, "fixtures")
+FIXTURE_BOARD = "보건산업브리프"
+FIXTURE_VIEW_URL = "https://www.khidi.or.kr/board/view?linkId=1284&menuId=MENU00085"
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+QUERY_REPEAT = 20                    # 조회 지연 측정 반복 횟수
+APP_RERUNS = 5                       # main() 재실행 측정 횟수
+ITEMS_PER_PAGE = 10                  # 가짜 게시판 페이지당 게시글 수
+SEED_BATCH = 5_000
+MIN_REGRESSION_MS = 1.0              # 이보다 작은 시간 차이는 측정 잡음으로 보고 비교에서 제외
+
+TOPICS = {
+    "R&D 정책": "연구개발 R&D 과제 기술개발 연구비 국가 전략 투자 성과 평가",
+    "글로벌 진출": "글로벌 해외 수출 진출 FDA 승인 현지 바이어 국제 협력",
+    "규제/법령": "규제 법령 인허가 제도 개선 샌드박스 승인 법률 개정",
+    "기타": "보건산업 동향 통계 시장 분석 기업 현황 전망 산업 생태계",
+}
+PARTICLES = ("은", "는", "을", "를", "의", "과", "에서", "으로")
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후기니디리미비시이지치키티피히"
+
+
+# ============================================================
+# 가짜 KHIDI 서버 (게시판 목록·상세·PDF)
+# ============================================================
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """여러 페이지 텍스트 PDF 생성 (외부 라이브러리 없이 최소 구조로 작성)"""
+    count = len(pages)
+    font_id = 3 + 2 * count
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(count))}] /Count {count} >>",
+        font_id: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for i, lines in enumerate(pages):
+        stream = "BT /F1 10 Tf 40 760 Td " + " ".join(f"({line}) Tj 0 -12 Td" for line in lines) + " ET"
+        objects[3 + 2 * i] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                              f"/Contents {4 + 2 * i} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>")
+        objects[4 + 2 * i] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode()
+    xref = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offsets[n]:010d} 00000 n \n" for n in range(1, size)).encode()
+    out += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+def pdf_pages_for(key: str, page_count: int) -> List[List[str]]:
+    """게시글별로 결정적인 PDF 페이지 내용"""
+    rng = random.Random(key)
+    words = ("health", "industry", "export", "regulation", "policy", "clinical", "device", "market")
+    return [[f"{key} page {p} " + " ".join(rng.choice(words) for _ in range(12)) for _ in range(40)]
+            for p in range(page_count)]
+
+class FakeKhidiServer:
+    """khidi.or.kr 게시판 구조를 흉내 내는 로컬 HTTP 서버
+
+    /board?menuId=..&pageIndex=N  목록 (table tbody tr, linkId 링크, 날짜 칸)
+    /board/view?linkId=N&menuId=.. 상세 (.board-view-content, PDF 첨부 링크)
+    /files/<menuId>-<linkId>.pdf   첨부 PDF
+    """
+
+    def __init__(self, posts_per_board: int, pdf_pages: int, latency: float):
+        self.posts_per_board = posts_per_board
+        self.pdf_pages = pdf_pages
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._pdf_cache: Dict[str, bytes] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def board_url(self, menu_id: str) -> str:
+        return f"{self.base_url}/board?menuId={menu_id}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _pdf(self, key: str) -> bytes:
+        with self._lock:
+            if key not in self._pdf_cache:
+                self._pdf_cache[key] = make_pdf(pdf_pages_for(key, self.pdf_pages))
+            return self._pdf_cache[key]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                menu_id = query.get("menuId", ["MENU0"])[0]
+                if url.path == "/board":
+                    self._send(self._list_page(menu_id, int(query.get("pageIndex", ["1"])[0])), "text/html")
+                elif url.path == "/board/view":
+                    self._send(self._article(menu_id, int(query["linkId"][0])), "text/html")
+                elif url.path.startswith("/files/") and url.path.endswith(".pdf"):
+                    self._send(server._pdf(url.path[len("/files/"):-4]), "application/pdf")
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+
+            def _list_page(self, menu_id: str, page: int) -> bytes:
+                newest = server.posts_per_board - (page - 1) * ITEMS_PER_PAGE
+                rows = []
+                for link_id in range(newest, max(newest - ITEMS_PER_PAGE, 0), -1):
+                    topic = list(TOPICS)[link_id % len(TOPICS)]
+                    date = (datetime(2026, 1, 1) - timedelta(days=server.posts_per_board - link_id)).date()
+                    rows.append(
+                        f'<tr><td>{link_id}</td>'
+                        f'<td><a href="/board/view?linkId={link_id}&menuId={menu_id}">'
+                        f'{topic} 이슈 브리프 {menu_id}-{link_id}</a></td>'
+                        f'<td class="date">{date}</td></tr>'
+                    )
+                return (f"<html><body><table><tbody>{''.join(rows)}</tbody></table>"
+                        f"</body></html>").encode()
+
+            def _article(self, menu_id: str, link_id: int) -> bytes:
+                topic = list(TOPICS)[link_id % len(TOPICS)]
+                body = synthetic_text(random.Random(f"{menu_id}-{link_id}"), topic, 60)
+                return (f'<html><body><div class="board-view-content">{body}</div>'
+                        f'<a href="/files/{menu_id}-{link_id}.pdf">첨부파일.pdf</a></body></html>').encode()
+
+            def _send(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", '"' + hashlib.md5(body).hexdigest() + '"')
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+# ============================================================
+# 가짜 Gemini 모델 (고정 지연, 결정적 응답)
+# ============================================================
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """genai.GenerativeModel 대역 (호출마다 LATENCY초 대기, 프롬프트 해시로 결정적 응답)"""
+
+    LATENCY = 0.2
+    STREAM_CHUNKS = 8
+    calls = 0
+    _lock = threading.Lock()
+
+    def __init__(self, model_name: str = "", **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        with FakeGenerativeModel._lock:
+            FakeGenerativeModel.calls += 1
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        text = f"## 분석 결과\n\n- 요약 {digest[:12]}\n- 핵심 쟁점 {digest[12:24]}\n" * 4
+        if not stream:
+            time.sleep(self.LATENCY)
+            return FakeResponse(text)
+        return self._stream(text)
+
+    def _stream(self, text: str) -> Iterator[FakeResponse]:
+        size = max(1, len(text) // self.STREAM_CHUNKS)
+        for start in range(0, len(text), size):
+            time.sleep(self.LATENCY / self.STREAM_CHUNKS)
+            yield FakeResponse(text[start:start + size])
+
+
+# ============================================================
+# 측정 도구
+# ============================================================
+
+def synthetic_text(rng: random.Random, topic: str, sentences: int) -> str:
+    """주제 어휘와 임의 음절 단어를 섞은 한국어 형태의 합성 본문
+
+    주제 어휘만 쓰면 모든 문서가 서로 비슷해져 중복 탐지·유사도 색인이 실제보다
+    훨씬 많은 후보를 비교하게 되므로, 문장마다 문서 고유의 단어와 수치를 섞는다.
+    """
+    words = TOPICS[topic].split()
+
+    def word() -> str:
+        if rng.random() < 0.5:
+            return rng.choice(words)
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+
+    return " ".join(
+        " ".join(word() + rng.choice(PARTICLES) for _ in range(7)) + f" {rng.randint(1, 999)}건."
+        for _ in range(sentences)
+    )
+
+def timed(fn: Callable[[], object], repeat: int = QUERY_REPEAT) -> Dict[str, float]:
+    """반복 실행 지연 (ms, p50/p95/최소)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "min_ms": round(samples[0], 3),
+    }
+
+def elapsed(fn: Callable[[], object]) -> Tuple[object, float]:
+    """한 번 실행한 결과와 소요 시간(초)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+# ============================================================
+# 벤치마크 항목
+# ============================================================
+
+def bench_crawl(app, args) -> Dict:
+    """가짜 서버 게시판 수집 처리량"""
+    boards = [f"BENCH{i}" for i in range(args.crawl_boards)]
+    posts = args.crawl_pages * ITEMS_PER_PAGE
+    with FakeKhidiServer(posts, args.pdf_pages, args.server_latency) as server:
+        (counts, errors), seconds = elapsed(lambda: app.collect_briefings(
+            [(name, server.board_url(name)) for name in boards],
+            mode="backfill", max_pages=args.crawl_pages,
+        ))
+        requests_made = server.requests
+
+    articles = sum(counts.values())
+    return {
+        "boards": len(boards),
+        "articles": articles,
+        "http_requests": requests_made,
+        "errors": len(errors),
+        "elapsed_s": round(seconds, 3),
+        "articles_per_sec": round(articles / seconds, 2) if seconds else None,
+    }
+
+def bench_pdf(app, args) -> Dict:
+    """PDF 추출 페이지 처리량 (프로세스 풀 경로 포함)"""
+    pages = args.pdf_bench_pages
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(make_pdf(pdf_pages_for("bench", pages)))
+    try:
+        extracted, seconds = elapsed(lambda: sum(1 for _ in app.iter_pdf_pages(path)))
+    finally:
+        os.unlink(path)
+    return {
+        "pages": extracted,
+        "processes": app.PDF_EXTRACT_PROCESSES,
+        "elapsed_s": round(seconds, 3),
+        "pages_per_sec": round(extracted / seconds, 2) if seconds else None,
+    }
+
+def bench_parse(app, args) -> Dict:
+    """저장된 KHIDI 페이지 파싱 지연 (게시판 어댑터 vs 페이지 전체를 파싱하는 일반 선택자)"""
+    def read(name: str) -> str:
+        with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+            return f.read()
+
+    board_url = app.KHIDI_URLS[FIXTURE_BOARD]
+    list_html, view_html = read("khidi_board_list.html"), read("khidi_board_view.html")
+    adapter = app.get_board_adapter(board_url)
+    generic = app.GENERIC_BOARD_ADAPTER
+
+    articles = adapter.parse_list(list_html, FIXTURE_BOARD, board_url)
+    content, pdf_url = adapter.parse_detail(view_html, FIXTURE_VIEW_URL)
+    return {
+        "parser": app.HTML_PARSER,
+        "adapter": adapter.name,
+        "list_articles": len(articles),
+        "list_dated": sum(1 for a in articles if a["date"]),
+        "detail_content_chars": len(content),
+        "detail_pdf_url": pdf_url,
+        "list_adapter": timed(lambda: adapter.parse_list(list_html, FIXTURE_BOARD, board_url)),
+        "list_generic": timed(lambda: generic.parse_list(list_html, FIXTURE_BOARD, board_url)),
+        "detail_adapter": timed(lambda: adapter.parse_detail(view_html, FIXTURE_VIEW_URL)),
+        "detail_generic": timed(lambda: generic.parse_detail(view_html, FIXTURE_VIEW_URL)),
+    }
+
+def bench_llm(app, args) -> Dict:
+    """가짜 모델 기준 LLM 호출 부가 비용 (실제 대기 시간 대비)"""
+    rng = random.Random(7)
+    latency = FakeGenerativeModel.LATENCY
+
+    def run(content: str) -> Tuple[int, float]:
+        before = FakeGenerativeModel.calls
+        _, seconds = elapsed(lambda: app.run_inbasket_analysis(content, "벤치마크 문서", "bench-key"))
+        return FakeGenerativeModel.calls - before, seconds
+
+    short_calls, short_s = run(synthetic_text(rng, "R&D 정책", 40))
+    long_content = "\n\n".join(f"## {i}장\n" + synthetic_text(rng, list(TOPICS)[i % 4], 400) for i in range(12))
+    long_calls, long_s = run(long_content)
+    _, cached_s = elapsed(lambda: app.run_inbasket_analysis(long_content, "벤치마크 문서", "bench-key"))
+
+    # 스트리밍: 첫 조각까지의 시간과 전체 시간
+    start = time.perf_counter()
+    _, chunks = app.stream_inbasket_analysis(synthetic_text(rng, "기타", 40), "스트리밍 문서", "bench-key")
+    first_chunk_s = None
+    for _ in chunks:
+        if first_chunk_s is None:
+            first_chunk_s = time.perf_counter() - start
+    stream_total_s = time.perf_counter() - start
+
+    return {
+        "model_latency_s": latency,
+        "single_call_s": round(short_s, 3),
+        "single_overhead_ms": round((short_s - short_calls * latency) * 1000, 2),
+        "map_reduce_calls": long_calls,
+        "map_reduce_s": round(long_s, 3),
+        "cache_hit_ms": round(cached_s * 1000, 3),
+        "stream_first_chunk_ms": round((first_chunk_s or 0) * 1000, 2),
+        "stream_total_s": round(stream_total_s, 3),
+    }
+
+def seed_briefings(app, target: int):
+    """브리핑 수가 target이 될 때까지 합성 브리핑 추가 (분류는 미리 계산된 값으로 저장)"""
+    with app.db_read() as conn:
+        existing = conn.execute("SELECT COUNT(*) FROM briefings").fetchone()[0]
+
+    rng = random.Random(target)
+    # save_briefings처럼 datetime을 그대로 넘겨 앱과 같은 형식('YYYY-MM-DD HH:MM:SS.ffffff')으로 저장
+    base_time = datetime(2026, 1, 1, microsecond=123456)
+    topics = list(TOPICS)
+    for start in range(existing, target, SEED_BATCH):
+        rows = []
+        for i in range(start, min(start + SEED_BATCH, target)):
+            topic = topics[i % len(topics)]
+            rows.append((
+                f"{topic} 동향 브리프 {i}", f"벤치마크 게시판 {i % 3}", topic,
+                json.dumps({topic: 1.0}, ensure_ascii=False), app.CATEGORY_RULES_VERSION,
+                f"bench://briefing/{i}", None, synthetic_text(rng, topic, 25), None,
+                base_time - timedelta(minutes=i),
+            ))
+        with app.db_write() as conn:
+            conn.executemany(f"""
+                INSERT OR IGNORE INTO briefings ({', '.join(app.BRIEFING_FIELDS)}, crawled_at)
+                VALUES ({', '.join('?' * (len(app.BRIEFING_FIELDS) + 1))})
+            """, rows)
+
+def bench_app_reruns() -> Dict:
+    """Streamlit AppTest로 main() 첫 실행·재실행 시간 측정"""
+    from streamlit.testing.v1 import AppTest
+
+    app_test = AppTest.from_file(APP_PATH, default_timeout=600)
+    _, first_s = elapsed(app_test.run)
+    if app_test.exception:
+        return {"error": str(app_test.exception[0].value)}
+    reruns = timed(app_test.run, repeat=APP_RERUNS)
+    return {"first_run_ms": round(first_s * 1000, 2),
+            **{f"rerun_{name}": value for name, value in reruns.items()}}
+
+def bench_size(app, size: int) -> Dict:
+    """브리핑 size건 규모의 조회·색인 비용"""
+    _, seed_s = elapsed(lambda: seed_briefings(app, size))
+    _, dedupe_s = elapsed(app.link_near_duplicates)
+    _, terms_s = elapsed(app.update_briefing_terms)
+
+    index = app.SimilarityIndex()
+    _, index_s = elapsed(index.sync)
+
+    with app.db_read() as conn:
+        sample_id = conn.execute("SELECT id FROM briefings ORDER BY id LIMIT 1 OFFSET ?",
+                                 (size // 2,)).fetchone()[0]
+
+    def deep_page():
+        cursor = None
+        for _ in range(10):
+            _, cursor = app.list_briefings("전체", cursor)
+
+    results = {
+        "seed_s": round(seed_s, 3),
+        "link_duplicates_s": round(dedupe_s, 3),
+        "similarity_terms_s": round(terms_s, 3),
+        "similarity_index_build_ms": round(index_s * 1000, 2),
+        "list_first_page": timed(lambda: app.list_briefings("전체")),
+        "list_category_page": timed(lambda: app.list_briefings("규제/법령")),
+        "list_page_10": timed(deep_page, repeat=max(3, QUERY_REPEAT // 4)),
+        "search_fts": timed(lambda: app.search_briefings("인허가 제도")),
+        "search_short_terms": timed(lambda: app.search_briefings("수출 AI")),
+        "briefing_detail": timed(lambda: app.get_briefing_detail(sample_id)),
+        "related_briefings": timed(lambda: app.related_briefings(sample_id)),
+        "app": bench_app_reruns(),
+    }
+    return results
+
+
+# ============================================================
+# 보고서 비교
+# ============================================================
+
+def flatten_metrics(report: Dict, prefix: str = "") -> Dict[str, float]:
+    """비교 대상 지표만 평탄화 (시간 지표는 낮을수록, 처리량 지표는 높을수록 좋음)"""
+    metrics = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, f"{name}."))
+        elif isinstance(value, (int, float)) and (key.endswith(("_ms", "_s", "_per_sec"))):
+            metrics[name] = float(value)
+    return metrics
+
+def compare_reports(baseline: Dict, current: Dict, tolerance: float) -> List[str]:
+    """기준 보고서보다 tolerance 이상 나빠진 지표 목록"""
+    before = flatten_metrics(baseline.get("results", {}))
+    after = flatten_metrics(current.get("results", {}))
+    regressions = []
+    for name, old in sorted(before.items()):
+        new = after.get(name)
+        if new is None or old <= 0 or name.startswith("llm.model_latency"):
+            continue
+        if name.endswith("_per_sec"):
+            ratio = old / new if new else float("inf")
+        else:
+            ratio = new / old
+            scale = 1000 if name.endswith("_s") else 1
+            if (new - old) * scale < MIN_REGRESSION_MS:
+                continue
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {old:g} → {new:g} ({ratio:.2f}배 나빠짐)")
+    return regressions
+
+
+# ============================================================
+# 실행
+# ============================================================
+
+def load_app(workdir: str, llm_latency: float):
+    """임시 DB·PDF 캐시와 가짜 Gemini 모델로 app 모듈 로드"""
+    os.environ["KHIDI_DB_PATH"] = os.path.join(workdir, "khidi_bench.db")
+    os.environ["KHIDI_PDF_CACHE_DIR"] = os.path.join(workdir, "pdf_cache")
+    os.environ["KHIDI_GEMINI_RPM"] = "1000000"      # 호출 한도 대기는 측정에서 제외
+    os.environ.pop("GEMINI_API_KEY", None)           # 대시보드 실행 시 분석 작업 스레드를 띄우지 않음
+
+    sys.path.insert(0, APP_DIR)
+    import google.generativeai as genai
+    FakeGenerativeModel.LATENCY = llm_latency
+    genai.GenerativeModel = FakeGenerativeModel
+    genai.configure = lambda **kwargs: None
+
+    import app
+    app.init_database()
+    return app
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="KHIDI 대시보드 오프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="측정할 브리핑 규모 (기본 1000 10000 100000)")
+    parser.add_argument("--output", default="benchmark-report.json", help="JSON 보고서 경로")
+    parser.add_argument("--compare", help="비교할 기준 보고서 (나빠진 지표가 있으면 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 성능 저하 비율 (기본 0.2)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="가짜 모델 호출 지연(초)")
+    parser.add_argument("--server-latency", type=float, default=0.01, help="가짜 서버 응답 지연(초)")
+    parser.add_argument("--crawl-boards", type=int, default=2)
+    parser.add_argument("--crawl-pages", type=int, default=5)
+    parser.add_argument("--pdf-pages", type=int, default=2, help="수집 대상 첨부 PDF 페이지 수")
+    parser.add_argument("--pdf-bench-pages", type=int, default=32, help="PDF 추출 측정용 페이지 수")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["crawl", "parse", "pdf", "llm", "sizes"])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="khidi-bench-") as workdir:
+        app = load_app(workdir, args.llm_latency)
+        results: Dict[str, object] = {}
+
+        steps = [("crawl", bench_crawl), ("parse", bench_parse), ("pdf", bench_pdf), ("llm", bench_llm)]
+        for name, bench in steps:
+            if name in args.skip:
+                continue
+            print(f"[{name}] 측정 중...", flush=True)
+            results[name] = bench(app, args)
+            print(f"[{name}] {json.dumps(results[name], ensure_ascii=False)}", flush=True)
+
+        if "sizes" not in args.skip:
+            results["sizes"] = {}
+            for size in sorted(args.sizes):
+                print(f"[{size:,}건] 측정 중...", flush=True)
+                results["sizes"][str(size)] = bench_size(app, size)
+                print(f"[{size:,}건] {json.dumps(results['sizes'][str(size)], ensure_ascii=False)}", flush=True)
+
+        app.stop_analysis_workers()
+        app.close_db_connections()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sqlite": sqlite3.sqlite_version,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"보고서 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare_reports(json.load(f), report, args.tolerance)
+        for line in regressions:
+            print(f"성능 저하: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"기준 보고서 대비 {args.tolerance:.0%} 이상 나빠진 지표 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())